@@ -26,7 +26,9 @@ THE SOFTWARE.
 """
 
 import pathlib
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, ClassVar, TextIO, TypeAlias, cast
 
 import numpy as np
@@ -81,6 +83,7 @@ Element types
 .. data:: VTK_LAGRANGE_TETRAHEDRON
 .. data:: VTK_LAGRANGE_HEXAHEDRON
 .. data:: VTK_LAGRANGE_WEDGE
+.. data:: VTK_LAGRANGE_PYRAMID
 
 XML elements
 ^^^^^^^^^^^^^^
@@ -112,6 +115,8 @@ Building blocks
     :show-inheritance:
 .. autoclass:: StructuredGrid
     :show-inheritance:
+.. autoclass:: ImageData
+    :show-inheritance:
 
 XML generators
 ^^^^^^^^^^^^^^
@@ -128,6 +133,8 @@ Convenience functions
 ---------------------
 
 .. autofunction:: write_structured_grid
+.. autofunction:: write_multiblock
+.. autofunction:: write_overlapping_amr
 
 Type aliases
 ------------
@@ -164,6 +171,9 @@ NUMPY_TO_VTK_TYPES = {
         np.float64: VTK_FLOAT64,
         }
 
+VTK_TO_NUMPY_TYPES = {vtk_type: np_type
+        for np_type, vtk_type in NUMPY_TO_VTK_TYPES.items()}
+
 # }}}
 
 
@@ -198,6 +208,7 @@ VTK_LAGRANGE_QUADRILATERAL = 70
 VTK_LAGRANGE_TETRAHEDRON = 71
 VTK_LAGRANGE_HEXAHEDRON = 72
 VTK_LAGRANGE_WEDGE = 73
+VTK_LAGRANGE_PYRAMID = 74
 
 # }}}
 
@@ -225,6 +236,7 @@ CELL_NODE_COUNT = {
         # VTK_LAGRANGE_TETRAHEDRON: no a-priori size
         # VTK_LAGRANGE_HEXAHEDRON: no a-priori size
         # VTK_LAGRANGE_WEDGE: no a-priori size
+        # VTK_LAGRANGE_PYRAMID: no a-priori size
         }
 
 # }}}
@@ -511,6 +523,7 @@ class DataArray(Visitable):
     .. automethod:: __init__
     .. automethod:: get_encoded_buffer
     .. automethod:: encode
+    .. automethod:: to_numpy
     """
 
     generator_method: ClassVar[str] = "gen_data_array"
@@ -519,6 +532,7 @@ class DataArray(Visitable):
     type: str | None
     components: int
     encoded_buffer: EncodedBuffer
+    _encode_lock: threading.Lock
 
     def __init__(self,
                  name: str,
@@ -538,9 +552,12 @@ class DataArray(Visitable):
         self.name = name
 
         if isinstance(container, DataArray):
+            # NOTE: the lock is shared with the container, so that arrays
+            # sharing a buffer are not re-encoded concurrently
             self.type = container.type
             self.components = container.components
             self.encoded_buffer = container.encoded_buffer
+            self._encode_lock = container._encode_lock
             return
         elif isinstance(container, np.ndarray):
             # NOTE: handled below
@@ -594,6 +611,7 @@ class DataArray(Visitable):
 
         buf = memoryview(cast("Buffer", container))
         self.encoded_buffer = BinaryEncodedBuffer(buf)
+        self._encode_lock = threading.Lock()
 
     def get_encoded_buffer(self,
                            encoder: str,
@@ -602,33 +620,37 @@ class DataArray(Visitable):
 
         :arg encoder: new encoder name.
         :arg compressor: new compressor name.
-        """
-        have_encoder = self.encoded_buffer.encoder()
-        have_compressor = self.encoded_buffer.compressor()
 
-        if (encoder, compressor) != (have_encoder, have_compressor):
-            raw_buf = self.encoded_buffer.raw_buffer()
+        This is safe to call concurrently, e.g. when the same array is shared
+        by several grids that are written from different threads.
+        """
+        with self._encode_lock:
+            have_encoder = self.encoded_buffer.encoder()
+            have_compressor = self.encoded_buffer.compressor()
 
-            # avoid having three copies of the buffer around temporarily
-            del self.encoded_buffer
+            if (encoder, compressor) != (have_encoder, have_compressor):
+                raw_buf = self.encoded_buffer.raw_buffer()
 
-            if (encoder, compressor) == ("binary", None):
-                self.encoded_buffer = BinaryEncodedBuffer(raw_buf)
-            elif (encoder, compressor) == ("base64", None):
-                assert isinstance(raw_buf, memoryview)
-                self.encoded_buffer = Base64EncodedBuffer(raw_buf)
-            elif (encoder, compressor) == ("base64", "zlib"):
-                self.encoded_buffer = Base64ZLibEncodedBuffer(raw_buf)
-            else:
+                # NOTE: avoid having three copies of the buffer around
+                # temporarily, while keeping a valid buffer for readers
                 self.encoded_buffer = BinaryEncodedBuffer(raw_buf)
-                raise ValueError("invalid encoder/compressor pair")
 
-            have_encoder = self.encoded_buffer.encoder()
-            have_compressor = self.encoded_buffer.compressor()
+                if (encoder, compressor) == ("binary", None):
+                    pass
+                elif (encoder, compressor) == ("base64", None):
+                    assert isinstance(raw_buf, memoryview)
+                    self.encoded_buffer = Base64EncodedBuffer(raw_buf)
+                elif (encoder, compressor) == ("base64", "zlib"):
+                    self.encoded_buffer = Base64ZLibEncodedBuffer(raw_buf)
+                else:
+                    raise ValueError("invalid encoder/compressor pair")
+
+                have_encoder = self.encoded_buffer.encoder()
+                have_compressor = self.encoded_buffer.compressor()
 
-            assert (encoder, compressor) == (have_encoder, have_compressor)
+                assert (encoder, compressor) == (have_encoder, have_compressor)
 
-        return self.encoded_buffer
+            return self.encoded_buffer
 
     def encode(self, compressor: str | None, xml_element: XMLElement) -> int:
         """Encode the underlying buffer with the given compressor and add it
@@ -643,13 +665,77 @@ class DataArray(Visitable):
         ebuf = self.get_encoded_buffer("base64", compressor)
         return ebuf.add_to_xml_element(xml_element)
 
+    def to_numpy(self) -> onp.ArrayND[Any]:
+        """Recover the values stored in the data array.
+
+        If the underlying buffer is stored in raw binary form, the result is a
+        read-only view into it and no copies are made.
+
+        :returns: an array of shape ``(n,)`` if the array has a single component
+            and ``(n, components)`` otherwise. Note that vectors are stored
+            with their *vector_padding*, so the padded components are also
+            returned.
+        """
+        assert self.type is not None
+        dtype = np.dtype(VTK_TO_NUMPY_TYPES[self.type])
+
+        with self._encode_lock:
+            raw_buf = self.encoded_buffer.raw_buffer()
+
+        ary = np.frombuffer(cast("Buffer", raw_buf), dtype=dtype)
+        if self.components > 1:
+            ary = ary.reshape(-1, self.components)
+
+        return ary
+
 # }}}
 
 
 # {{{ grids
 
+def _parse_vtk_file_version(version: str) -> tuple[int, ...]:
+    return tuple(int(v) for v in version.split("."))
+
+
+def _narrow_index_array(
+        ary: onp.ArrayND[np.integer[Any]]
+        ) -> tuple[onp.ArrayND[np.integer[Any]], str]:
+    """Convert the index array *ary* to the smallest unsigned integer type
+    that can hold all its values.
+
+    Indices that do not fit into a signed 32-bit integer are promoted to
+    :class:`numpy.int64`, which requires VTK XML file format version ``"1.0"``.
+
+    :returns: a tuple ``(ary, version)`` of the narrowed array and the minimum
+        VTK XML file format version required to read it.
+    """
+    if ary.size == 0:
+        return ary.astype(np.uint8), "0.1"
+
+    if ary.min() < 0:
+        raise ValueError("cannot narrow index arrays with negative entries")
+
+    max_index = int(ary.max())
+    if max_index < 2**8:
+        dtype: type[np.integer[Any]] = np.uint8
+    elif max_index < 2**16:
+        dtype = np.uint16
+    elif max_index < 2**31:
+        dtype = np.uint32
+    else:
+        return ary.astype(np.int64, copy=False), "1.0"
+
+    return ary.astype(dtype, copy=False), "0.1"
+
+
 class UnstructuredGrid(Visitable):
     """
+    .. attribute:: min_vtk_file_version
+
+        Minimum VTK XML file format version (see :class:`XMLGenerator`)
+        required to read the grid. The generators will use at least this
+        version when writing the grid.
+
     .. automethod:: __init__
 
     .. automethod:: vtk_extension
@@ -670,12 +756,15 @@ class UnstructuredGrid(Visitable):
     pointdata: list[DataArray]
     celldata: list[DataArray]
 
+    min_vtk_file_version: str
+
     def __init__(self,
                  points: tuple[int, DataArray],
                  cells: (
                      onp.ArrayND[np.integer[Any]]
                      | tuple[int, DataArray, DataArray]),
-                 cell_types: onp.Array1D[np.integer[Any]] | DataArray) -> None:
+                 cell_types: onp.Array1D[np.integer[Any]] | DataArray,
+                 narrow_index_types: bool = False) -> None:
         """
         :arg points: a tuple containing the point count and a :class:`DataArray`
             with the actual coordinates.
@@ -685,9 +774,16 @@ class UnstructuredGrid(Visitable):
             should be provided.
         :arg cell_types: a :class:`DataArray` or :class:`~numpy.ndarray` of
             cell types.
+        :arg narrow_index_types: if *True*, the connectivity and offsets are
+            converted to the smallest unsigned integer type that can hold
+            their values and the cell types are stored as
+            :class:`numpy.uint8`. Indices that exceed the range of a signed
+            32-bit integer are stored as :class:`numpy.int64` instead and
+            :attr:`min_vtk_file_version` is raised accordingly.
         """
         self.point_count, self.points = points
         assert self.points.name == "points"
+        self.min_vtk_file_version = "0.1"
 
         if isinstance(cells, tuple) and len(cells) == 3:
             self.cell_count, self.cell_connectivity, self.cell_offsets = cells
@@ -709,14 +805,30 @@ class UnstructuredGrid(Visitable):
 
         self.cell_types = DataArray("types", cell_types)
 
+        if narrow_index_types:
+            versions = [self.min_vtk_file_version]
+            for name in ("cell_connectivity", "cell_offsets"):
+                data_array = cast("DataArray", getattr(self, name))
+                ary, version = _narrow_index_array(data_array.to_numpy())
+
+                setattr(self, name, DataArray(data_array.name, ary))
+                versions.append(version)
+
+            self.cell_types = DataArray(
+                "types", self.cell_types.to_numpy().astype(np.uint8, copy=False))
+            self.min_vtk_file_version = max(versions, key=_parse_vtk_file_version)
+
         self.pointdata = []
         self.celldata = []
 
     def copy(self) -> UnstructuredGrid:
-        return UnstructuredGrid(
+        result = UnstructuredGrid(
                 (self.point_count, self.points),
                 (self.cell_count, self.cell_connectivity, self.cell_offsets),
                 self.cell_types)
+        result.min_vtk_file_version = self.min_vtk_file_version
+
+        return result
 
     def vtk_extension(self) -> str:
         """Recommended extension for unstructured VTK grids."""
@@ -782,6 +894,69 @@ class StructuredGrid(Visitable):
         """Add cell data to the grid."""
         self.celldata.append(data_array)
 
+
+class ImageData(Visitable):
+    """A uniform rectilinear grid, given by an *origin*, a *spacing* and an
+    *extent* of point indices.
+
+    .. automethod:: __init__
+
+    .. automethod:: vtk_extension
+    .. automethod:: add_pointdata
+    .. automethod:: add_celldata
+    """
+
+    generator_method: ClassVar[str] = "gen_image_data"
+
+    extent: tuple[int, ...]
+    origin: tuple[float, ...]
+    spacing: tuple[float, ...]
+    ndims: int
+
+    def __init__(self,
+                 extent: Sequence[int],
+                 origin: Sequence[float] = (0.0, 0.0, 0.0),
+                 spacing: Sequence[float] = (1.0, 1.0, 1.0)) -> None:
+        """
+        :arg extent: a sequence ``(x0, x1, y0, y1, z0, z1)`` of the first
+            and last point index along each axis. Shorter sequences are
+            padded with zeros for the missing axes.
+        :arg origin: coordinates of the point with index ``(0, 0, 0)``.
+        :arg spacing: distance between neighboring points along each axis.
+        """
+        if len(extent) % 2 or len(extent) > 6:
+            raise ValueError(f"invalid extent: {extent}")
+
+        self.extent = (*(int(i) for i in extent), *((0,) * (6 - len(extent))))
+        self.origin = tuple(float(x) for x in origin)
+        self.spacing = tuple(float(h) for h in spacing)
+
+        if len(self.origin) != 3 or len(self.spacing) != 3:
+            raise ValueError("'origin' and 'spacing' must have three entries")
+
+        self.ndims = max(
+            (i + 1 for i in range(3)
+             if self.extent[2*i + 1] > self.extent[2*i]),
+            default=1)
+
+        self.pointdata: list[DataArray] = []
+        self.celldata: list[DataArray] = []
+
+    def copy(self) -> ImageData:
+        return ImageData(self.extent, self.origin, self.spacing)
+
+    def vtk_extension(self) -> str:
+        """Recommended extension for VTK image data."""
+        return "vti"
+
+    def add_pointdata(self, data_array: DataArray) -> None:
+        """Add point data to the grid."""
+        self.pointdata.append(data_array)
+
+    def add_celldata(self, data_array: DataArray) -> None:
+        """Add cell data to the grid."""
+        self.celldata.append(data_array)
+
 # }}}
 
 
@@ -849,9 +1024,13 @@ class XMLGenerator:
     def __call__(self, vtkobj: Visitable) -> XMLRoot:
         """Generate an XML tree from the given *vtkobj*."""
 
+        version = max(
+            self.vtk_file_version,
+            getattr(vtkobj, "min_vtk_file_version", self.vtk_file_version),
+            key=_parse_vtk_file_version)
+
         child = self.rec(vtkobj)
-        vtkf = make_vtkfile(child.tag, self.compressor,
-                version=self.vtk_file_version)
+        vtkf = make_vtkfile(child.tag, self.compressor, version=version)
         vtkf.add_child(child)
 
         return XMLRoot(vtkf)
@@ -925,6 +1104,30 @@ class InlineXMLGenerator(XMLGenerator):
         points.add_child(self.rec(sgrid.points))
         return el
 
+    def gen_image_data(self, image: ImageData) -> XMLElement:
+        extent_str = " ".join(str(i) for i in image.extent)
+
+        el = XMLElement("ImageData",
+            WholeExtent=extent_str,
+            Origin=" ".join(str(x) for x in image.origin),
+            Spacing=" ".join(str(h) for h in image.spacing))
+        piece = XMLElement("Piece", Extent=extent_str)
+        el.add_child(piece)
+
+        if image.pointdata:
+            data_el = XMLElement("PointData")
+            piece.add_child(data_el)
+            for data_array in image.pointdata:
+                data_el.add_child(self.rec(data_array))
+
+        if image.celldata:
+            data_el = XMLElement("CellData")
+            piece.add_child(data_el)
+            for data_array in image.celldata:
+                data_el.add_child(self.rec(data_array))
+
+        return el
+
     def gen_data_array(self, data: DataArray) -> XMLElement:
         el = XMLElement("DataArray", type=data.type, Name=data.name,
                 NumberOfComponents=data.components, format="binary")
@@ -983,23 +1186,39 @@ class ParallelXMLGenerator(XMLGenerator):
     """
 
     pathnames: tuple[str, ...]
+    ghost_level: int
 
-    def __init__(self, pathnames: Sequence[str | pathlib.Path]) -> None:
+    def __init__(self,
+                 pathnames: Sequence[str | pathlib.Path],
+                 ghost_level: int = 0) -> None:
         """
         :arg pathnames: a list of paths to indivitual VTK files containing
             different pieces of a grid.
+        :arg ghost_level: number of layers of ghost cells contained in each
+            piece, e.g. as constructed by
+            :func:`pyvisfile.vtk.tools.make_ghosted_pieces`.
         """
         super().__init__()
         self.pathnames = tuple(str(p) for p in pathnames)
+        self.ghost_level = ghost_level
 
     def gen_unstructured_grid(self, ugrid: UnstructuredGrid) -> XMLElement:
-        el = XMLElement("PUnstructuredGrid")
+        if self.ghost_level > 0:
+            el = XMLElement("PUnstructuredGrid", GhostLevel=self.ghost_level)
+        else:
+            el = XMLElement("PUnstructuredGrid")
 
         pointdata = XMLElement("PPointData")
         el.add_child(pointdata)
         for data_array in ugrid.pointdata:
             pointdata.add_child(self.rec(data_array))
 
+        if ugrid.celldata:
+            celldata = XMLElement("PCellData")
+            el.add_child(celldata)
+            for data_array in ugrid.celldata:
+                celldata.add_child(self.rec(data_array))
+
         points = XMLElement("PPoints")
         el.add_child(points)
         points.add_child(self.rec(ugrid.points))
@@ -1062,4 +1281,189 @@ def write_structured_grid(
     with open(file_name, "w") as outf:
         AppendedDataXMLGenerator()(grid).write(outf)
 
+
+def _write_composite(
+        file_name: pathlib.Path,
+        root: XMLElement,
+        leaves: Sequence[tuple[pathlib.Path, Visitable]], *,
+        version: str,
+        compressor: str | None,
+        max_workers: int | None,
+        overwrite: bool) -> None:
+    """Write the *leaves* concurrently and then the composite dataset
+    described by *root* to *file_name*.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    for leaf_name in [file_name, *(leaf_name for leaf_name, _ in leaves)]:
+        if not overwrite and leaf_name.exists():
+            raise FileExistsError(f"Output file '{leaf_name}' already exists")
+
+    for dirname in {leaf_name.parent for leaf_name, _ in leaves}:
+        dirname.mkdir(parents=True, exist_ok=True)
+
+    def write_leaf(leaf: tuple[pathlib.Path, Visitable]) -> None:
+        leaf_name, grid = leaf
+        with open(leaf_name, "w") as outf:
+            AppendedDataXMLGenerator(compressor)(grid).write(outf)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(write_leaf, leaves))
+
+    vtkf = make_vtkfile(root.tag, version=version)
+    vtkf.add_child(root)
+    with open(file_name, "w") as outf:
+        XMLRoot(vtkf).write(outf)
+
+
+def write_multiblock(
+        file_name: str | pathlib.Path,
+        blocks: Mapping[str, Any] | Sequence[Any],
+        compressor: str | None = None,
+        max_workers: int | None = None,
+        overwrite: bool = False) -> list[pathlib.Path]:
+    """Write a ``vtkMultiBlockDataSet`` to *file_name*, usually with a
+    ``.vtm`` extension.
+
+    The grids are written to separate files in a directory next to
+    *file_name* (named after its stem), concurrently in a
+    :class:`~concurrent.futures.ThreadPoolExecutor`. The ``.vtm`` file only
+    contains the block hierarchy and references to these files.
+
+    :arg blocks: a (nested) mapping or sequence of :class:`UnstructuredGrid`,
+        :class:`StructuredGrid` and :class:`ImageData` objects. The keys of a
+        mapping are used as the block names.
+    :arg compressor: passed on to the :class:`AppendedDataXMLGenerator` for
+        each grid.
+    :arg max_workers: passed on to the
+        :class:`~concurrent.futures.ThreadPoolExecutor`.
+    :arg overwrite: if *True*, existing files are overwritten, otherwise an
+        exception is raised.
+
+    :returns: the file names of all the grids, in the order of the blocks.
+    """
+    file_name = pathlib.Path(file_name)
+    dirname = file_name.parent / file_name.stem
+    leaves: list[tuple[pathlib.Path, Visitable]] = []
+
+    def add_blocks(el: XMLElement, block: Mapping[str, Any] | Sequence[Any]) -> None:
+        if isinstance(block, Mapping):
+            children = [(str(name), child) for name, child in block.items()]
+        else:
+            children = [(None, child) for child in block]
+
+        for i, (name, child) in enumerate(children):
+            attributes: dict[str, op.CanStr] = {"index": i}
+            if name is not None:
+                attributes["name"] = name
+
+            if isinstance(child, (UnstructuredGrid, StructuredGrid, ImageData)):
+                leaf_name = dirname / (
+                    f"{file_name.stem}_{len(leaves)}.{child.vtk_extension()}")
+                leaves.append((leaf_name, child))
+
+                el.add_child(XMLElement("DataSet", **attributes,
+                    file=leaf_name.relative_to(file_name.parent).as_posix()))
+            else:
+                child_el = XMLElement("Block", **attributes)
+                add_blocks(child_el, child)
+                el.add_child(child_el)
+
+    if isinstance(blocks, (UnstructuredGrid, StructuredGrid, ImageData)):
+        raise TypeError("'blocks' must be a mapping or a sequence of grids")
+
+    root = XMLElement("vtkMultiBlockDataSet")
+    add_blocks(root, blocks)
+
+    _write_composite(file_name, root, leaves,
+        version="1.0",
+        compressor=compressor, max_workers=max_workers, overwrite=overwrite)
+
+    return [leaf_name for leaf_name, _ in leaves]
+
+
+def write_overlapping_amr(
+        file_name: str | pathlib.Path,
+        levels: Sequence[Sequence[ImageData]],
+        compressor: str | None = None,
+        max_workers: int | None = None,
+        overwrite: bool = False) -> list[pathlib.Path]:
+    """Write a ``vtkOverlappingAMR`` dataset to *file_name*, usually with a
+    ``.vthb`` extension.
+
+    Each block is written to a separate ``.vti`` file in a directory next to
+    *file_name* (named after its stem), concurrently in a
+    :class:`~concurrent.futures.ThreadPoolExecutor`. The ``.vthb`` file
+    contains the spacing of each level and the box covered by each block,
+    from which readers determine the refinement ratios between the levels.
+
+    :arg levels: a sequence of levels, from coarsest to finest, each given by
+        a sequence of :class:`ImageData` blocks. All the blocks on a level
+        must have the same spacing and their origins must lie on the lattice
+        of the coarsest level. The spacing on each level must divide the
+        spacing on the previous level by an integer refinement ratio.
+    :arg compressor: passed on to the :class:`AppendedDataXMLGenerator` for
+        each block.
+    :arg overwrite: if *True*, existing files are overwritten, otherwise an
+        exception is raised.
+
+    :returns: the file names of all the blocks, ordered by level.
+    """
+    file_name = pathlib.Path(file_name)
+    dirname = file_name.parent / file_name.stem
+
+    blocks = [block for level in levels for block in level]
+    if not levels or not levels[0]:
+        raise ValueError("the coarsest level must contain at least one block")
+
+    origin = np.min([block.origin for block in levels[0]], axis=0)
+    ndims = max(block.ndims for block in blocks)
+
+    root = XMLElement("vtkOverlappingAMR",
+        origin=" ".join(str(x) for x in origin),
+        grid_description="XYZ"[:ndims])
+
+    leaves: list[tuple[pathlib.Path, Visitable]] = []
+    prev_spacing = None
+    for ilevel, level in enumerate(levels):
+        spacings = np.array([block.spacing for block in level])
+        if not len(level) or not np.allclose(spacings, spacings[0]):
+            raise ValueError(
+                f"blocks on level {ilevel} must have the same spacing")
+
+        spacing = spacings[0]
+        if prev_spacing is not None:
+            ratio = prev_spacing / spacing
+            if not np.allclose(ratio, np.rint(ratio)) or np.any(ratio < 1):
+                raise ValueError(
+                    f"level {ilevel} does not refine the previous level "
+                    f"by an integer ratio: {ratio}")
+        prev_spacing = spacing
+
+        level_el = XMLElement("Block",
+            level=ilevel,
+            spacing=" ".join(str(h) for h in spacing))
+        root.add_child(level_el)
+
+        for i, block in enumerate(level):
+            # NOTE: the extents are relative to the origin of each block
+            shift = np.rint((np.array(block.origin) - origin) / spacing)
+            lower = block.extent[0::2] + shift.astype(np.int64)
+            upper = block.extent[1::2] + shift.astype(np.int64) - 1
+            amr_box = np.stack([lower, np.maximum(lower, upper)], axis=1)
+
+            leaf_name = dirname / f"{file_name.stem}_{ilevel}_{i}.vti"
+            leaves.append((leaf_name, block))
+
+            level_el.add_child(XMLElement("DataSet",
+                index=i,
+                amr_box=" ".join(str(n) for n in amr_box.reshape(-1)),
+                file=leaf_name.relative_to(file_name.parent).as_posix()))
+
+    _write_composite(file_name, root, leaves,
+        version="1.1",
+        compressor=compressor, max_workers=max_workers, overwrite=overwrite)
+
+    return [leaf_name for leaf_name, _ in leaves]
+
 # }}}
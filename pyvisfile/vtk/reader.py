@@ -0,0 +1,608 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2026 Andreas Kloeckner"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import mmap
+import os
+import zlib
+from base64 import b64decode
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from xml.etree.ElementTree import Element, fromstring, parse
+
+import numpy as np
+from typing_extensions import Self
+
+from pyvisfile.vtk import (
+    VF_LIST_OF_VECTORS,
+    VTK_TO_NUMPY_TYPES,
+    DataArray,
+    StructuredGrid,
+    UnstructuredGrid,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from types import TracebackType
+
+
+__doc__ = """
+Reading
+-------
+
+This reader supports the subset of the VTK XML formats that is written by
+:class:`~pyvisfile.vtk.InlineXMLGenerator` and
+:class:`~pyvisfile.vtk.AppendedDataXMLGenerator`, i.e. ``.vtu`` and ``.vts``
+files with ``ascii``, ``binary`` or ``appended`` data arrays. Only the XML
+header is parsed when opening a file and no array is decoded until it is
+requested with :meth:`XMLReader.read_array`. Uncompressed arrays stored in
+``raw`` appended data are returned as a read-only :class:`numpy.memmap`.
+
+.. autoclass:: XMLReader
+.. autoclass:: XMLArrayInfo
+
+Parallel files
+--------------
+
+.. autofunction:: read_parallel_unstructured_grid
+.. autofunction:: merge_parallel_unstructured_grid
+"""
+
+
+_APPENDED_DATA_TAG = b"<AppendedData"
+
+_VTK_HEADER_TYPES = {
+    "UInt32": np.uint32,
+    "UInt64": np.uint64,
+}
+
+_VTK_BYTE_ORDERS = {
+    "LittleEndian": "<",
+    "BigEndian": ">",
+}
+
+
+def _b64_length(nbytes: int) -> int:
+    return 4 * ((nbytes + 2) // 3)
+
+
+# {{{ array info
+
+@dataclass(frozen=True)
+class XMLArrayInfo:
+    """Description of a ``DataArray`` found in the header of a VTK XML file.
+
+    .. attribute:: name
+    .. attribute:: section
+
+        Name of the element containing the array, e.g. ``"PointData"``,
+        ``"CellData"``, ``"Points"`` or ``"Cells"``.
+
+    .. attribute:: type
+
+        VTK type name of the array, e.g. ``"Float64"``.
+
+    .. attribute:: components
+
+        Number of components of each tuple in the array.
+
+    .. attribute:: format
+
+        One of ``"ascii"``, ``"binary"`` or ``"appended"``.
+
+    .. attribute:: offset
+
+        Offset of the array in the appended data section, if
+        :attr:`format` is ``"appended"``, and *None* otherwise.
+    """
+
+    name: str
+    section: str
+    type: str
+    components: int
+    format: str
+    offset: int | None
+    element: Element
+
+# }}}
+
+
+# {{{ reader
+
+class XMLReader:
+    """Reader for a single VTK XML file.
+
+    .. attribute:: file_type
+
+        The type of the dataset in the file, e.g. ``"UnstructuredGrid"``.
+
+    .. attribute:: version
+    .. attribute:: pieces
+
+        A :class:`list` of ``Piece`` elements. The piece attributes, e.g.
+        ``NumberOfPoints`` or ``Extent``, can be obtained from here.
+
+    .. automethod:: __init__
+    .. automethod:: close
+
+    .. automethod:: get_arrays
+    .. automethod:: read_array
+    .. automethod:: read_points
+    .. automethod:: read_unstructured_grid
+    .. automethod:: read_structured_grid
+    """
+
+    file_type: str
+    version: str
+    pieces: list[Element]
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+
+        with open(filename, "rb") as inf:
+            self._mmap = mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # NOTE: the appended data (which can be raw binary) is not valid XML,
+        # so only the part of the file before it is handed to the parser
+        appended_start = self._mmap.find(_APPENDED_DATA_TAG)
+        if appended_start < 0:
+            root = fromstring(self._mmap[:])
+            self._appended_encoding = None
+            self._appended_offset = -1
+        else:
+            root = fromstring(self._mmap[:appended_start] + b"</VTKFile>")
+
+            tag_end = self._mmap.find(b">", appended_start)
+            appended = fromstring(self._mmap[appended_start:tag_end] + b"/>")
+            self._appended_encoding = appended.get("encoding", "raw")
+            self._appended_offset = self._mmap.find(b"_", tag_end) + 1
+
+        if root.tag != "VTKFile":
+            raise ValueError(f"'{filename}' is not a VTK XML file")
+
+        self.file_type = root.get("type", "")
+        self.version = root.get("version", "0.1")
+
+        compressor = root.get("compressor")
+        if compressor not in {None, "vtkZLibDataCompressor"}:
+            raise ValueError(f"unsupported compressor: '{compressor}'")
+        self._compressed = compressor is not None
+
+        byte_order = _VTK_BYTE_ORDERS[root.get("byte_order", "LittleEndian")]
+        self._byte_order = byte_order
+        self._header_dtype = np.dtype(
+            _VTK_HEADER_TYPES[root.get("header_type", "UInt32")]
+            ).newbyteorder(byte_order)
+
+        dataset = root.find(self.file_type)
+        if dataset is None:
+            raise ValueError(
+                f"'{filename}' does not contain a '{self.file_type}' element")
+
+        self.pieces = dataset.findall("Piece")
+        self._arrays = [self._index_piece(piece) for piece in self.pieces]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map of the file.
+
+        Arrays returned as :class:`numpy.memmap` are not affected.
+        """
+        self._mmap.close()
+
+    @staticmethod
+    def _index_piece(piece: Element) -> dict[str, dict[str, XMLArrayInfo]]:
+        result: dict[str, dict[str, XMLArrayInfo]] = {}
+        for section in piece:
+            arrays = result.setdefault(section.tag, {})
+            for i, el in enumerate(section.findall("DataArray")):
+                name = el.get("Name", str(i))
+                offset = el.get("offset")
+
+                arrays[name] = XMLArrayInfo(
+                    name=name,
+                    section=section.tag,
+                    type=el.get("type", "Float32"),
+                    components=int(el.get("NumberOfComponents", "1")),
+                    format=el.get("format", "ascii"),
+                    offset=None if offset is None else int(offset),
+                    element=el)
+
+        return result
+
+    # {{{ decoding
+
+    def _dtype(self, info: XMLArrayInfo) -> np.dtype[Any]:
+        try:
+            dtype = np.dtype(VTK_TO_NUMPY_TYPES[info.type])
+        except KeyError:
+            raise ValueError(
+                f"array '{info.name}' has unsupported type: '{info.type}'"
+                ) from None
+
+        return dtype.newbyteorder(self._byte_order)
+
+    def _read_header(self,
+                     read: Callable[[int, int], bytes],
+                     pos: int, count: int, encoded: bool,
+                     ) -> tuple[np.ndarray[Any, np.dtype[Any]], int]:
+        nbytes = count * self._header_dtype.itemsize
+        if encoded:
+            # NOTE: the header is encoded separately from the data
+            length = _b64_length(nbytes)
+            buf = b64decode(read(pos, length))[:nbytes]
+        else:
+            length = nbytes
+            buf = read(pos, length)
+
+        return np.frombuffer(buf, dtype=self._header_dtype).astype(np.int64), length
+
+    def _decode(self,
+                read: Callable[[int, int], bytes],
+                pos: int, encoded: bool) -> bytes:
+        if not self._compressed:
+            (nbytes,), length = self._read_header(read, pos, 1, encoded)
+            pos += length
+
+            if encoded:
+                return b64decode(read(pos, _b64_length(nbytes)))[:nbytes]
+            else:
+                return read(pos, nbytes)
+
+        # header is [nblocks, block_size, last_block_size, *compressed_sizes]
+        (nblocks, _, _), _ = self._read_header(read, pos, 3, encoded)
+        header, length = self._read_header(read, pos, 3 + nblocks, encoded)
+        pos += length
+
+        block_sizes = header[3:]
+        nbytes = int(np.sum(block_sizes))
+        if encoded:
+            buf = b64decode(read(pos, _b64_length(nbytes)))[:nbytes]
+        else:
+            buf = read(pos, nbytes)
+
+        block_offsets = np.cumsum(block_sizes) - block_sizes
+        return b"".join(
+            zlib.decompress(buf[start:start + size])
+            for start, size in zip(block_offsets, block_sizes, strict=True))
+
+    def _read_appended(self, info: XMLArrayInfo) -> Any:
+        assert info.offset is not None
+        dtype = self._dtype(info)
+
+        start = self._appended_offset
+        mm = self._mmap
+
+        def read(pos: int, n: int) -> bytes:
+            return mm[start + pos:start + pos + n]
+
+        if self._appended_encoding == "base64":
+            return np.frombuffer(self._decode(read, info.offset, True), dtype=dtype)
+        elif self._appended_encoding != "raw":
+            raise ValueError(
+                f"unsupported appended data encoding: '{self._appended_encoding}'")
+
+        if self._compressed:
+            return np.frombuffer(self._decode(read, info.offset, False), dtype=dtype)
+
+        (nbytes,), length = self._read_header(read, info.offset, 1, False)
+        return np.memmap(self.filename, dtype=dtype, mode="r",
+                         offset=start + info.offset + length,
+                         shape=(nbytes // dtype.itemsize,))
+
+    def _read_inline(self, info: XMLArrayInfo) -> Any:
+        dtype = self._dtype(info)
+        text = (info.element.text or "").strip()
+
+        if info.format == "ascii":
+            return np.array(text.split(), dtype=dtype)
+        elif info.format != "binary":
+            raise ValueError(
+                f"array '{info.name}' has unsupported format: '{info.format}'")
+
+        buf = text.encode("ascii")
+
+        def read(pos: int, n: int) -> bytes:
+            return buf[pos:pos + n]
+
+        return np.frombuffer(self._decode(read, 0, True), dtype=dtype)
+
+    # }}}
+
+    def get_arrays(self,
+                   section: str = "PointData",
+                   piece: int = 0) -> dict[str, XMLArrayInfo]:
+        """
+        :arg section: name of the element containing the arrays, e.g.
+            ``"PointData"`` or ``"CellData"``.
+        :returns: a mapping from array names in *section* to their
+            :class:`XMLArrayInfo`. This does not read any data.
+        """
+        return self._arrays[piece].get(section, {})
+
+    def read_array(self,
+                   name: str,
+                   section: str = "PointData",
+                   piece: int = 0) -> np.ndarray[Any, np.dtype[Any]]:
+        """Decode a single array from the file.
+
+        :returns: an array of shape ``(n,)`` or ``(n, components)``, as it is
+            stored in the file.
+        """
+        arrays = self.get_arrays(section, piece)
+        if name not in arrays:
+            raise KeyError(f"array '{name}' not found in '{section}'")
+
+        info = arrays[name]
+        if info.format == "appended":
+            if self._appended_encoding is None:
+                raise ValueError(f"'{self.filename}' has no 'AppendedData'")
+
+            ary = self._read_appended(info)
+        else:
+            ary = self._read_inline(info)
+
+        if info.components > 1:
+            ary = ary.reshape(-1, info.components)
+
+        return ary
+
+    def read_points(self, piece: int = 0) -> np.ndarray[Any, np.dtype[Any]]:
+        """
+        :returns: an array of shape ``(npoints, 3)`` with the point coordinates.
+        """
+        (name,) = self.get_arrays("Points", piece)
+        return self.read_array(name, "Points", piece)
+
+    def _add_data(self,
+                  grid: UnstructuredGrid | StructuredGrid,
+                  piece: int,
+                  point_data: Sequence[str] | None,
+                  cell_data: Sequence[str] | None) -> None:
+        if point_data is None:
+            point_data = list(self.get_arrays("PointData", piece))
+
+        if cell_data is None:
+            cell_data = list(self.get_arrays("CellData", piece))
+
+        for name in point_data:
+            grid.add_pointdata(DataArray(
+                name, self.read_array(name, "PointData", piece),
+                vector_format=VF_LIST_OF_VECTORS))
+
+        for name in cell_data:
+            grid.add_celldata(DataArray(
+                name, self.read_array(name, "CellData", piece),
+                vector_format=VF_LIST_OF_VECTORS))
+
+    def read_unstructured_grid(self,
+                               piece: int = 0, *,
+                               point_data: Sequence[str] | None = None,
+                               cell_data: Sequence[str] | None = None,
+                               ) -> UnstructuredGrid:
+        """Read a piece of a ``.vtu`` file into an
+        :class:`~pyvisfile.vtk.UnstructuredGrid`.
+
+        :arg point_data: names of the point data arrays to read. If *None*,
+            all the arrays are read.
+        :arg cell_data: names of the cell data arrays to read. If *None*,
+            all the arrays are read.
+        """
+        if self.file_type != "UnstructuredGrid":
+            raise ValueError(f"cannot read an unstructured grid from a "
+                             f"'{self.file_type}' file")
+
+        el = self.pieces[piece]
+        points = self.read_points(piece)
+        grid = UnstructuredGrid(
+            (int(el.get("NumberOfPoints", "0")),
+             DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=(int(el.get("NumberOfCells", "0")),
+                   DataArray("connectivity",
+                             self.read_array("connectivity", "Cells", piece)),
+                   DataArray("offsets",
+                             self.read_array("offsets", "Cells", piece))),
+            cell_types=DataArray("types", self.read_array("types", "Cells", piece)))
+
+        self._add_data(grid, piece, point_data, cell_data)
+        return grid
+
+    def read_structured_grid(self,
+                             piece: int = 0, *,
+                             point_data: Sequence[str] | None = None,
+                             cell_data: Sequence[str] | None = None,
+                             ) -> StructuredGrid:
+        """Read a piece of a ``.vts`` file into a
+        :class:`~pyvisfile.vtk.StructuredGrid`.
+
+        The dimension of the grid is determined from the non-trivial axes of
+        the piece extent. The arguments are the same as for
+        :meth:`read_unstructured_grid`.
+        """
+        if self.file_type != "StructuredGrid":
+            raise ValueError(f"cannot read a structured grid from a "
+                             f"'{self.file_type}' file")
+
+        extent = [int(i) for i in self.pieces[piece].get("Extent", "").split()]
+        shape = [hi - lo + 1 for lo, hi in zip(extent[::2], extent[1::2], strict=True)]
+        ndims = max((i + 1 for i, n in enumerate(shape) if n > 1), default=1)
+
+        points = self.read_points(piece)
+        mesh = points.reshape(*shape[:ndims][::-1], -1)[..., :ndims]
+        grid = StructuredGrid(np.moveaxis(mesh, -1, 0).copy())
+
+        self._add_data(grid, piece, point_data, cell_data)
+        return grid
+
+# }}}
+
+
+# {{{ parallel files
+
+def _get_piece_sources(filename: str) -> list[str]:
+    root = parse(filename).getroot()
+    if root.get("type") != "PUnstructuredGrid":
+        raise ValueError(f"'{filename}' is not a parallel unstructured grid file")
+
+    dataset = root.find("PUnstructuredGrid")
+    assert dataset is not None
+
+    dirname = os.path.dirname(filename)
+    return [os.path.join(dirname, piece.get("Source", ""))
+            for piece in dataset.findall("Piece")]
+
+
+def _read_unstructured_grid_pieces(
+        filenames: Sequence[str], *,
+        point_data: Sequence[str] | None,
+        cell_data: Sequence[str] | None) -> list[UnstructuredGrid]:
+    grids = []
+    for filename in filenames:
+        with XMLReader(filename) as reader:
+            grids.extend(
+                reader.read_unstructured_grid(
+                    i, point_data=point_data, cell_data=cell_data)
+                for i in range(len(reader.pieces)))
+
+    return grids
+
+
+def read_parallel_unstructured_grid(
+        filename: str, *,
+        point_data: Sequence[str] | None = None,
+        cell_data: Sequence[str] | None = None,
+        max_workers: int | None = None) -> UnstructuredGrid:
+    """Read all the pieces listed in the ``.pvtu`` file *filename* into a
+    single grid.
+
+    The pieces are read concurrently in a
+    :class:`~concurrent.futures.ThreadPoolExecutor` (decompression and file
+    access release the GIL) and combined using
+    :func:`~pyvisfile.vtk.tools.merge_unstructured_grids`.
+
+    :arg point_data: names of the point data arrays to read. If *None*, all
+        the arrays are read.
+    :arg cell_data: names of the cell data arrays to read. If *None*, all the
+        arrays are read.
+    :arg max_workers: passed on to the
+        :class:`~concurrent.futures.ThreadPoolExecutor`.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyvisfile.vtk.tools import merge_unstructured_grids
+
+    def read(source: str) -> list[UnstructuredGrid]:
+        return _read_unstructured_grid_pieces(
+            [source], point_data=point_data, cell_data=cell_data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        grids = [
+            grid
+            for piece_grids in pool.map(read, _get_piece_sources(filename))
+            for grid in piece_grids]
+
+    return merge_unstructured_grids(grids)
+
+
+def merge_parallel_unstructured_grid(
+        filename: str,
+        output_filename: str,
+        npieces: int = 1, *,
+        compressor: str | None = None,
+        max_workers: int | None = None,
+        overwrite: bool = False) -> list[str]:
+    """Combine the pieces listed in the ``.pvtu`` file *filename* into
+    *npieces* pieces and write them to *output_filename*.
+
+    The original pieces are split into *npieces* contiguous groups, which are
+    each read, merged and written as a ``.vtu`` file next to
+    *output_filename* concurrently, so that at most *max_workers* merged
+    pieces are kept in memory at a time.
+
+    :arg output_filename: name of the ``.pvtu`` file listing the merged pieces.
+        The pieces are named ``{stem}-piece-{i}.vtu`` after its stem.
+    :arg compressor: passed on to the
+        :class:`~pyvisfile.vtk.AppendedDataXMLGenerator` for the pieces.
+    :arg overwrite: if *True*, existing files are overwritten, otherwise an
+        exception is raised.
+
+    :returns: the file names of the merged pieces.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyvisfile.vtk import AppendedDataXMLGenerator, ParallelXMLGenerator
+    from pyvisfile.vtk.tools import merge_unstructured_grids
+
+    if npieces <= 0:
+        raise ValueError(f"'npieces' must be positive: {npieces}")
+
+    sources = _get_piece_sources(filename)
+    if not sources:
+        raise ValueError(f"'{filename}' does not list any pieces")
+
+    groups = [
+        [sources[i] for i in group]
+        for group in np.array_split(np.arange(len(sources)), npieces)
+        if group.size]
+
+    stem, _ = os.path.splitext(output_filename)
+    pathnames = [f"{stem}-piece-{i}.vtu" for i in range(len(groups))]
+
+    for pathname in [output_filename, *pathnames]:
+        if not overwrite and os.path.exists(pathname):
+            raise FileExistsError(f"Output file '{pathname}' already exists")
+
+    def merge(i: int) -> UnstructuredGrid | None:
+        grid = merge_unstructured_grids(_read_unstructured_grid_pieces(
+            groups[i], point_data=None, cell_data=None))
+
+        with open(pathnames[i], "w") as outf:
+            AppendedDataXMLGenerator(compressor)(grid).write(outf)
+
+        # NOTE: only the first grid is kept to describe the arrays in the .pvtu
+        return grid if i == 0 else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        (grid, *_) = pool.map(merge, range(len(groups)))
+
+    assert grid is not None
+    dirname = os.path.dirname(output_filename)
+    with open(output_filename, "w") as outf:
+        ParallelXMLGenerator([
+            os.path.relpath(pathname, dirname or os.curdir)
+            for pathname in pathnames
+            ])(grid).write(outf)
+
+    return pathnames
+
+# }}}
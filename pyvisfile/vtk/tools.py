@@ -0,0 +1,1039 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2026 Andreas Kloeckner"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from pyvisfile.vtk import (
+    VF_LIST_OF_COMPONENTS,
+    VF_LIST_OF_VECTORS,
+    VTK_HEXAHEDRON,
+    VTK_LAGRANGE_CURVE,
+    VTK_LAGRANGE_HEXAHEDRON,
+    VTK_LAGRANGE_PYRAMID,
+    VTK_LAGRANGE_QUADRILATERAL,
+    VTK_LAGRANGE_TETRAHEDRON,
+    VTK_LAGRANGE_TRIANGLE,
+    VTK_LAGRANGE_WEDGE,
+    VTK_LINE,
+    VTK_QUAD,
+    VTK_TETRA,
+    VTK_TRIANGLE,
+    VTK_WEDGE,
+    DataArray,
+    UnstructuredGrid,
+    _narrow_index_array,
+    _parse_vtk_file_version,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import optype.numpy as onp
+
+
+__doc__ = """
+Grid Construction
+-----------------
+
+.. autofunction:: make_lagrange_grid
+
+Grid Transformations
+--------------------
+
+The functions in this module take an existing
+:class:`~pyvisfile.vtk.UnstructuredGrid` and return a new grid that is
+(usually) cheaper to store or render. The point and cell data attached to the
+grid is transformed consistently. All operations are vectorized over the
+points and cells of the grid.
+
+.. autofunction:: weld_points
+.. autofunction:: reorder_spatially
+.. autofunction:: make_linear_subcell_grid
+.. autofunction:: merge_unstructured_grids
+.. autofunction:: extract_cells
+
+Partitioning
+------------
+
+.. autofunction:: make_ghosted_pieces
+"""
+
+
+# {{{ helpers
+
+def _make_data_array(name: str, ary: onp.ArrayND[Any]) -> DataArray:
+    # NOTE: arrays recovered with `DataArray.to_numpy` are already (n, ncomponents)
+    return DataArray(name, ary, vector_format=VF_LIST_OF_VECTORS)
+
+
+def _make_unstructured_grid(
+        grid: UnstructuredGrid,
+        points: DataArray | onp.ArrayND[np.floating[Any]],
+        cells: tuple[int, DataArray, DataArray],
+        cell_types: DataArray) -> UnstructuredGrid:
+    if not isinstance(points, DataArray):
+        points = _make_data_array("points", points)
+
+    point_count = len(points.to_numpy())
+    result = UnstructuredGrid((point_count, points), cells, cell_types)
+    result.min_vtk_file_version = grid.min_vtk_file_version
+
+    return result
+
+
+def _index_array_like(
+        ary: onp.Array1D[np.integer[Any]],
+        dtype: np.dtype[Any],
+        ) -> tuple[onp.Array1D[np.integer[Any]], str]:
+    """Convert the index array *ary* to *dtype*, if its values fit, or to the
+    type chosen by :func:`~pyvisfile.vtk._narrow_index_array` otherwise.
+
+    :returns: a tuple ``(ary, version)``, where *version* is the minimum VTK
+        XML file format version required to read the converted array.
+    """
+    if ary.size == 0 or ary.max() <= np.iinfo(dtype).max:
+        return ary.astype(dtype, copy=False), "0.1"
+
+    return _narrow_index_array(ary)
+
+
+def _cell_starts_and_counts(
+        offsets: onp.Array1D[np.integer[Any]]
+        ) -> tuple[onp.Array1D[np.int64], onp.Array1D[np.int64]]:
+    offsets = offsets.astype(np.int64)
+    counts = np.diff(offsets, prepend=0)
+
+    return offsets - counts, counts
+
+
+def _gather_cells(
+        connectivity: onp.Array1D[np.integer[Any]],
+        offsets: onp.Array1D[np.integer[Any]],
+        cell_indices: onp.Array1D[np.integer[Any]],
+        ) -> tuple[onp.Array1D[np.integer[Any]], onp.Array1D[np.integer[Any]], str]:
+    """Gather the connectivity of the cells in *cell_indices* (in that order).
+
+    :returns: a tuple ``(connectivity, offsets, version)`` for the gathered
+        cells, where the *offsets* are converted with :func:`_index_array_like`,
+        since repeated cells can overflow the original dtype.
+    """
+    starts, counts = _cell_starts_and_counts(offsets)
+
+    new_counts = counts[cell_indices]
+    new_offsets = np.cumsum(new_counts)
+    nentries = int(new_offsets[-1]) if new_offsets.size else 0
+
+    index = (
+        np.repeat(starts[cell_indices] - (new_offsets - new_counts), new_counts)
+        + np.arange(nentries))
+
+    new_offsets, version = _index_array_like(new_offsets, offsets.dtype)
+    return connectivity[index], new_offsets, version
+
+
+@dataclass(frozen=True)
+class _DecodedGrid:
+    """The arrays of an :class:`~pyvisfile.vtk.UnstructuredGrid`, decoded
+    once with :meth:`~pyvisfile.vtk.DataArray.to_numpy`.
+    """
+
+    points: onp.Array2D[np.floating[Any]]
+    connectivity: onp.Array1D[np.integer[Any]]
+    offsets: onp.Array1D[np.integer[Any]]
+    cell_types: onp.Array1D[np.integer[Any]]
+    pointdata: tuple[tuple[str, onp.ArrayND[Any]], ...]
+    celldata: tuple[tuple[str, onp.ArrayND[Any]], ...]
+
+
+def _decode_grid(grid: UnstructuredGrid) -> _DecodedGrid:
+    return _DecodedGrid(
+        points=grid.points.to_numpy(),
+        connectivity=grid.cell_connectivity.to_numpy(),
+        offsets=grid.cell_offsets.to_numpy(),
+        cell_types=grid.cell_types.to_numpy(),
+        pointdata=tuple((ary.name, ary.to_numpy()) for ary in grid.pointdata),
+        celldata=tuple((ary.name, ary.to_numpy()) for ary in grid.celldata),
+        )
+
+
+def _extract_cells(
+        grid: UnstructuredGrid,
+        cell_indices: onp.Array1D[np.integer[Any]], *,
+        decoded: _DecodedGrid | None = None,
+        ) -> tuple[UnstructuredGrid, onp.Array1D[np.integer[Any]]]:
+    """Construct a grid from the cells in *cell_indices* (in that order)
+    and the points they reference.
+
+    :arg decoded: the arrays of *grid*, if already decoded, e.g. when
+        extracting many subsets of the same grid.
+    :returns: a tuple ``(grid, point_indices)``, where *point_indices* are the
+        indices of the retained points in *grid*.
+    """
+    if decoded is None:
+        decoded = _decode_grid(grid)
+
+    connectivity, offsets, version = _gather_cells(
+        decoded.connectivity, decoded.offsets, cell_indices)
+
+    point_indices, inverse = np.unique(connectivity, return_inverse=True)
+    connectivity = inverse.reshape(-1).astype(connectivity.dtype, copy=False)
+
+    result = _make_unstructured_grid(
+        grid,
+        decoded.points[point_indices],
+        (len(cell_indices),
+         DataArray("connectivity", connectivity),
+         DataArray("offsets", offsets)),
+        DataArray("types", decoded.cell_types[cell_indices]))
+    result.min_vtk_file_version = max(
+        result.min_vtk_file_version, version, key=_parse_vtk_file_version)
+
+    for name, ary in decoded.pointdata:
+        result.add_pointdata(_make_data_array(name, ary[point_indices]))
+
+    for name, ary in decoded.celldata:
+        result.add_celldata(_make_data_array(name, ary[cell_indices]))
+
+    return result, point_indices
+
+# }}}
+
+
+# {{{ weld_points
+
+def weld_points(
+        grid: UnstructuredGrid,
+        tol: float = 0.0, *,
+        average_pointdata: bool = True) -> UnstructuredGrid:
+    """Merge coincident points in *grid*.
+
+    This is mainly useful for discontinuous (e.g. DG) output, where each
+    element stores its own copy of the shared nodes. The points are merged
+    by snapping them to a lattice of size *tol* and removing duplicates
+    with a sort-based :func:`numpy.unique`. Note that, as a result, two points
+    closer than *tol* can still remain separate if they are on different
+    sides of a lattice cell boundary.
+
+    :arg tol: absolute tolerance used to identify coincident points. If zero,
+        only points with bitwise identical coordinates are merged.
+    :arg average_pointdata: if *True*, floating point data of merged points
+        is averaged. Otherwise (and for integer data), the value of the first
+        merged point is kept.
+
+    :returns: a new grid with the merged points. The cell data and the offsets
+        and types of the cells are shared with *grid*.
+    """
+    if tol < 0:
+        raise ValueError(f"'tol' must be non-negative: {tol}")
+
+    points = grid.points.to_numpy()
+    if tol > 0:
+        scaled = points / tol
+        if scaled.size and np.max(np.abs(scaled)) >= 2**62:
+            raise ValueError(f"'tol' is too small for the point coordinates: {tol}")
+
+        keys = np.rint(scaled).astype(np.int64)
+    else:
+        keys = points
+
+    _, index, inverse, counts = np.unique(
+        keys, axis=0,
+        return_index=True, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+
+    def weld(ary: onp.ArrayND[Any]) -> onp.ArrayND[Any]:
+        if not average_pointdata or ary.dtype.kind != "f":
+            return ary[index]
+
+        shape = ary.shape
+        ary = ary.reshape(len(inverse), -1)
+        result = np.stack([
+            np.bincount(inverse, weights=ary[:, i], minlength=len(counts))
+            for i in range(ary.shape[1])
+            ], axis=1) / counts.reshape(-1, 1)
+
+        return result.reshape(-1, *shape[1:]).astype(ary.dtype, copy=False)
+
+    connectivity = grid.cell_connectivity.to_numpy()
+    connectivity = inverse[connectivity].astype(connectivity.dtype, copy=False)
+
+    result = _make_unstructured_grid(
+        grid,
+        weld(points),
+        (grid.cell_count,
+         DataArray("connectivity", connectivity),
+         grid.cell_offsets),
+        grid.cell_types)
+
+    for data_array in grid.pointdata:
+        result.add_pointdata(
+            _make_data_array(data_array.name, weld(data_array.to_numpy())))
+
+    for data_array in grid.celldata:
+        result.add_celldata(data_array)
+
+    return result
+
+# }}}
+
+
+# {{{ reorder_spatially
+
+def _interleave_bits(
+        coords: onp.Array2D[np.uint64], bits: int) -> onp.Array1D[np.uint64]:
+    one = np.uint64(1)
+
+    key = np.zeros(coords.shape[0], dtype=np.uint64)
+    for b in range(bits - 1, -1, -1):
+        for i in range(coords.shape[1]):
+            key = (key << one) | ((coords[:, i] >> np.uint64(b)) & one)
+
+    return key
+
+
+def _hilbert_transpose(
+        coords: onp.Array2D[np.uint64], bits: int) -> onp.Array2D[np.uint64]:
+    # NOTE: this is a vectorized version of `AxestoTranspose` from
+    #   J. Skilling, Programming the Hilbert Curve, AIP Conf. Proc. 707, 2004
+    x = coords.copy()
+    ndim = x.shape[1]
+
+    # inverse undo
+    q = 1 << (bits - 1)
+    while q > 1:
+        p = np.uint64(q - 1)
+        for i in range(ndim):
+            invert = (x[:, i] & np.uint64(q)) != 0
+            x[invert, 0] ^= p
+
+            t = (x[:, 0] ^ x[:, i]) & p
+            t[invert] = 0
+            x[:, 0] ^= t
+            x[:, i] ^= t
+        q >>= 1
+
+    # gray encode
+    for i in range(1, ndim):
+        x[:, i] ^= x[:, i - 1]
+
+    t = np.zeros(x.shape[0], dtype=np.uint64)
+    q = 1 << (bits - 1)
+    while q > 1:
+        t[(x[:, -1] & np.uint64(q)) != 0] ^= np.uint64(q - 1)
+        q >>= 1
+
+    x ^= t.reshape(-1, 1)
+    return x
+
+
+def _space_filling_curve_keys(
+        x: onp.Array2D[np.floating[Any]],
+        bbox: tuple[onp.Array1D[np.floating[Any]], onp.Array1D[np.floating[Any]]],
+        curve: str) -> onp.Array1D[np.uint64]:
+    ndim = x.shape[1]
+    bits = 63 // ndim
+
+    lo, hi = bbox
+    extent = np.where(hi > lo, hi - lo, 1.0)
+    coords = np.clip((x - lo) / extent, 0.0, 1.0) * (2**bits - 1)
+    coords = coords.astype(np.uint64)
+
+    if curve == "morton":
+        return _interleave_bits(coords, bits)
+    elif curve == "hilbert":
+        return _interleave_bits(_hilbert_transpose(coords, bits), bits)
+    else:
+        raise ValueError(f"unknown space-filling curve: '{curve}'")
+
+
+def reorder_spatially(
+        grid: UnstructuredGrid,
+        curve: str = "hilbert", *,
+        reorder_points: bool = True,
+        reorder_cells: bool = True) -> UnstructuredGrid:
+    """Sort the points and cells of *grid* along a space-filling curve.
+
+    Neighboring points and cells end up close to each other in the output
+    arrays, which generally improves the compression ratio of the written
+    data and the cache locality when rendering. The cells are ordered by the
+    key of their centroid, where cells without any nodes use the lower
+    corner of the bounding box.
+
+    :arg curve: one of ``"morton"`` or ``"hilbert"``.
+    :arg reorder_points: if *True*, the points and point data are permuted.
+    :arg reorder_cells: if *True*, the cells and cell data are permuted.
+
+    :returns: a new grid with the same topology as *grid*.
+    """
+    points = grid.points.to_numpy()
+    connectivity = grid.cell_connectivity.to_numpy()
+    offsets = grid.cell_offsets.to_numpy()
+
+    if points.size:
+        bbox = (points.min(axis=0), points.max(axis=0))
+    else:
+        bbox = (np.zeros(points.shape[1]), np.ones(points.shape[1]))
+
+    # {{{ points
+
+    if reorder_points:
+        point_perm = np.argsort(
+            _space_filling_curve_keys(points, bbox, curve), kind="stable")
+
+        point_inv_perm = np.empty_like(point_perm)
+        point_inv_perm[point_perm] = np.arange(point_perm.size)
+
+        points = points[point_perm]
+        connectivity = (
+            point_inv_perm[connectivity].astype(connectivity.dtype, copy=False))
+
+    # }}}
+
+    # {{{ cells
+
+    cell_types = grid.cell_types
+    if reorder_cells and grid.cell_count > 0:
+        _, counts = _cell_starts_and_counts(offsets)
+        entry_to_cell = np.repeat(np.arange(grid.cell_count), counts)
+
+        # NOTE: cells without nodes are placed at the corner of the bounding box
+        cell_points = points[connectivity]
+        centroids = np.stack([
+            np.bincount(entry_to_cell, weights=cell_points[:, i],
+                        minlength=grid.cell_count)
+            for i in range(points.shape[1])], axis=1)
+        centroids = np.where(
+            counts.reshape(-1, 1) > 0,
+            centroids / np.maximum(counts, 1).reshape(-1, 1),
+            bbox[0])
+
+        cell_perm = np.argsort(
+            _space_filling_curve_keys(centroids, bbox, curve), kind="stable")
+        # NOTE: a permutation keeps the same offsets range, so no version bump
+        connectivity, offsets, _ = _gather_cells(connectivity, offsets, cell_perm)
+        cell_types = DataArray("types", cell_types.to_numpy()[cell_perm])
+    else:
+        cell_perm = None
+
+    # }}}
+
+    result = _make_unstructured_grid(
+        grid,
+        points if reorder_points else grid.points,
+        (grid.cell_count,
+         DataArray("connectivity", connectivity),
+         DataArray("offsets", offsets)),
+        cell_types)
+
+    for data_array in grid.pointdata:
+        if reorder_points:
+            data_array = _make_data_array(
+                data_array.name, data_array.to_numpy()[point_perm])
+        result.add_pointdata(data_array)
+
+    for data_array in grid.celldata:
+        if cell_perm is not None:
+            data_array = _make_data_array(
+                data_array.name, data_array.to_numpy()[cell_perm])
+        result.add_celldata(data_array)
+
+    return result
+
+# }}}
+
+
+# {{{ make_lagrange_grid
+
+def _lagrange_permutation(
+        cell_type: int, order: int,
+        vtk_version: tuple[int, int]) -> onp.Array1D[np.intp]:
+    from pyvisfile.vtk import vtk_ordering as vo
+
+    if cell_type == VTK_LAGRANGE_CURVE:
+        return vo.vtk_lagrange_simplex_permutation(1, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_TRIANGLE:
+        return vo.vtk_lagrange_simplex_permutation(2, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_TETRAHEDRON:
+        return vo.vtk_lagrange_simplex_permutation(3, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_QUADRILATERAL:
+        return vo.vtk_lagrange_quad_permutation(2, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_HEXAHEDRON:
+        return vo.vtk_lagrange_quad_permutation(3, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_WEDGE:
+        return vo.vtk_lagrange_wedge_permutation(order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_PYRAMID:
+        raise ValueError(
+            "VTK_LAGRANGE_PYRAMID cells are not supported: "
+            "VTK does not implement Lagrange pyramids")
+    else:
+        raise ValueError(f"unsupported Lagrange cell type: {cell_type}")
+
+
+def _nodal_to_data_array(
+        name: str,
+        ary: onp.ArrayND[Any],
+        perm: onp.Array1D[np.intp]) -> DataArray:
+    if ary.dtype.char == "O":
+        ary = np.stack(list(ary))
+
+    ary = ary[..., perm]
+    if ary.ndim == 2:
+        return DataArray(name, ary.reshape(-1))
+    elif ary.ndim == 3:
+        return DataArray(name,
+                         ary.reshape(ary.shape[0], -1),
+                         vector_format=VF_LIST_OF_COMPONENTS)
+    else:
+        raise ValueError(
+            f"nodal array '{name}' has unsupported shape: {ary.shape}")
+
+
+def make_lagrange_grid(
+        nodes: onp.ArrayND[np.floating[Any]],
+        cell_type: int,
+        order: int, *,
+        point_data: Sequence[tuple[str, onp.ArrayND[Any]]] | None = None,
+        cell_data: Sequence[tuple[str, onp.ArrayND[Any]]] | None = None,
+        vtk_version: tuple[int, int] = (2, 1),
+        narrow_index_types: bool = False) -> UnstructuredGrid:
+    """Construct a grid of high-order Lagrange cells from nodal element data.
+
+    All the nodal arrays are expected to be given in the :mod:`modepy` node
+    ordering, as described in :mod:`pyvisfile.vtk.vtk_ordering`, and are
+    permuted to the VTK ordering with a single indexing operation. Each element
+    gets its own copy of the nodes, so :func:`weld_points` can be used to
+    remove the duplicates afterwards, if desired.
+
+    :arg nodes: an array of shape ``(ambient_dim, nelements, nnodes)``.
+    :arg cell_type: one of the ``VTK_LAGRANGE_*`` cell types, e.g.
+        :data:`~pyvisfile.vtk.VTK_LAGRANGE_TRIANGLE`.
+    :arg order: polynomial order of the elements.
+    :arg point_data: a list of ``(name, array)`` tuples, where the arrays have
+        shape ``(nelements, nnodes)`` for scalars or
+        ``(ncomponents, nelements, nnodes)`` (or an object array of
+        components) for vectors.
+    :arg cell_data: a list of ``(name, array)`` tuples, where the arrays have
+        shape ``(nelements,)`` or ``(ncomponents, nelements)``.
+    :arg vtk_version: VTK XML file format version used to determine the node
+        ordering, as in
+        :func:`~pyvisfile.vtk.vtk_ordering.vtk_lagrange_quad_node_tuples`.
+        The resulting grid requires at least this file format version.
+    """
+    if point_data is None:
+        point_data = []
+
+    if cell_data is None:
+        cell_data = []
+
+    if nodes.ndim != 3:
+        raise ValueError(
+            "'nodes' should have shape (ambient_dim, nelements, nnodes): "
+            f"got {nodes.shape}")
+
+    perm = _lagrange_permutation(cell_type, order, vtk_version)
+    _, nelements, nnodes = nodes.shape
+    if nnodes != perm.size:
+        raise ValueError(
+            f"expected {perm.size} nodes per element for order {order}: "
+            f"got {nnodes}")
+
+    npoints = nelements * nnodes
+    connectivity = np.arange(npoints, dtype=np.int64)
+    offsets = np.arange(1, nelements + 1, dtype=np.int64) * nnodes
+
+    # NOTE: this uses the same cutoff as the narrowing, so that the file
+    # version is raised whenever 64-bit indices are required
+    _, index_version = _narrow_index_array(offsets[-1:])
+    if index_version == "0.1":
+        connectivity = connectivity.astype(np.uint32)
+        offsets = offsets.astype(np.uint32)
+
+    cell_types = np.full(nelements, cell_type, dtype=np.uint8)
+
+    grid = UnstructuredGrid(
+        (npoints, _nodal_to_data_array("points", nodes, perm)),
+        (nelements,
+         DataArray("connectivity", connectivity),
+         DataArray("offsets", offsets)),
+        DataArray("types", cell_types),
+        narrow_index_types=narrow_index_types)
+
+    version = ".".join(str(v) for v in vtk_version)
+    grid.min_vtk_file_version = max(
+        grid.min_vtk_file_version, version, index_version,
+        key=_parse_vtk_file_version)
+
+    for name, field in point_data:
+        grid.add_pointdata(_nodal_to_data_array(name, field, perm))
+
+    for name, field in cell_data:
+        if field.dtype.char == "O":
+            field = np.stack(list(field))
+
+        grid.add_celldata(DataArray(name, field))
+
+    return grid
+
+# }}}
+
+
+# {{{ make_linear_subcell_grid
+
+def _lagrange_node_tuples(
+        cell_type: int, order: int,
+        vtk_version: tuple[int, int]) -> Sequence[tuple[int, ...]]:
+    from pyvisfile.vtk import vtk_ordering as vo
+
+    if cell_type == VTK_LAGRANGE_CURVE:
+        return vo.vtk_lagrange_simplex_node_tuples(1, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_TRIANGLE:
+        return vo.vtk_lagrange_simplex_node_tuples(2, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_TETRAHEDRON:
+        return vo.vtk_lagrange_simplex_node_tuples(3, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_QUADRILATERAL:
+        return vo.vtk_lagrange_quad_node_tuples(2, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_HEXAHEDRON:
+        return vo.vtk_lagrange_quad_node_tuples(3, order, vtk_version)
+    elif cell_type == VTK_LAGRANGE_WEDGE:
+        return vo.vtk_lagrange_wedge_node_tuples(order, vtk_version)
+    else:
+        raise ValueError(f"unsupported Lagrange cell type: {cell_type}")
+
+
+def _triangle_subcells(
+        node_tuples: Sequence[tuple[int, ...]]) -> list[tuple[tuple[int, ...], ...]]:
+    node_set = set(node_tuples)
+
+    result = []
+    for i, j in node_tuples:
+        #   c
+        #   |\
+        #   a-b
+        if (i + 1, j) in node_set and (i, j + 1) in node_set:
+            result.append(((i, j), (i + 1, j), (i, j + 1)))
+
+            #   c-d
+            #    \|
+            #     b
+            if (i + 1, j + 1) in node_set:
+                result.append(((i + 1, j), (i + 1, j + 1), (i, j + 1)))
+
+    return result
+
+
+def _tetrahedron_subcells(
+        node_tuples: Sequence[tuple[int, ...]]) -> list[tuple[tuple[int, ...], ...]]:
+    # NOTE: this follows `modepy.tools.submesh_for_shape`, which splits each
+    # cube of the lattice into six tetrahedra and keeps the ones that are fully
+    # contained in the reference simplex
+    cube_tets = [
+        ((0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)),
+        ((1, 0, 1), (1, 0, 0), (0, 0, 1), (0, 1, 0)),
+        ((1, 0, 1), (0, 1, 1), (0, 1, 0), (0, 0, 1)),
+        ((1, 0, 0), (0, 1, 0), (1, 0, 1), (1, 1, 0)),
+        ((0, 1, 1), (0, 1, 0), (1, 1, 0), (1, 0, 1)),
+        ((0, 1, 1), (1, 1, 1), (1, 0, 1), (1, 1, 0)),
+        ]
+    node_set = set(node_tuples)
+
+    result = []
+    for i, j, k in node_tuples:
+        for tet in cube_tets:
+            vertices = tuple((i + di, j + dj, k + dk) for di, dj, dk in tet)
+            if all(v in node_set for v in vertices):
+                result.append(vertices)
+
+    return result
+
+
+@cache
+def _linear_subcell_pattern(
+        cell_type: int, order: int,
+        vtk_version: tuple[int, int]) -> tuple[int, onp.Array2D[np.intp]]:
+    """
+    :returns: a tuple ``(subcell_type, pattern)``, where *pattern* is an array
+        of shape ``(nsubcells, nvertices)`` of indices into the nodes of the
+        high-order cell.
+    """
+    node_tuples = _lagrange_node_tuples(cell_type, order, vtk_version)
+    node_to_index = {node_tuple: i for i, node_tuple in enumerate(node_tuples)}
+    subcells: list[tuple[tuple[int, ...], ...]]
+
+    if cell_type == VTK_LAGRANGE_CURVE:
+        subcell_type = VTK_LINE
+        subcells = [((i,), (i + 1,)) for i in range(order)]
+    elif cell_type == VTK_LAGRANGE_TRIANGLE:
+        subcell_type = VTK_TRIANGLE
+        subcells = _triangle_subcells(node_tuples)
+    elif cell_type == VTK_LAGRANGE_TETRAHEDRON:
+        subcell_type = VTK_TETRA
+        subcells = _tetrahedron_subcells(node_tuples)
+    elif cell_type == VTK_LAGRANGE_QUADRILATERAL:
+        subcell_type = VTK_QUAD
+        subcells = [
+            ((i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1))
+            for j in range(order) for i in range(order)]
+    elif cell_type == VTK_LAGRANGE_HEXAHEDRON:
+        subcell_type = VTK_HEXAHEDRON
+        subcells = [
+            ((i, j, k), (i + 1, j, k), (i + 1, j + 1, k), (i, j + 1, k),
+             (i, j, k + 1), (i + 1, j, k + 1), (i + 1, j + 1, k + 1), (i, j + 1, k + 1))
+            for k in range(order) for j in range(order) for i in range(order)]
+    elif cell_type == VTK_LAGRANGE_WEDGE:
+        from pyvisfile.vtk.vtk_ordering import vtk_lagrange_triangle_node_tuples
+
+        subcell_type = VTK_WEDGE
+        triangles = _triangle_subcells(vtk_lagrange_triangle_node_tuples(order))
+        subcells = [
+            (*((*v, k) for v in tri), *((*v, k + 1) for v in tri))
+            for k in range(order) for tri in triangles]
+    else:
+        raise ValueError(f"unsupported Lagrange cell type: {cell_type}")
+
+    pattern = np.array([
+        [node_to_index[v] for v in subcell] for subcell in subcells
+        ], dtype=np.intp)
+    pattern.flags.writeable = False
+
+    return subcell_type, pattern
+
+
+def make_linear_subcell_grid(
+        grid: UnstructuredGrid,
+        order: int, *,
+        vtk_version: tuple[int, int] = (2, 1)) -> UnstructuredGrid:
+    """Subdivide the high-order Lagrange cells of *grid* into linear cells.
+
+    This is meant as a fallback for readers that do not support the
+    ``VTK_LAGRANGE_*`` cell types. A reference subdivision pattern is
+    constructed once for the cell type and *order*, based on the node tuples
+    from :mod:`pyvisfile.vtk.vtk_ordering`, and then applied to all the cells
+    at once. Triangles and tetrahedra are subdivided into
+    :data:`~pyvisfile.vtk.VTK_TRIANGLE` and :data:`~pyvisfile.vtk.VTK_TETRA`,
+    quadrilaterals and hexahedra into :data:`~pyvisfile.vtk.VTK_QUAD` and
+    :data:`~pyvisfile.vtk.VTK_HEXAHEDRON`, and wedges into
+    :data:`~pyvisfile.vtk.VTK_WEDGE` cells.
+
+    :arg grid: a grid containing high-order cells of a single type and
+        *order*, e.g. as constructed by :func:`make_lagrange_grid`.
+    :arg vtk_version: VTK XML file format version used to determine the node
+        ordering of the high-order cells.
+
+    :returns: a new grid that shares the points and point data with *grid*.
+        The cell data is repeated for each of the subcells.
+    """
+    cell_types = grid.cell_types.to_numpy()
+    if cell_types.size == 0:
+        return grid.copy()
+
+    cell_type = int(cell_types[0])
+    if not np.all(cell_types == cell_type):
+        raise ValueError("grid must contain cells of a single type")
+
+    subcell_type, pattern = _linear_subcell_pattern(cell_type, order, vtk_version)
+    nsubcells, nvertices = pattern.shape
+
+    nnodes = len(_lagrange_node_tuples(cell_type, order, vtk_version))
+    offsets = grid.cell_offsets.to_numpy()
+    if not np.array_equal(offsets, nnodes * np.arange(1, grid.cell_count + 1)):
+        raise ValueError(f"cells do not have {nnodes} nodes (order {order})")
+
+    connectivity = grid.cell_connectivity.to_numpy()
+    connectivity = connectivity.reshape(grid.cell_count, nnodes)[:, pattern]
+
+    cell_count = grid.cell_count * nsubcells
+    offsets, version = _index_array_like(
+        nvertices * np.arange(1, cell_count + 1, dtype=np.int64),
+        offsets.dtype)
+
+    result = _make_unstructured_grid(
+        grid,
+        grid.points,
+        (cell_count,
+         DataArray("connectivity", connectivity.reshape(-1)),
+         DataArray("offsets", offsets)),
+        DataArray("types", np.full(cell_count, subcell_type, dtype=np.uint8)))
+    result.min_vtk_file_version = max(
+        result.min_vtk_file_version, version, key=_parse_vtk_file_version)
+
+    for data_array in grid.pointdata:
+        result.add_pointdata(data_array)
+
+    for data_array in grid.celldata:
+        result.add_celldata(_make_data_array(
+            data_array.name,
+            np.repeat(data_array.to_numpy(), nsubcells, axis=0)))
+
+    return result
+
+# }}}
+
+
+# {{{ merge_unstructured_grids
+
+def _concatenate_data(
+        data_arrays: Sequence[Sequence[DataArray]]) -> list[DataArray]:
+    names = [[data_array.name for data_array in arrays] for arrays in data_arrays]
+    if any(n != names[0] for n in names[1:]):
+        raise ValueError("grids must have the same point and cell data arrays")
+
+    return [
+        _make_data_array(name, np.concatenate([
+            arrays[i].to_numpy() for arrays in data_arrays]))
+        for i, name in enumerate(names[0])]
+
+
+def merge_unstructured_grids(grids: Sequence[UnstructuredGrid]) -> UnstructuredGrid:
+    """Concatenate the points, cells and data of all the *grids*.
+
+    The connectivity of each grid is shifted by the number of points in the
+    preceding grids and the offsets by the size of the preceding connectivity
+    arrays, without looping over the cells. Points shared between grids are
+    not merged (see :func:`weld_points`).
+
+    :arg grids: a non-empty sequence of grids with the same point and cell
+        data arrays, e.g. the pieces of a parallel ``.pvtu`` file.
+    """
+    if not grids:
+        raise ValueError("no grids to merge")
+
+    point_counts = np.array([len(grid.points.to_numpy()) for grid in grids])
+    connectivities = [grid.cell_connectivity.to_numpy() for grid in grids]
+    offsets = [grid.cell_offsets.to_numpy() for grid in grids]
+
+    conn_sizes = np.array([len(conn) for conn in connectivities])
+    cell_counts = np.array([len(offs) for offs in offsets])
+
+    versions = [grid.min_vtk_file_version for grid in grids]
+
+    def shift(
+            arys: Sequence[onp.Array1D[np.integer[Any]]],
+            sizes: onp.Array1D[np.int64],
+            counts: onp.Array1D[np.int64]) -> onp.Array1D[np.integer[Any]]:
+        result = (
+            np.concatenate(arys).astype(np.int64)
+            + np.repeat(np.cumsum(sizes) - sizes, counts))
+
+        dtype = np.result_type(*arys)
+        if result.size and result.max() > np.iinfo(dtype).max:
+            result, version = _narrow_index_array(result)
+            versions.append(version)
+            return result
+
+        return result.astype(dtype)
+
+    connectivity = shift(connectivities, point_counts, conn_sizes)
+    cell_offsets = shift(offsets, conn_sizes, cell_counts)
+
+    result = _make_unstructured_grid(
+        grids[0],
+        np.concatenate([grid.points.to_numpy() for grid in grids]),
+        (int(np.sum(cell_counts)),
+         DataArray("connectivity", connectivity),
+         DataArray("offsets", cell_offsets)),
+        DataArray("types", np.concatenate([
+            grid.cell_types.to_numpy() for grid in grids])))
+    result.min_vtk_file_version = max(versions, key=_parse_vtk_file_version)
+
+    for data_array in _concatenate_data([grid.pointdata for grid in grids]):
+        result.add_pointdata(data_array)
+
+    for data_array in _concatenate_data([grid.celldata for grid in grids]):
+        result.add_celldata(data_array)
+
+    return result
+
+# }}}
+
+
+# {{{ extract_cells
+
+def extract_cells(
+        grid: UnstructuredGrid,
+        cells: onp.Array1D[np.bool_] | onp.Array1D[np.integer[Any]],
+        ) -> UnstructuredGrid:
+    """Extract a subset of the cells of *grid*, e.g. a region of interest or
+    the cells where some field exceeds a threshold.
+
+    The connectivity of the selected cells is gathered and the points they
+    reference are renumbered consecutively (in increasing order of their
+    index in *grid*) with :func:`numpy.unique`. Points that are not
+    referenced by any selected cell are removed.
+
+    :arg cells: a boolean mask of shape ``(ncells,)`` or an array of cell
+        indices. Cells are extracted in the order of the indices.
+    :returns: a new grid with the selected cells and the corresponding
+        point and cell data.
+    """
+    cells = np.asarray(cells)
+    if cells.dtype == np.bool_:
+        if cells.shape != (grid.cell_count,):
+            raise ValueError(
+                f"cell mask must have shape ({grid.cell_count},): {cells.shape}")
+
+        cell_indices = np.flatnonzero(cells)
+    elif cells.dtype.kind in "iu" and cells.ndim == 1:
+        if cells.size and (
+                cells.min() < -grid.cell_count or cells.max() >= grid.cell_count):
+            raise IndexError("cell indices out of bounds")
+
+        cell_indices = cells % max(grid.cell_count, 1)
+    else:
+        raise TypeError(
+            f"expected a boolean mask or an integer index array: '{cells.dtype}'")
+
+    result, _ = _extract_cells(grid, cell_indices)
+    return result
+
+# }}}
+
+
+# {{{ make_ghosted_pieces
+
+# NOTE: values of vtkDataSetAttributes::DUPLICATEPOINT and DUPLICATECELL
+_VTK_DUPLICATE_POINT = 1
+_VTK_DUPLICATE_CELL = 1
+
+
+def make_ghosted_pieces(
+        grid: UnstructuredGrid,
+        partition: onp.Array1D[np.integer[Any]], *,
+        npieces: int | None = None) -> list[UnstructuredGrid]:
+    """Split *grid* into pieces with one layer of ghost cells each.
+
+    The ghost cells of a piece are all the cells owned by other pieces that
+    share at least one point with a cell owned by the piece. Each point is
+    owned by the lowest numbered piece that owns one of its cells. In addition
+    to the sliced point and cell data, each piece has the following arrays:
+
+    * ``vtkGhostType`` point and cell data, marking the points and cells
+      owned by other pieces as duplicates. This requires VTK XML file format
+      version ``"2.0"``, so :attr:`~pyvisfile.vtk.UnstructuredGrid.min_vtk_file_version`
+      is raised accordingly.
+    * ``GlobalNodeIds`` point data and ``GlobalCellIds`` cell data, containing
+      the indices of the points and cells in *grid*.
+
+    The pieces can be written to separate files and referenced from a
+    :class:`~pyvisfile.vtk.ParallelXMLGenerator` with *ghost_level* set
+    to 1. The owned cells come first in each piece, followed by the ghost
+    cells.
+
+    :arg partition: an array with the index of the piece that owns each cell.
+    :arg npieces: number of pieces. If *None*, it is taken to be one more than
+        the largest piece index in *partition*.
+    """
+    partition = np.asarray(partition)
+    if partition.shape != (grid.cell_count,):
+        raise ValueError(
+            f"'partition' must have shape ({grid.cell_count},): {partition.shape}")
+
+    if npieces is None:
+        npieces = int(partition.max()) + 1 if partition.size else 0
+
+    if partition.size and (partition.min() < 0 or partition.max() >= npieces):
+        raise ValueError(f"'partition' entries must be in [0, {npieces})")
+
+    decoded = _decode_grid(grid)
+    connectivity = decoded.connectivity.astype(np.int64)
+    _, counts = _cell_starts_and_counts(decoded.offsets)
+    entry_to_cell = np.repeat(np.arange(grid.cell_count), counts)
+    entry_piece = partition[entry_to_cell].astype(np.int64)
+
+    # {{{ group point incidences by piece
+
+    # NOTE: sorted unique (point, piece) pairs, i.e. the pieces touching each
+    # point are contiguous and in increasing order
+    point_count = len(decoded.points)
+    stride = max(npieces, 1)
+    point_piece = np.unique(connectivity * stride + entry_piece)
+    point_piece_point = point_piece // stride
+    point_piece_piece = point_piece % stride
+
+    point_npieces = np.bincount(point_piece_point, minlength=point_count)
+    point_start = np.cumsum(point_npieces) - point_npieces
+
+    point_owner = np.full(point_count, npieces, dtype=np.int64)
+    point_owner[point_npieces > 0] = point_piece_piece[point_start[point_npieces > 0]]
+
+    # }}}
+
+    # {{{ group ghost cells by piece
+
+    # NOTE: a cell is a ghost of every other piece that touches its points
+    nrepeats = point_npieces[connectivity]
+    entry_index = np.repeat(np.arange(connectivity.size), nrepeats)
+    within = np.arange(entry_index.size) - np.repeat(
+        np.cumsum(nrepeats) - nrepeats, nrepeats)
+
+    ghost_piece = point_piece_piece[point_start[connectivity[entry_index]] + within]
+    ghost_cell = entry_to_cell[entry_index]
+    is_ghost = ghost_piece != entry_piece[entry_index]
+
+    ghosts = np.unique(
+        ghost_piece[is_ghost] * grid.cell_count + ghost_cell[is_ghost])
+    ghost_bounds = np.searchsorted(
+        ghosts, np.arange(npieces + 1) * grid.cell_count)
+    ghost_cells = ghosts % max(grid.cell_count, 1)
+
+    # }}}
+
+    owned_order = np.argsort(partition, kind="stable")
+    owned_bounds = np.concatenate([
+        [0], np.cumsum(np.bincount(partition, minlength=npieces))])
+
+    result = []
+    for ipiece in range(npieces):
+        owned_cells = owned_order[owned_bounds[ipiece]:owned_bounds[ipiece + 1]]
+        cell_indices = np.concatenate([
+            owned_cells,
+            ghost_cells[ghost_bounds[ipiece]:ghost_bounds[ipiece + 1]]])
+
+        piece, point_indices = _extract_cells(grid, cell_indices, decoded=decoded)
+        piece.min_vtk_file_version = max(
+            piece.min_vtk_file_version, "2.0", key=_parse_vtk_file_version)
+
+        point_ghost_type = np.where(
+            point_owner[point_indices] == ipiece, 0, _VTK_DUPLICATE_POINT)
+        cell_ghost_type = np.zeros(len(cell_indices), dtype=np.uint8)
+        cell_ghost_type[len(owned_cells):] = _VTK_DUPLICATE_CELL
+
+        piece.add_pointdata(DataArray(
+            "vtkGhostType", point_ghost_type.astype(np.uint8)))
+        piece.add_pointdata(DataArray(
+            "GlobalNodeIds", point_indices.astype(np.int64)))
+        piece.add_celldata(DataArray("vtkGhostType", cell_ghost_type))
+        piece.add_celldata(DataArray(
+            "GlobalCellIds", cell_indices.astype(np.int64)))
+
+        result.append(piece)
+
+    return result
+
+# }}}
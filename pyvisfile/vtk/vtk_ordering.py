@@ -23,13 +23,19 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
-from typing import TYPE_CHECKING, overload
+import inspect
+from functools import cache, wraps
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, overload
+
+import numpy as np
 
 from pytools import generate_nonnegative_integer_tuples_summing_to_at_most as gnitstam
 
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
+
+    import optype.numpy as onp
 
 
 __doc__ = """
@@ -53,11 +59,30 @@ order, with the last coordinate moving slowest.
 To a large extent, the VTK ordering matches the ordering used by ``gmsh`` and
 described `here <https://gmsh.info/doc/texinfo/gmsh.html#Node-ordering>`__.
 
+All the functions below are memoized, so repeated calls with the same
+arguments are cheap. The node tuple and permutation functions return a new
+:class:`list` on each call, while the returned arrays are shared and
+read-only.
+
 .. autofunction:: vtk_lagrange_simplex_node_tuples
 .. autofunction:: vtk_lagrange_simplex_node_tuples_to_permutation
+.. autofunction:: vtk_lagrange_simplex_node_array
+.. autofunction:: vtk_lagrange_simplex_permutation
 
 .. autofunction:: vtk_lagrange_quad_node_tuples
 .. autofunction:: vtk_lagrange_quad_node_tuples_to_permutation
+.. autofunction:: vtk_lagrange_quad_node_array
+.. autofunction:: vtk_lagrange_quad_permutation
+
+For wedges (prisms), the triangular faces and the interior use a simple
+row-major ordering of the triangle nodes instead of the recursive one.
+There is no ordering for :data:`~pyvisfile.vtk.VTK_LAGRANGE_PYRAMID`,
+since VTK does not implement Lagrange pyramid cells.
+
+.. autofunction:: vtk_lagrange_wedge_node_tuples
+.. autofunction:: vtk_lagrange_wedge_node_tuples_to_permutation
+.. autofunction:: vtk_lagrange_wedge_node_array
+.. autofunction:: vtk_lagrange_wedge_permutation
 """
 
 
@@ -79,6 +104,46 @@ def add_tuple_to_list(ary: Sequence[tuple[int, ...]],
                       x: tuple[int, ...]) -> Sequence[tuple[int, ...]]:
     return [tuple([xv + yv for xv, yv in zip(x, y, strict=True)]) for y in ary]  # noqa: C409
 
+
+def _make_readonly_array(
+        ary: Sequence[int] | Sequence[tuple[int, ...]]) -> onp.ArrayND[np.intp]:
+    result = np.array(ary, dtype=np.intp)
+    result.flags.writeable = False
+
+    return result
+
+
+def _node_tuples_to_permutation(
+        node_tuples: Sequence[tuple[int, ...]],
+        node_to_index: dict[tuple[int, ...], int]) -> tuple[int, ...]:
+    assert len(node_tuples) == len(node_to_index)
+    return tuple(node_to_index[v] for v in node_tuples)
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _cache_by_vtk_version(func: Callable[P, R]) -> Callable[P, R]:
+    """Like :func:`functools.cache`, but converts the *vtk_version* argument
+    of *func* to a :class:`tuple` first, so that it can also be given as a
+    (non-hashable) :class:`list`.
+    """
+    cached_func: Callable[..., R] = cache(func)
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        arguments: dict[str, Any] = bound.arguments
+        arguments["vtk_version"] = tuple(arguments["vtk_version"])
+
+        return cached_func(**arguments)
+
+    return wrapper
+
 # }}}
 
 
@@ -219,16 +284,44 @@ def vtk_lagrange_simplex_node_tuples(
     :return: a :class:`list` of ``dims``-dimensional tuples of integers
         up to ``order`` in the ordering expected by VTK.
     """
+    return list(_vtk_lagrange_simplex_node_tuples(
+        dims, order, vtk_version=vtk_version))
+
+
+@_cache_by_vtk_version
+def _vtk_lagrange_simplex_node_tuples(
+        dims: int, order: int,
+        vtk_version: tuple[int, int] = (2, 1)
+        ) -> tuple[tuple[int, ...], ...]:
     if dims == 1:
-        return vtk_lagrange_curve_node_tuples(order)
+        return tuple(vtk_lagrange_curve_node_tuples(order))
     elif dims == 2:
-        return vtk_lagrange_triangle_node_tuples(order)
+        return tuple(vtk_lagrange_triangle_node_tuples(order))
     elif dims == 3:
-        return vtk_lagrange_tetrahedron_node_tuples(order)
+        return tuple(vtk_lagrange_tetrahedron_node_tuples(order))
     else:
         raise ValueError(f"unsupported dimension: {dims}")
 
 
+@cache
+def _modepy_simplex_node_to_index(
+        dims: int, order: int) -> dict[tuple[int, ...], int]:
+    return {
+            node_tuple: i
+            for i, node_tuple in enumerate(gnitstam(order, dims))
+            }
+
+
+@cache
+def _vtk_lagrange_simplex_node_tuples_to_permutation(
+        node_tuples: tuple[tuple[int, ...], ...]) -> tuple[int, ...]:
+    order = max(max(i) for i in node_tuples)
+    dims = len(node_tuples[0])
+
+    return _node_tuples_to_permutation(
+        node_tuples, _modepy_simplex_node_to_index(dims, order))
+
+
 def vtk_lagrange_simplex_node_tuples_to_permutation(
         node_tuples: Sequence[tuple[int, ...]]
         ) -> Sequence[int]:
@@ -237,16 +330,37 @@ def vtk_lagrange_simplex_node_tuples_to_permutation(
 
     :returns: a :class:`list` of indices in ``[0, len(node_tuples)]``.
     """
-    order = max(max(i) for i in node_tuples)
-    dims = len(node_tuples[0])
+    return list(_vtk_lagrange_simplex_node_tuples_to_permutation(
+        tuple(node_tuples)))
 
-    node_to_index = {
-            node_tuple: i
-            for i, node_tuple in enumerate(gnitstam(order, dims))
-            }
 
-    assert len(node_tuples) == len(node_to_index)
-    return [node_to_index[v] for v in node_tuples]
+@_cache_by_vtk_version
+def vtk_lagrange_simplex_node_array(
+        dims: int, order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> onp.Array2D[np.intp]:
+    """
+    :returns: a read-only array of shape ``(nnodes, dims)`` containing the
+        node tuples from :func:`vtk_lagrange_simplex_node_tuples`.
+    """
+    return _make_readonly_array(
+        _vtk_lagrange_simplex_node_tuples(dims, order, vtk_version=vtk_version))
+
+
+@_cache_by_vtk_version
+def vtk_lagrange_simplex_permutation(
+        dims: int, order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> onp.Array1D[np.intp]:
+    """
+    :returns: a read-only array of shape ``(nnodes,)`` containing the
+        permutation from :func:`vtk_lagrange_simplex_node_tuples_to_permutation`.
+        It can be used directly to reorder nodal data, e.g. as
+        ``vtk_nodes = modepy_nodes[..., perm]``.
+    """
+    node_tuples = _vtk_lagrange_simplex_node_tuples(
+        dims, order, vtk_version=vtk_version)
+
+    return _make_readonly_array(
+        _vtk_lagrange_simplex_node_tuples_to_permutation(node_tuples))
 
 # }}}
 
@@ -418,16 +532,46 @@ def vtk_lagrange_quad_node_tuples(
     :return: a :class:`list` of ``dims``-dimensional tuples of integers
         up to ``order`` in the ordering expected by VTK.
     """
+    return list(_vtk_lagrange_quad_node_tuples(
+        dims, order, vtk_version=vtk_version))
+
+
+@_cache_by_vtk_version
+def _vtk_lagrange_quad_node_tuples(
+        dims: int, order: int,
+        vtk_version: tuple[int, int] = (2, 1),
+        ) -> tuple[tuple[int, ...], ...]:
     if dims == 1:
-        return vtk_lagrange_curve_node_tuples(order)
+        return tuple(vtk_lagrange_curve_node_tuples(order))
     elif dims == 2:
-        return vtk_lagrange_quadrilateral_node_tuples(order)
+        return tuple(vtk_lagrange_quadrilateral_node_tuples(order))
     elif dims == 3:
-        return vtk_lagrange_hexahedon_node_tuples(order, vtk_version=vtk_version)
+        return tuple(
+            vtk_lagrange_hexahedon_node_tuples(order, vtk_version=vtk_version))
     else:
         raise ValueError(f"unsupported dimension: {dims}")
 
 
+@cache
+def _modepy_quad_node_to_index(
+        dims: int, order: int) -> dict[tuple[int, ...], int]:
+    from itertools import product
+    return {
+            node_tuple: i
+            for i, node_tuple in enumerate(product(range(order + 1), repeat=dims))
+            }
+
+
+@cache
+def _vtk_lagrange_quad_node_tuples_to_permutation(
+        node_tuples: tuple[tuple[int, ...], ...]) -> tuple[int, ...]:
+    order = max(max(i) for i in node_tuples)
+    dims = len(node_tuples[0])
+
+    return _node_tuples_to_permutation(
+        node_tuples, _modepy_quad_node_to_index(dims, order))
+
+
 def vtk_lagrange_quad_node_tuples_to_permutation(
         node_tuples: Sequence[tuple[int, ...]]
         ) -> Sequence[int]:
@@ -436,16 +580,206 @@ def vtk_lagrange_quad_node_tuples_to_permutation(
 
     :returns: a :class:`list` of indices in ``[0, len(node_tuples)]``.
     """
-    order = max(max(i) for i in node_tuples)
-    dims = len(node_tuples[0])
+    return list(_vtk_lagrange_quad_node_tuples_to_permutation(
+        tuple(node_tuples)))
+
+
+@_cache_by_vtk_version
+def vtk_lagrange_quad_node_array(
+        dims: int, order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> onp.Array2D[np.intp]:
+    """
+    :returns: a read-only array of shape ``(nnodes, dims)`` containing the
+        node tuples from :func:`vtk_lagrange_quad_node_tuples`.
+    """
+    return _make_readonly_array(
+        _vtk_lagrange_quad_node_tuples(dims, order, vtk_version=vtk_version))
+
+
+@_cache_by_vtk_version
+def vtk_lagrange_quad_permutation(
+        dims: int, order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> onp.Array1D[np.intp]:
+    """
+    :returns: a read-only array of shape ``(nnodes,)`` containing the
+        permutation from :func:`vtk_lagrange_quad_node_tuples_to_permutation`.
+        It can be used directly to reorder nodal data, e.g. as
+        ``vtk_nodes = modepy_nodes[..., perm]``.
+    """
+    node_tuples = _vtk_lagrange_quad_node_tuples(
+        dims, order, vtk_version=vtk_version)
+
+    return _make_readonly_array(
+        _vtk_lagrange_quad_node_tuples_to_permutation(node_tuples))
+
+# }}}
+
+
+# {{{ VTK_LAGRANGE_WEDGE
+
+def _triangle_interior_node_tuples(order: int) -> Sequence[tuple[int, int]]:
+    # NOTE: row-major ordering of the nodes with 0 < i, j and i + j < order
+    return [(i, j) for j in range(1, order - 1) for i in range(1, order - j)]
+
+
+def vtk_lagrange_wedge_node_tuples(
+        order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> Sequence[tuple[int, int, int]]:
+    """
+    :arg order: order of the polynomial representation, which is the same in
+        the triangle and the vertical direction.
+    :arg vtk_version: a :class:`tuple` of two elements containing the version
+        of the VTK XML file format in use. The wedge ordering does not change
+        between versions, but the argument is kept for consistency.
+
+    :return: a :class:`list` of ``(i, j, k)`` node tuples, where ``(i, j)``
+        are indices in the triangle and ``k`` is the index in the vertical
+        direction.
+    """
+    return list(_vtk_lagrange_wedge_node_tuples(order, vtk_version=vtk_version))
+
 
+@_cache_by_vtk_version
+def _vtk_lagrange_wedge_node_tuples(
+        order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> tuple[tuple[int, int, int], ...]:
+    nodes: list[tuple[int, int, int]] = []
+
+    if order < 0:
+        return tuple(nodes)
+
+    if order == 0:
+        return ((0, 0, 0),)
+
+    #           z
+    #           ^
+    #           |
+    #           3
+    #         ,/|`\
+    #       ,/  |  `\
+    #     ,/    |    `\
+    #    4------+------5
+    #    |      |      |
+    #    |      0      |
+    #    |    ,/ `\    |
+    #    |  ,/     `\  |
+    #    |,/         `\|
+    #    1-------------2--> y
+    #  ,/
+    # x
+
+    # add vertices
+    nodes += [
+            # (0, 1, 2)
+            (0, 0, 0), (order, 0, 0), (0, order, 0),
+            # (3, 4, 5)
+            (0, 0, order), (order, 0, order), (0, order, order),
+            ]
+    if order == 1:
+        return tuple(nodes)
+
+    # add edges
+    edge_ids = range(1, order)
+    for k in (0, order):
+        nodes += (
+                # vertex 0 -> 1 (and 3 -> 4)
+                [(i, 0, k) for i in edge_ids]
+                # vertex 1 -> 2 (and 4 -> 5)
+                + [(order - i, i, k) for i in edge_ids]
+                # vertex 2 -> 0 (and 5 -> 3)
+                + [(0, order - i, k) for i in edge_ids]
+                )
+
+    nodes += (
+            # vertex 0 -> 3
+            [(0, 0, k) for k in edge_ids]
+            # vertex 1 -> 4
+            + [(order, 0, k) for k in edge_ids]
+            # vertex 2 -> 5
+            + [(0, order, k) for k in edge_ids]
+            )
+
+    # add triangular faces
+    face_ids = _triangle_interior_node_tuples(order)
+    nodes += (
+            # face between (0, 1, 2)
+            [(i, j, 0) for i, j in face_ids]
+            # face between (3, 4, 5)
+            + [(i, j, order) for i, j in face_ids]
+            )
+
+    # add quadrilateral faces
     from itertools import product
-    node_to_index = {
-            node_tuple: i
-            for i, node_tuple in enumerate(product(range(order + 1), repeat=dims))
+    nodes += (
+            # face between (0, 1, 4, 3)
+            [(i, 0, k) for k, i in product(edge_ids, repeat=2)]
+            # face between (1, 2, 5, 4)
+            + [(order - j, j, k) for k, j in product(edge_ids, repeat=2)]
+            # face between (0, 2, 5, 3), traversed from vertex 2 to vertex 0
+            + [(0, order - j, k) for k, j in product(edge_ids, repeat=2)]
+            )
+
+    # add interior
+    nodes += [(i, j, k) for k in edge_ids for i, j in face_ids]
+
+    return tuple(nodes)
+
+
+@cache
+def _modepy_wedge_node_to_index(order: int) -> dict[tuple[int, ...], int]:
+    from itertools import product
+    return {
+            (*tri_tuple, k): i
+            for i, (tri_tuple, k) in enumerate(
+                product(gnitstam(order, 2), range(order + 1)))
             }
 
-    assert len(node_tuples) == len(node_to_index)
-    return [node_to_index[v] for v in node_tuples]
+
+@cache
+def _vtk_lagrange_wedge_node_tuples_to_permutation(
+        node_tuples: tuple[tuple[int, ...], ...]) -> tuple[int, ...]:
+    order = max(max(i) for i in node_tuples)
+    return _node_tuples_to_permutation(
+        node_tuples, _modepy_wedge_node_to_index(order))
+
+
+def vtk_lagrange_wedge_node_tuples_to_permutation(
+        node_tuples: Sequence[tuple[int, ...]]
+        ) -> Sequence[int]:
+    """Construct a permutation from the wedge node ordering of VTK to the
+    tensor product ordering of :mod:`modepy`, i.e. the nodes of
+    ``TensorProductShape(Simplex(2), Simplex(1))`` given by::
+
+        product(gnitstam(order, 2), range(order + 1))
+
+    :returns: a :class:`list` of indices in ``[0, len(node_tuples)]``.
+    """
+    return list(_vtk_lagrange_wedge_node_tuples_to_permutation(
+        tuple(node_tuples)))
+
+
+@_cache_by_vtk_version
+def vtk_lagrange_wedge_node_array(
+        order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> onp.Array2D[np.intp]:
+    """
+    :returns: a read-only array of shape ``(nnodes, 3)`` containing the
+        node tuples from :func:`vtk_lagrange_wedge_node_tuples`.
+    """
+    return _make_readonly_array(
+        _vtk_lagrange_wedge_node_tuples(order, vtk_version=vtk_version))
+
+
+@_cache_by_vtk_version
+def vtk_lagrange_wedge_permutation(
+        order: int,
+        vtk_version: tuple[int, int] = (2, 1)) -> onp.Array1D[np.intp]:
+    """
+    :returns: a read-only array of shape ``(nnodes,)`` containing the
+        permutation from :func:`vtk_lagrange_wedge_node_tuples_to_permutation`.
+    """
+    node_tuples = _vtk_lagrange_wedge_node_tuples(order, vtk_version=vtk_version)
+    return _make_readonly_array(
+        _vtk_lagrange_wedge_node_tuples_to_permutation(node_tuples))
 
 # }}}
@@ -25,13 +25,18 @@ THE SOFTWARE.
 
 import enum
 import os
-from typing import Any, Protocol
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Protocol, TextIO
 from xml.etree.ElementTree import Element, ElementTree
 
 import numpy as np
 from typing_extensions import override
 
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+
 __doc__ = """
 Xdmf Tags
 ---------
@@ -145,8 +150,21 @@ Writing
 .. autoclass:: XdmfGrid
 .. autoclass:: XdmfUnstructuredGrid
     :show-inheritance:
+.. autoclass:: XdmfStructuredGrid
+    :show-inheritance:
+.. autoclass:: XdmfRegularGrid
+    :show-inheritance:
+.. autoclass:: XdmfRectilinearGrid
+    :show-inheritance:
+.. autoclass:: XdmfCurvilinearGrid
+    :show-inheritance:
+
+.. autofunction:: make_mixed_connectivity
+.. autofunction:: make_mixed_connectivity_from_blocks
+.. autofunction:: make_virtual_unstructured_grid
 
 .. autoclass:: XdmfWriter
+.. autoclass:: XdmfTemporalWriter
 """
 
 
@@ -361,6 +379,19 @@ class DataItemEndian(enum.Enum):
         else:
             return DataItemEndian.Native
 
+    @staticmethod
+    def from_dtype(dtype: np.dtype[Any]) -> DataItemEndian:
+        if dtype.byteorder == "<":
+            return DataItemEndian.Little
+        elif dtype.byteorder == ">":
+            return DataItemEndian.Big
+        else:
+            return DataItemEndian.from_system()
+
+
+# NOTE: the text descriptor of the base class, which bypasses DataItem.text
+_ELEMENT_TEXT: Any = Element.text
+
 
 class DataItem(XdmfElement):
     """A :class:`DataItem` describes the storage of actual values in an
@@ -371,6 +402,20 @@ class DataItem(XdmfElement):
 
         Analogous to :attr:`numpy.ndarray.shape`.
 
+    .. attribute:: ary
+
+        An array containing the values of the item or *None*. If set, the
+        values are only converted to text or written to a heavy data file
+        (see :class:`XdmfWriter`) when the file is written.
+
+    .. attribute:: inline
+
+        If *True* and the item has no text, accessing :attr:`text` formats
+        the values in :attr:`ary` into it (e.g. when the item is serialized
+        with :func:`xml.etree.ElementTree.tostring`). :class:`XdmfWriter`
+        does not use the text, but streams the values or writes them to a
+        heavy data file instead.
+
     .. automethod:: __init__
     .. automethod:: as_reference
     """
@@ -386,6 +431,7 @@ class DataItem(XdmfElement):
             function: str | None = None,
             endian: DataItemEndian | None = DataItemEndian.Native,
             dformat: DataItemFormat | None = DataItemFormat.XML,
+            seek: int | None = None,
             parent: Element | None = None,
             data: str | None = None,
             ) -> None:
@@ -393,11 +439,15 @@ class DataItem(XdmfElement):
         :param parent: if provided, *self* is appended to the element.
         :param reference: path to another :class:`DataItem`.
             Use :meth:`as_reference` to populate.
+        :param seek: offset (in bytes) of the data in a
+            :attr:`DataItemFormat.Binary` file.
         :param data: data contained inside the :class:`DataItem`. This is
             usually a path to a binary file.
         """
 
         self._dimensions: tuple[int, ...] | None = dimensions
+        self.ary: ArrayLike | None = None
+        self.inline: bool = False
 
         super().__init__(parent, "DataItem", {
             "Name": name,
@@ -409,10 +459,25 @@ class DataItem(XdmfElement):
             "Function": function,
             "Endian": endian.name if endian is not None else endian,
             "Format": dformat.name if dformat is not None else dformat,
+            "Seek": seek,
             })
 
         if data is not None:
-            self.text: str | None = data
+            self.text = data
+
+    @property
+    @override
+    def text(self) -> str | None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        text = _ELEMENT_TEXT.__get__(self)
+        if text is None and self.inline and self.ary is not None:
+            text = _ndarray_to_string(self.ary)
+            _ELEMENT_TEXT.__set__(self, text)
+
+        return text
+
+    @text.setter
+    def text(self, value: str | None) -> None:
+        _ELEMENT_TEXT.__set__(self, value)
 
     @property
     def dimensions(self) -> tuple[int, ...]:
@@ -673,7 +738,9 @@ class Topology(XdmfElement):
         """
 
         ttype_name = _XDMF_TOPOLOGY_TYPE_TO_NAME.get(ttype, ttype.name)
-        if ttype in _XDMF_ELEMENT_NODE_COUNT or ttype in _XDMF_STRUCTURED_GRIDS:
+        if (ttype == TopologyType.Mixed
+                or ttype in _XDMF_ELEMENT_NODE_COUNT
+                or ttype in _XDMF_STRUCTURED_GRIDS):
             if nodes_per_element is not None:
                 raise ValueError(f"cannot set 'nodes_per_element' for {ttype_name}")
         else:
@@ -893,28 +960,98 @@ class XInclude(XdmfElement):
 
 # {{{ data arrays
 
-def _ndarray_to_string(ary: object) -> str:
-    if not isinstance(ary, np.ndarray):
-        raise TypeError(f"expected an 'ndarray', got '{type(ary).__name__}'")
-
+def _ndarray_format(ary: ArrayLike) -> str:
     ntype = DataItemNumberType.from_dtype(ary.dtype)
     if ntype in (DataItemNumberType.Int, DataItemNumberType.UInt):
-        fmt = "%d"
+        return "%d"
     elif ntype == DataItemNumberType.Float:
         if ary.dtype.itemsize == 8:
-            fmt = "%.16e"
+            return "%.16e"
         elif ary.dtype.itemsize == 4:
-            fmt = "%.8e"
+            return "%.8e"
         else:
             raise ValueError(f"unsupported dtype item size: {ary.dtype.itemsize}")
     else:
         raise ValueError(f"unsupported dtype: '{ary.dtype}'")
 
-    import io
-    bio = io.BytesIO()
-    np.savetxt(bio, ary, fmt=fmt)
 
-    return "\n" + bio.getvalue().decode()
+class _InterleavedArray:
+    """A lazy array that stacks the given *components* along a new last axis.
+
+    The components are only interleaved in chunks when the array is written,
+    so that the full array is never held in memory.
+    """
+
+    def __init__(self,
+            components: tuple[np.ndarray[Any, np.dtype[Any]], ...]) -> None:
+        self.components = components
+        self.shape: tuple[int, ...] = (*components[0].shape, len(components))
+        self.dtype: np.dtype[Any] = np.result_type(*components)
+
+    def __array__(self,
+            dtype: np.dtype[Any] | None = None,
+            copy: bool | None = None) -> np.ndarray[Any, np.dtype[Any]]:
+        return np.stack(self.components, axis=-1, dtype=dtype)
+
+    def iter_chunks(self, nrows: int) -> Iterator[np.ndarray[Any, np.dtype[Any]]]:
+        for i in range(0, self.shape[0], nrows):
+            yield np.stack(
+                [c[i:i + nrows] for c in self.components],
+                axis=-1, dtype=self.dtype)
+
+
+def _iter_array_chunks(
+        ary: object, *,
+        chunk_size: int = 2**16) -> Iterator[np.ndarray[Any, np.dtype[Any]]]:
+    """Iterate over blocks of rows (i.e. along the first axis) of *ary* with
+    (at most) *chunk_size* entries.
+    """
+    if not isinstance(ary, (np.ndarray, _InterleavedArray)):
+        raise TypeError(f"expected an 'ndarray', got '{type(ary).__name__}'")
+
+    shape = ary.shape
+
+    if not shape:
+        yield np.asarray(ary)
+        return
+
+    ncols = int(np.prod(shape[1:]))
+    nrows = max(chunk_size // max(ncols, 1), 1)
+
+    if isinstance(ary, _InterleavedArray):
+        yield from ary.iter_chunks(nrows)
+    else:
+        for i in range(0, shape[0], nrows):
+            yield ary[i:i + nrows]
+
+
+def _ndarray_to_string_chunks(
+        ary: object, *,
+        chunk_size: int = 2**16) -> Iterator[str]:
+    """Format *ary* in blocks of rows of (at most) *chunk_size* entries.
+
+    The concatenated output is the same as that of :func:`numpy.savetxt`, but
+    each block is formatted with a single ``%`` operation instead of a Python
+    loop over the rows.
+    """
+    if not isinstance(ary, (np.ndarray, _InterleavedArray)):
+        raise TypeError(f"expected an 'ndarray', got '{type(ary).__name__}'")
+
+    fmt = _ndarray_format(ary)
+    if len(ary.shape) == 1:
+        ncols = 1
+    elif len(ary.shape) == 2:
+        ncols = ary.shape[1]
+    else:
+        raise ValueError(f"expected 1D or 2D array, got {len(ary.shape)}D array")
+
+    row_fmt = " ".join([fmt] * ncols) + "\n"
+    for block in _iter_array_chunks(ary, chunk_size=chunk_size):
+        yield (row_fmt * len(block)) % tuple(block.ravel().tolist())
+
+
+def _ndarray_to_string(ary: object) -> str:
+    return "\n" + "".join(_ndarray_to_string_chunks(ary))
 
 
 def _geometry_type_from_points(points: DataArray) -> GeometryType:
@@ -955,6 +1092,27 @@ class DatasetLike(ArrayLike, Protocol):
     def file(self) -> FileLike: ...
 
 
+def _dataset_basename(dset: DatasetLike) -> str:
+    if dset.name is None:
+        raise ValueError("cannot reference anonymous datasets")
+
+    return dset.name.split("/")[-1]
+
+
+def _data_item_from_dataset(
+        dset: DatasetLike,
+        heavy_data: str | None = None) -> DataItem:
+    if dset.name is None:
+        raise ValueError("cannot reference anonymous datasets")
+
+    if heavy_data is None:
+        heavy_data = dset.file.filename
+
+    return _data_item_from_numpy(dset,
+            data=f"{heavy_data}:{dset.name}",
+            dformat=DataItemFormat.HDF)
+
+
 class DataArray:
     r"""An array represented as a list of :class:`DataItem`\ s."""
 
@@ -1022,22 +1180,120 @@ class DataArray:
     def from_dataset(cls,
             dset: DatasetLike,
             acenter: AttributeCenter = AttributeCenter.Node,
-            atype: AttributeType | None = None) -> DataArray:
+            atype: AttributeType | None = None, *,
+            heavy_data: str | None = None) -> DataArray:
         """Create a :class:`DataArray` from an HDF5 ``Dataset``.
 
         :arg dset: an object that resembles an HDF5 dataset. We only access the
             fields *dtype*, *shape*, *name* and *file*.
+        :arg heavy_data: path to the HDF5 file, as referenced in the XDMF
+            file. Readers resolve relative paths with respect to the directory
+            of the XDMF file. By default, this is the path with which the file
+            was opened.
         """
         if dset.name is None:
             raise ValueError(f"cannot create {cls.__name__} for anonymous datasets")
 
-        filename = dset.file.filename
-        data = f"{filename}:{dset.name}"
-        name = dset.name.split("/")[-1]
+        item = _data_item_from_dataset(dset, heavy_data)
+
+        return cls(
+                components=(item,),
+                name=_dataset_basename(dset),
+                acenter=acenter,
+                atype=atype)
+
+    @classmethod
+    def from_hyperslab(cls,
+            dset: DatasetLike,
+            index: slice | tuple[slice, ...] | None = None, *,
+            start: tuple[int, ...] | None = None,
+            stride: tuple[int, ...] | None = None,
+            count: tuple[int, ...] | None = None,
+            acenter: AttributeCenter = AttributeCenter.Node,
+            atype: AttributeType | None = None,
+            heavy_data: str | None = None) -> DataArray:
+        """Create a :class:`DataArray` from a subset of an HDF5 ``Dataset``,
+        described by a :attr:`DataItemType.HyperSlab`. The data in the dataset
+        is referenced directly, without copying it.
 
-        item = _data_item_from_numpy(dset,
-                data=data,
-                dformat=DataItemFormat.HDF)
+        The subset can be given either as an *index* (a :class:`slice` or a
+        tuple of slices with positive steps, as used for :mod:`numpy` arrays)
+        or by its *start*, *stride* and *count* along each axis. Missing axes
+        or values default to the full dataset.
+
+        :raises ValueError: if the *start* is negative, the *stride* is not
+            positive or the hyperslab extends past the end of the dataset.
+
+        :arg dset: see :meth:`from_dataset`.
+        :arg heavy_data: see :meth:`from_dataset`.
+        """
+        shape = dset.shape
+        ndim = len(shape)
+
+        if index is not None:
+            if start is not None or stride is not None or count is not None:
+                raise ValueError(
+                    "cannot pass both 'index' and 'start', 'stride' or 'count'")
+
+            if isinstance(index, slice):
+                index = (index,)
+
+            if len(index) > ndim:
+                raise ValueError(f"too many indices for {ndim}D dataset")
+
+            index = (*index, *(slice(None),) * (ndim - len(index)))
+            ranges = [
+                range(*s.indices(n)) for s, n in zip(index, shape, strict=True)]
+            if any(r.step <= 0 for r in ranges):
+                raise ValueError("only slices with positive steps are supported")
+
+            start = tuple(r.start for r in ranges)
+            stride = tuple(r.step for r in ranges)
+            count = tuple(len(r) for r in ranges)
+        else:
+            if start is None:
+                start = (0,) * ndim
+            if stride is None:
+                stride = (1,) * ndim
+
+            if any(s < 0 for s in start):
+                raise ValueError(f"'start' must be non-negative: {start}")
+            if any(h <= 0 for h in stride):
+                raise ValueError(f"'stride' must be positive: {stride}")
+
+            if count is None:
+                count = tuple(
+                    len(range(s, n, h))
+                    for s, h, n in zip(start, stride, shape, strict=True))
+
+        if not len(start) == len(stride) == len(count) == ndim:
+            raise ValueError(
+                f"'start', 'stride' and 'count' must have {ndim} entries")
+
+        if any(c < 0 for c in count):
+            raise ValueError(f"'count' must be non-negative: {count}")
+
+        if any(s > n or (c > 0 and s + h * (c - 1) >= n)
+               for s, h, c, n in zip(start, stride, count, shape, strict=True)):
+            raise ValueError("hyperslab is out of bounds of the dataset")
+
+        name = _dataset_basename(dset)
+        item = DataItem(
+                name=name,
+                dimensions=count,
+                itype=DataItemType.HyperSlab,
+                ntype=DataItemNumberType.from_dtype(dset.dtype),
+                precision=dset.dtype.itemsize,
+                endian=None,
+                dformat=None)
+
+        selection = np.array([start, stride, count], dtype=np.int64)
+        _data_item_from_numpy(selection,
+                name=f"{name}_selection",
+                parent=item,
+                data=_ndarray_to_string(selection),
+                dformat=DataItemFormat.XML)
+        item.append(_data_item_from_dataset(dset, heavy_data))
 
         return cls(
                 components=(item,),
@@ -1056,21 +1312,32 @@ class NumpyDataArray(DataArray):
             ary: np.ndarray[tuple[int, ...], np.dtype[Any]], *,
             acenter: AttributeCenter | None = None,
             name: str | None = None,
+            interleave: bool = False,
             ) -> None:
         """
         :param ary: if this is an :class:`object` array, each entry is considered
             a different component and will consist of a separate
             :class:`DataItem`.
+        :param interleave: if *True* and *ary* is an :class:`object` array, the
+            components are written as a single :class:`DataItem` of shape
+            ``(n, ncomponents)`` instead. The components are interleaved in
+            chunks when the file is written, so that readers do not have to
+            join them on every load.
         """
 
+        self.interleaved: _InterleavedArray | None = None
         if ary.dtype.char == "O":
             from pytools import is_single_valued
             if not is_single_valued(iary.shape for iary in ary):
                 raise ValueError("'ary' components must have the same size")
 
-            items = tuple(
-                    _data_item_from_numpy(iary, name=f"{name}_{i}")
-                    for i, iary in enumerate(ary))
+            if interleave:
+                self.interleaved = _InterleavedArray(tuple(ary))
+                items = (_data_item_from_numpy(self.interleaved, name=name),)
+            else:
+                items = tuple(
+                        _data_item_from_numpy(iary, name=f"{name}_{i}")
+                        for i, iary in enumerate(ary))
         else:
             items = (_data_item_from_numpy(ary, name=name),)
 
@@ -1079,12 +1346,33 @@ class NumpyDataArray(DataArray):
 
     @override
     def as_data_item(self, *,
-            parent: Element | None = None) -> tuple[DataItem, ...]:
+            parent: Element | None = None,
+            inline: bool = True) -> tuple[DataItem, ...]:
+        r"""Construct the :class:`DataItem`\ s for the array.
+
+        The values are attached to the items as :attr:`DataItem.ary`. They
+        are only formatted into the text of the items when it is first
+        accessed, so that :class:`XdmfWriter` can store them in a heavy data
+        file without formatting them first.
+
+        :param inline: if *True*, the text of the items is available, as for
+            the :attr:`DataItemFormat.XML` format (see :attr:`DataItem.inline`).
+        """
         items = super().as_data_item(parent=parent)
 
-        ary = tuple(self.ary) if self.ary.dtype.char == "O" else (self.ary,)
+        # NOTE: the actual values are only written out by XdmfWriter, which
+        # decides if they are inlined or stored in a heavy data file
+        ary: tuple[ArrayLike, ...]
+        if self.interleaved is not None:
+            ary = (self.interleaved,)
+        elif self.ary.dtype.char == "O":
+            ary = tuple(self.ary)
+        else:
+            ary = (self.ary,)
+
         for item, iary in zip(items, ary, strict=True):
-            item.text = _ndarray_to_string(iary)
+            item.ary = iary
+            item.inline = inline
 
         return items
 
@@ -1146,7 +1434,14 @@ class XdmfUnstructuredGrid(XdmfGrid):
             connectivity: DataArray, *,
             topology_type: Topology | TopologyType,
             name: str | None = None,
-            geometry_type: GeometryType | None = None) -> None:
+            geometry_type: GeometryType | None = None,
+            number_of_elements: int | None = None) -> None:
+        """
+        :param number_of_elements: number of elements in the grid. By default,
+            this is determined from the shape of *connectivity*, which is not
+            possible for :attr:`TopologyType.Mixed` (see
+            :func:`make_mixed_connectivity`).
+        """
         if geometry_type is None:
             geometry_type = _geometry_type_from_points(points)
 
@@ -1156,7 +1451,14 @@ class XdmfUnstructuredGrid(XdmfGrid):
 
         grid = Grid(parent=None, name=name)
 
-        nelements = int(np.prod(connectivity.shape[:-1]))
+        if number_of_elements is None:
+            if topology_type == TopologyType.Mixed:
+                raise ValueError("'number_of_elements' required for Mixed topology")
+
+            nelements = int(np.prod(connectivity.shape[:-1]))
+        else:
+            nelements = number_of_elements
+
         if isinstance(topology_type, TopologyType):
             nodes_per_element = 2 if topology_type == TopologyType.Polyline else None
             topology: XdmfElement = Topology(
@@ -1176,11 +1478,802 @@ class XdmfUnstructuredGrid(XdmfGrid):
 
         super().__init__(grid)
 
+
+class XdmfStructuredGrid(XdmfGrid):
+    """A grid with an implicit connectivity given by the number of points
+    along each axis.
+
+    Note that the XDMF convention is that the data on structured grids is
+    stored with the first axis varying the fastest, i.e. a nodal attribute
+    should have the shape ``shape[::-1]`` (or be its flattened version) in
+    :mod:`numpy` C ordering.
+
+    .. attribute:: shape
+
+        Number of points along each axis of the grid.
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self,
+            shape: tuple[int, ...],
+            geometry: tuple[DataArray, ...], *,
+            topology_type: TopologyType,
+            geometry_type: GeometryType,
+            name: str | None = None) -> None:
+        """
+        :param geometry: a :class:`tuple` of arrays describing the geometry,
+            as required by *geometry_type*.
+        :param topology_type: one of the structured topology types, e.g.
+            :attr:`TopologyType.CoRectMesh3D`. The 2D or 3D variant is
+            determined from *shape*.
+        """
+        if topology_type not in _XDMF_STRUCTURED_GRIDS:
+            raise ValueError(f"unsupported topology type: '{topology_type}'")
+
+        ambient_dim = len(shape)
+        if ambient_dim not in (2, 3):
+            raise ValueError(f"unsupported dimension: '{ambient_dim}'")
+
+        grid = Grid(parent=None, name=name)
+        topology = Topology(
+                parent=grid,
+                ttype=topology_type,
+                dimensions=shape[::-1])
+
+        # NOTE: the 2D and 3D variants of the structured types are aliases in
+        # TopologyType, so the name needs to be fixed up
+        ttype_name = _XDMF_TOPOLOGY_TYPE_TO_NAME[topology_type][2:]
+        topology.set("TopologyType", f"{ambient_dim}D{ttype_name}")
+
+        geometry_element = Geometry(parent=grid, gtype=geometry_type)
+        for ary in geometry:
+            ary.as_data_item(parent=geometry_element)
+
+        super().__init__(grid)
+        self.shape: tuple[int, ...] = shape
+
+
+class XdmfRegularGrid(XdmfStructuredGrid):
+    """A structured grid with uniformly spaced points along each axis
+    (``CoRectMesh``). The geometry is only described by the *origin* and the
+    *spacing*.
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self,
+            shape: tuple[int, ...], *,
+            origin: tuple[float, ...] | None = None,
+            spacing: tuple[float, ...] | None = None,
+            name: str | None = None) -> None:
+        """
+        :param shape: number of points along each axis.
+        :param origin: coordinates of the first point, defaults to zero.
+        :param spacing: distance between two points along each axis,
+            defaults to one.
+        """
+        ambient_dim = len(shape)
+        if origin is None:
+            origin = (0.0,) * ambient_dim
+        if spacing is None:
+            spacing = (1.0,) * ambient_dim
+
+        if len(origin) != ambient_dim or len(spacing) != ambient_dim:
+            raise ValueError(
+                f"'origin' and 'spacing' must have {ambient_dim} components")
+
+        # NOTE: XDMF stores the origin and spacing in (z, y, x) order
+        geometry = (
+            NumpyDataArray(np.array(origin[::-1], dtype=np.float64), name="origin"),
+            NumpyDataArray(np.array(spacing[::-1], dtype=np.float64), name="spacing"),
+            )
+
+        super().__init__(shape, geometry,
+                topology_type=TopologyType.CoRectMesh3D,
+                geometry_type=(
+                    GeometryType.ORIGIN_DXDY if ambient_dim == 2
+                    else GeometryType.ORIGIN_DXDYDZ),
+                name=name)
+
+
+class XdmfRectilinearGrid(XdmfStructuredGrid):
+    """A structured grid with (possibly) non-uniformly spaced points along
+    each axis (``RectMesh``). The geometry is described by the coordinates
+    along each axis.
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self,
+            coordinates: tuple[DataArray, ...], *,
+            name: str | None = None) -> None:
+        """
+        :param coordinates: one-dimensional coordinate arrays for each axis.
+        """
+        if any(len(x.shape) != 1 for x in coordinates):
+            raise ValueError("'coordinates' must be one-dimensional arrays")
+
+        ambient_dim = len(coordinates)
+        super().__init__(tuple(x.shape[0] for x in coordinates), coordinates,
+                topology_type=TopologyType.RectMesh3D,
+                geometry_type=(
+                    GeometryType.VXVY if ambient_dim == 2
+                    else GeometryType.VXVYVZ),
+                name=name)
+
+
+class XdmfCurvilinearGrid(XdmfStructuredGrid):
+    """A structured grid with arbitrary point coordinates (``SMesh``).
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self,
+            shape: tuple[int, ...],
+            points: DataArray, *,
+            name: str | None = None) -> None:
+        """
+        :param shape: number of points along each axis.
+        :param points: an array of shape ``(npoints, ambient_dim)``, with the
+            points ordered as described in :class:`XdmfStructuredGrid`.
+        """
+        npoints = int(np.prod(shape))
+        if points.shape != (npoints, len(shape)):
+            raise ValueError(
+                f"'points' must have shape {(npoints, len(shape))}, "
+                f"got {points.shape}")
+
+        super().__init__(shape, (points,),
+                topology_type=TopologyType.SMesh3D,
+                geometry_type=_geometry_type_from_points(points),
+                name=name)
+
+# }}}
+
+
+# {{{ mixed topology
+
+# NOTE: these topology types are followed by their number of nodes in a
+# Mixed connectivity array
+_XDMF_MIXED_NODE_COUNT_TYPES = (
+    TopologyType.Polyvertex,
+    TopologyType.Polyline,
+    TopologyType.Polygon,
+    )
+
+# NOTE: these topology types can appear in a Mixed connectivity array
+_XDMF_MIXED_CELL_TYPES = (
+    *_XDMF_ELEMENT_NODE_COUNT,
+    TopologyType.Polyline,
+    TopologyType.Polygon,
+    )
+
+
+def make_mixed_connectivity(
+        cell_types: np.ndarray[tuple[int], np.dtype[np.integer]],
+        offsets: np.ndarray[tuple[int], np.dtype[np.integer]],
+        connectivity: np.ndarray[tuple[int], np.dtype[np.integer]],
+        ) -> np.ndarray[tuple[int], np.dtype[np.integer]]:
+    """Construct the connectivity array for a :attr:`TopologyType.Mixed`
+    topology from a VTK-style description of the cells.
+
+    Each cell is described by its topology type code, followed by the number
+    of nodes (only for :attr:`TopologyType.Polyvertex`,
+    :attr:`TopologyType.Polyline` and :attr:`TopologyType.Polygon`) and its
+    node indices.
+
+    :arg cell_types: :class:`TopologyType` values for each cell. Note that
+        these are XDMF codes and not VTK cell types, e.g. ``VTK_TRIANGLE = 5``
+        is a :attr:`TopologyType.Quadrilateral`.
+    :arg offsets: end offsets of each cell in *connectivity*.
+    :arg connectivity: concatenated node indices of all cells.
+    :returns: an array with the same dtype as *connectivity*. Use
+        ``number_of_elements=cell_types.size`` when constructing the
+        :class:`XdmfUnstructuredGrid`.
+    """
+    cell_types = np.asarray(cell_types)
+    offsets = np.asarray(offsets)
+    connectivity = np.asarray(connectivity)
+
+    if cell_types.shape != offsets.shape:
+        raise ValueError("'cell_types' and 'offsets' must have the same shape")
+
+    if cell_types.size == 0:
+        return np.empty(0, dtype=connectivity.dtype)
+
+    if offsets[-1] != connectivity.size:
+        raise ValueError("'offsets' do not match the size of 'connectivity'")
+
+    counts = np.diff(offsets, prepend=0)
+    starts = offsets - counts
+
+    # {{{ check node counts
+
+    if np.any(cell_types == TopologyType.Polyhedron):
+        raise ValueError("Polyhedron cells are not supported")
+
+    is_valid = np.isin(cell_types, _XDMF_MIXED_CELL_TYPES)
+    if not np.all(is_valid):
+        raise ValueError(
+            "'cell_types' must be TopologyType element codes (not VTK cell "
+            f"types), got unsupported codes {np.unique(cell_types[~is_valid])}")
+
+    node_count = np.full(max(TopologyType) + 1, -1, dtype=np.int64)
+    for ttype, nnodes in _XDMF_ELEMENT_NODE_COUNT.items():
+        node_count[ttype] = nnodes
+    node_count[list(_XDMF_MIXED_NODE_COUNT_TYPES)] = -1
+
+    expected_counts = node_count[cell_types]
+    if np.any((expected_counts >= 0) & (expected_counts != counts)):
+        raise ValueError("cells do not have the expected number of nodes")
+
+    # }}}
+
+    has_count = np.isin(cell_types, _XDMF_MIXED_NODE_COUNT_TYPES)
+    header_size = 1 + has_count.astype(np.int64)
+    mixed_offsets = np.cumsum(header_size + counts)
+    mixed_starts = mixed_offsets - header_size - counts
+
+    result = np.empty(mixed_offsets[-1], dtype=connectivity.dtype)
+    result[mixed_starts] = cell_types
+    result[mixed_starts[has_count] + 1] = counts[has_count]
+
+    shift = np.repeat(mixed_starts + header_size - starts, counts)
+    result[np.arange(connectivity.size) + shift] = connectivity
+
+    return result
+
+
+def make_mixed_connectivity_from_blocks(
+        blocks: Sequence[tuple[TopologyType,
+                               np.ndarray[tuple[int, int], np.dtype[np.integer]]]],
+        ) -> np.ndarray[tuple[int], np.dtype[np.integer]]:
+    """Construct the connectivity array for a :attr:`TopologyType.Mixed`
+    topology from blocks of cells of the same type.
+
+    :arg blocks: a sequence of ``(topology_type, connectivity)`` tuples, where
+        the *connectivity* has shape ``(nelements, nnodes)``.
+    :returns: see :func:`make_mixed_connectivity`. The cells are in the same
+        order as in *blocks*.
+    """
+    if not blocks:
+        return np.empty(0, dtype=np.int64)
+
+    dtype = np.result_type(*[conn for _, conn in blocks])
+
+    result = []
+    for ttype, conn in blocks:
+        nelements, nnodes = conn.shape
+        if ttype not in _XDMF_MIXED_CELL_TYPES:
+            raise ValueError(f"unsupported topology type in blocks: {ttype!r}")
+
+        expected_nnodes = _XDMF_ELEMENT_NODE_COUNT.get(ttype, nnodes)
+        if ttype not in _XDMF_MIXED_NODE_COUNT_TYPES and nnodes != expected_nnodes:
+            raise ValueError(
+                f"{ttype.name} cells must have {expected_nnodes} nodes, got {nnodes}")
+
+        header = [np.full((nelements, 1), ttype, dtype=dtype)]
+        if ttype in _XDMF_MIXED_NODE_COUNT_TYPES:
+            header.append(np.full((nelements, 1), nnodes, dtype=dtype))
+
+        result.append(np.hstack([*header, conn.astype(dtype, copy=False)]).ravel())
+
+    return np.concatenate(result)
+
+# }}}
+
+
+# {{{ virtual datasets
+
+def make_virtual_unstructured_grid(
+        h5file: Any,
+        filenames: Sequence[str], *,
+        topology_type: Topology | TopologyType,
+        points: str = "points",
+        connectivity: str = "connectivity",
+        node_fields: Sequence[str] = (),
+        cell_fields: Sequence[str] = (),
+        name: str | None = None,
+        heavy_data: str | None = None) -> XdmfUnstructuredGrid:
+    """Combine per-rank (or per-piece) HDF5 files into a single grid.
+
+    Each file in *filenames* is expected to contain the datasets *points*, of
+    shape ``(npoints, ambient_dim)``, *connectivity*, of shape
+    ``(nelements, nnodes)`` with indices local to the file, and all the
+    *node_fields* and *cell_fields*, with a first axis of size ``npoints`` or
+    ``nelements``, respectively.
+
+    The points and fields are concatenated without copying, as HDF5 virtual
+    datasets in *h5file*. The connectivity of each file needs to be offset by
+    the number of points in the previous files, which virtual datasets cannot
+    do, so it is copied (one file at a time) into a regular dataset.
+
+    :arg h5file: a writable ``h5py.File``, in which the datasets are created.
+        The XDMF file should reference this file.
+    :arg filenames: paths to the per-rank files, relative to the directory of
+        *h5file* (this is where HDF5 looks for the virtual dataset sources).
+    :arg heavy_data: path to *h5file*, as referenced in the XDMF file, i.e.
+        relative to the directory of the XDMF file. By default, the XDMF file
+        is assumed to be written next to *h5file*.
+    :returns: an :class:`XdmfUnstructuredGrid` referencing the datasets
+        created in *h5file*.
+    """
+    import h5py
+
+    if not filenames:
+        raise ValueError("no files given")
+
+    dirname = os.path.dirname(h5file.filename)
+    dataset_names = (points, connectivity, *node_fields, *cell_fields)
+
+    # {{{ gather shapes
+
+    shapes: dict[str, list[tuple[int, ...]]] = {name: [] for name in dataset_names}
+    dtypes: dict[str, np.dtype[Any]] = {}
+
+    for filename in filenames:
+        with h5py.File(os.path.join(dirname, filename), "r") as h5:
+            for dset_name in dataset_names:
+                dset = h5[dset_name]
+                shapes[dset_name].append(dset.shape)
+                dtypes.setdefault(dset_name, dset.dtype)
+
+    npoints = np.array([shape[0] for shape in shapes[points]])
+    nelements = np.array([shape[0] for shape in shapes[connectivity]])
+
+    # }}}
+
+    # {{{ create virtual datasets
+
+    def make_virtual_dataset(
+            dset_name: str,
+            sizes: np.ndarray[tuple[int], np.dtype[Any]]) -> Any:
+        from pytools import is_single_valued
+
+        dset_shapes = shapes[dset_name]
+        if not is_single_valued(shape[1:] for shape in dset_shapes):
+            raise ValueError(f"'{dset_name}' has different shapes in each file")
+
+        if any(shape[0] != n for shape, n in zip(dset_shapes, sizes, strict=True)):
+            raise ValueError(f"'{dset_name}' has an unexpected size")
+
+        offsets = np.cumsum(sizes)
+        layout = h5py.VirtualLayout(
+                shape=(offsets[-1], *dset_shapes[0][1:]),
+                dtype=dtypes[dset_name])
+
+        for filename, shape, end in zip(filenames, dset_shapes, offsets, strict=True):
+            layout[end - shape[0]:end] = h5py.VirtualSource(
+                    filename, dset_name, shape=shape)
+
+        return h5file.create_virtual_dataset(dset_name, layout)
+
+    points_dset = make_virtual_dataset(points, npoints)
+    fields = [
+        (make_virtual_dataset(field, npoints), AttributeCenter.Node)
+        for field in node_fields
+        ] + [
+        (make_virtual_dataset(field, nelements), AttributeCenter.Cell)
+        for field in cell_fields
+        ]
+
+    # }}}
+
+    # {{{ copy connectivity
+
+    from pytools import is_single_valued
+    if not is_single_valued(shape[1:] for shape in shapes[connectivity]):
+        raise ValueError(f"'{connectivity}' has different shapes in each file")
+
+    conn_dtype = dtypes[connectivity]
+    if np.sum(npoints) > np.iinfo(conn_dtype).max:
+        conn_dtype = np.dtype(np.int64)
+
+    conn_dset = h5file.create_dataset(connectivity,
+            shape=(np.sum(nelements), *shapes[connectivity][0][1:]),
+            dtype=conn_dtype)
+
+    point_offsets = np.cumsum(npoints) - npoints
+    element_offsets = np.cumsum(nelements) - nelements
+    for i, filename in enumerate(filenames):
+        start, end = element_offsets[i], element_offsets[i] + nelements[i]
+        with h5py.File(os.path.join(dirname, filename), "r") as h5:
+            conn_dset[start:end] = h5[connectivity][:].astype(conn_dtype) \
+                + conn_dtype.type(point_offsets[i])
+
+    # }}}
+
+    if heavy_data is None:
+        heavy_data = os.path.basename(h5file.filename)
+
+    grid = XdmfUnstructuredGrid(
+            DataArray.from_dataset(points_dset, heavy_data=heavy_data),
+            DataArray.from_dataset(conn_dset, heavy_data=heavy_data),
+            topology_type=topology_type,
+            name=name)
+
+    for dset, acenter in fields:
+        grid.add_attribute(DataArray.from_dataset(
+            dset, acenter=acenter, heavy_data=heavy_data))
+
+    return grid
+
+# }}}
+
+
+# {{{ heavy data
+
+class _HeavyDataWriter(ABC):
+    """Writes the :attr:`DataItem.ary` values of the items in an XDMF tree."""
+
+    @abstractmethod
+    def write_item(self, item: DataItem) -> None:
+        pass
+
+    def close(self) -> None:  # noqa: B027
+        pass
+
+    def write(self, root: Element) -> None:
+        """Write the heavy data of all the items in *root*. The items are
+        modified in place, so *root* should be a copy of the tree made with
+        :func:`_copy_element_tree`.
+        """
+        try:
+            for item in root.iter("DataItem"):
+                if isinstance(item, DataItem) and item.ary is not None:
+                    # NOTE: reset the format-specific state, so that each
+                    # writer starts from the same item
+                    item.attrib.pop("Seek", None)
+                    item.inline = False
+                    item.text = None
+
+                    self.write_item(item)
+        finally:
+            self.close()
+
+
+class _XMLHeavyDataWriter(_HeavyDataWriter):
+    @override
+    def write_item(self, item: DataItem) -> None:
+        # NOTE: the text is streamed directly into the file by _write_element
+        item.set("Format", DataItemFormat.XML.name)
+
+
+class _HDF5HeavyDataWriter(_HeavyDataWriter):
+    def __init__(self,
+            filename: str, *,
+            heavy_data: str,
+            append: bool = False,
+            group: str = "",
+            compression: str | None = None,
+            shuffle: bool = False) -> None:
+        r"""
+        :param filename: path to the HDF5 file on disk.
+        :param heavy_data: path to the HDF5 file, as referenced in the
+            :class:`DataItem`\ s.
+        :param append: if *True*, the datasets are added to an existing file.
+        :param group: HDF5 group in which to place the datasets.
+        """
+        import h5py
+
+        self.heavy_data = heavy_data
+        self.group = group
+        self.compression = compression
+        self.shuffle = shuffle
+
+        self.h5file = h5py.File(filename, "a" if append else "w")
+        self.dataset_names: set[str] = set()
+
+    def _make_dataset_name(self, item: DataItem) -> str:
+        name = item.get("Name", "data")
+
+        dset_name = f"{self.group}/{name}"
+        i = 0
+        while dset_name in self.dataset_names:
+            i += 1
+            dset_name = f"{self.group}/{name}_{i}"
+
+        self.dataset_names.add(dset_name)
+        return dset_name
+
+    @override
+    def write_item(self, item: DataItem) -> None:
+        ary = item.ary
+        assert ary is not None
+
+        dset_name = self._make_dataset_name(item)
+        if isinstance(ary, _InterleavedArray):
+            dset = self.h5file.create_dataset(dset_name,
+                    shape=ary.shape,
+                    dtype=ary.dtype,
+                    chunks=True if ary.shape[0] > 0 else None,
+                    compression=self.compression,
+                    shuffle=self.shuffle)
+
+            i = 0
+            for chunk in _iter_array_chunks(ary):
+                dset[i:i + len(chunk)] = chunk
+                i += len(chunk)
+        else:
+            ary = np.asarray(ary)
+            if ary.size > 0:
+                self.h5file.create_dataset(dset_name,
+                        data=ary,
+                        chunks=True,
+                        compression=self.compression,
+                        shuffle=self.shuffle)
+            else:
+                self.h5file.create_dataset(dset_name, data=ary)
+
+        item.set("Format", DataItemFormat.HDF.name)
+        item.text = f"{self.heavy_data}:{dset_name}"
+
+    @override
+    def close(self) -> None:
+        self.h5file.close()
+
+
+class _BinaryHeavyDataWriter(_HeavyDataWriter):
+    def __init__(self,
+            filename: str, *,
+            heavy_data: str,
+            append: bool = False) -> None:
+        r"""
+        :param filename: path to the binary file on disk.
+        :param heavy_data: path to the binary file, as referenced in the
+            :class:`DataItem`\ s.
+        :param append: if *True*, the arrays are added to the end of an
+            existing file.
+        """
+        self.heavy_data = heavy_data
+        self.file = open(filename, "ab" if append else "wb")  # noqa: SIM115
+        self.offset = self.file.tell()
+
+    @override
+    def write_item(self, item: DataItem) -> None:
+        ary = item.ary
+        assert ary is not None
+
+        # NOTE: the data is written in C order, which matches the XDMF layout
+        nbytes = 0
+        for chunk in _iter_array_chunks(ary):
+            chunk = np.ascontiguousarray(chunk)
+            chunk.tofile(self.file)
+            nbytes += chunk.nbytes
+
+        item.set("Format", DataItemFormat.Binary.name)
+        item.set("Endian", DataItemEndian.from_dtype(ary.dtype).name)
+        item.set("Seek", str(self.offset))
+        item.text = self.heavy_data
+
+        self.offset += nbytes
+
+    @override
+    def close(self) -> None:
+        self.file.close()
+
+
+def _make_heavy_data_writer(
+        filename: str,
+        heavy_data: str | None, *,
+        append: bool = False,
+        group: str = "",
+        **kwargs: Any) -> _HeavyDataWriter:
+    if heavy_data is None:
+        return _XMLHeavyDataWriter()
+
+    # NOTE: relative paths are resolved with respect to the .xmf file, since
+    # that is also how readers will look for them
+    path = os.path.join(os.path.dirname(filename), heavy_data)
+
+    _, ext = os.path.splitext(heavy_data)
+    if ext in (".h5", ".hdf5"):
+        return _HDF5HeavyDataWriter(path,
+                heavy_data=heavy_data, append=append, group=group, **kwargs)
+    else:
+        if kwargs:
+            raise ValueError(
+                f"binary heavy data files do not support options: {set(kwargs)}")
+
+        return _BinaryHeavyDataWriter(path, heavy_data=heavy_data, append=append)
+
+
+def _make_heavy_data_options(
+        heavy_data: str | None,
+        compression: str | None,
+        shuffle: bool) -> dict[str, Any]:
+    if compression is None and not shuffle:
+        return {}
+
+    if heavy_data is None:
+        raise ValueError("cannot use compression without 'heavy_data'")
+
+    return {"compression": compression, "shuffle": shuffle}
+
+# }}}
+
+
+# {{{ serialization
+
+def _format_start_tag(elem: Element) -> str:
+    from xml.sax.saxutils import quoteattr
+
+    attrs = "".join(f" {k}={quoteattr(str(v))}" for k, v in elem.attrib.items())
+    return f"<{elem.tag}{attrs}"
+
+
+def _write_element(
+        fd: TextIO,
+        elem: Element, *,
+        level: int = 0,
+        indent: str | None = None) -> None:
+    """Write *elem* and its children to *fd*.
+
+    Inline array data (i.e. :attr:`DataItem.ary` without any text) is
+    formatted and written in chunks, so the full text is never held in memory.
+
+    :arg indent: if not *None*, each child element is written on its own line
+        and indented by *indent* for each level.
+    """
+    from xml.sax.saxutils import escape
+
+    if indent is None:
+        prefix = newline = ""
+    else:
+        prefix, newline = indent * level, "\n"
+
+    ary = None
+    if isinstance(elem, DataItem) and elem.text is None:
+        ary = elem.ary
+
+    start_tag = _format_start_tag(elem)
+    children = list(elem)
+
+    if ary is None and not elem.text and not children:
+        fd.write(f"{prefix}{start_tag}/>{newline}")
+        return
+
+    fd.write(f"{prefix}{start_tag}>")
+    if ary is not None:
+        fd.write("\n")
+        fd.writelines(_ndarray_to_string_chunks(ary))
+        fd.write(prefix)
+    elif elem.text:
+        fd.write(escape(elem.text))
+
+    if children:
+        fd.write(newline)
+        for child in children:
+            _write_element(fd, child, level=level + 1, indent=indent)
+        fd.write(prefix)
+
+    fd.write(f"</{elem.tag}>{newline}")
+
+
+def _write_document(
+        filename: str,
+        root: Element, *,
+        indent: str | None = None) -> None:
+    with open(filename, "w", encoding="utf-8") as fd:
+        fd.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        _write_element(fd, root, indent=indent)
+
+# }}}
+
+
+# {{{ deduplication
+
+def _get_content_key(ary: np.ndarray[Any, np.dtype[Any]]) -> tuple[Any, ...]:
+    import hashlib
+
+    ary = np.ascontiguousarray(ary)
+    digest = hashlib.blake2b(memoryview(ary.reshape(-1).view(np.uint8))).digest()
+
+    return (ary.dtype.str, ary.shape, digest)
+
+
+def _copy_element_tree(elem: Element) -> Element:
+    """Copy the structure of the tree rooted at *elem*, so that it can be
+    modified without affecting *elem*. The element types and any additional
+    attributes (e.g. :attr:`DataItem.ary`) are kept, but arrays are not copied.
+    """
+    cls = type(elem)
+    if cls is Element:
+        result = Element(elem.tag, elem.attrib.copy())
+    else:
+        # NOTE: this avoids the custom constructors of the XdmfElement subclasses
+        result = cls.__new__(cls)
+        Element.__init__(result, elem.tag, elem.attrib.copy())  # noqa: PLC2801
+        result.__dict__.update(elem.__dict__)
+
+    # NOTE: this avoids formatting the values of inline DataItems
+    result.text = _ELEMENT_TEXT.__get__(elem)
+    result.tail = elem.tail
+    result.extend(_copy_element_tree(child) for child in elem)
+
+    return result
+
+
+def _deduplicate_data_items(domain: Element) -> None:
+    r"""Replace all :class:`DataItem`\ s in *domain* that have the same
+    :attr:`DataItem.ary` (by identity or by content) by references to a
+    single item at the top of the *domain*.
+    """
+
+    # {{{ find duplicates
+
+    content_keys: dict[int, tuple[Any, ...]] = {}
+    occurrences: dict[tuple[Any, ...], list[tuple[Element, int, DataItem]]] = {}
+
+    for parent in domain.iter():
+        for i, item in enumerate(parent):
+            if not isinstance(item, DataItem) or item.ary is None:
+                continue
+
+            ary = item.ary
+            if id(ary) not in content_keys:
+                content_keys[id(ary)] = _get_content_key(np.asarray(ary))
+
+            occurrences.setdefault(content_keys[id(ary)], []).append(
+                (parent, i, item))
+
+    # }}}
+
+    # {{{ replace duplicates by references
+
+    names = {
+        item.get("Name") for item in domain
+        if isinstance(item, DataItem)}
+
+    references: list[DataItem] = []
+    for items in occurrences.values():
+        if len(items) == 1:
+            continue
+
+        # NOTE: if there is no item in the domain already, the first item is
+        # moved to the domain and all the occurrences (including the original
+        # one) are replaced by a reference to it
+        icanonical = next(
+            (k for k, (parent, _, _) in enumerate(items) if parent is domain),
+            None)
+
+        if icanonical is None:
+            _, _, item = items[0]
+            name = base_name = item.get("Name", "data")
+
+            n = 0
+            while name in names:
+                n += 1
+                name = f"{base_name}_{n}"
+
+            names.add(name)
+            item.set("Name", name)
+            references.append(item)
+        else:
+            _, _, item = items[icanonical]
+            name = item.get("Name", "")
+
+        for k, (parent, i, _) in enumerate(items):
+            if k != icanonical:
+                parent[i] = DataItem.as_reference(name)
+
+    for i, item in enumerate(references):
+        domain.insert(i, item)
+
+    # }}}
+
 # }}}
 
 
 # {{{ writer
 
+_XDMF_ROOT_ATTRIB = {
+    "xmlns:xi": "http://www.w3.org/2001/XInclude",
+    "Version": "3.0",
+    }
+
+
 class XdmfWriter(ElementTree):
     """
     .. automethod:: __init__
@@ -1191,17 +2284,35 @@ class XdmfWriter(ElementTree):
     def __init__(self,
             grids: tuple[XdmfGrid, ...], *,
             arrays: tuple[DataArray, ...] | None = None,
-            tags: tuple[Element, ...] | None = None) -> None:
+            tags: tuple[Element, ...] | None = None,
+            heavy_data: str | None = None,
+            compression: str | None = None,
+            shuffle: bool = False,
+            deduplicate: bool = False) -> None:
         r"""
         :param grids: a :class:`tuple` of grids to be added to the
             top :class:`Domain`. Currently only a single domain is supported.
         :param arrays: additional :class:`DataArray`\ s to be added to the
             top :class:`Domain`, as opposed to as attribute on the grids.
+        :param deduplicate: if *True*, the :class:`NumpyDataArray` items that
+            appear multiple times in the grids (as the same array or as
+            arrays with the same content) are written only once, as a
+            :class:`DataItem` in the top :class:`Domain`, and all the
+            occurrences are replaced by references
+            (see :meth:`DataItem.as_reference`).
+        :param heavy_data: if given, the values of all the
+            :class:`NumpyDataArray`\ s are written to this file instead of
+            being inlined in the XML file. If the file has a ``.h5`` or
+            ``.hdf5`` extension, it is written as an HDF5 file, which requires
+            :mod:`h5py`. Otherwise, all the arrays are packed into a single
+            raw binary file and referenced by their byte offset. A relative
+            path is taken to be relative to the directory of the XDMF file.
+        :param compression: compression filter used for the datasets in the
+            *heavy_data* file, e.g. ``"gzip"`` or ``"lzf"``.
+        :param shuffle: if *True*, the HDF5 shuffle filter is applied before
+            compression.
         """
-        root = Element("Xdmf", {
-            "xmlns:xi": "http://www.w3.org/2001/XInclude",
-            "Version": "3.0",
-            })
+        root = Element("Xdmf", _XDMF_ROOT_ATTRIB)
 
         domain = Domain(parent=root)
         if arrays is not None:
@@ -1217,32 +2328,156 @@ class XdmfWriter(ElementTree):
 
         super().__init__(root)
 
-    def write_pretty(self, filename: str) -> None:
-        """Produces a nicer-looking XML file with clean indentation."""
-        # https://stackoverflow.com/a/1206856
-        from xml.dom import minidom
-        from xml.etree.ElementTree import tostring
+        self.deduplicate = deduplicate
+        self.heavy_data = heavy_data
+        self.heavy_data_options = _make_heavy_data_options(
+                heavy_data, compression, shuffle)
 
+    def _write_heavy_data(self, filename: str) -> Element:
         root = self.getroot()
         assert root is not None
 
-        dom = minidom.parseString(tostring(
-            root,
-            encoding="unicode",
-            short_empty_elements=False,
-            ))
+        # NOTE: the grids can be shared with other writers, so the heavy data
+        # references (and deduplicated items) are only added to a copy
+        root = _copy_element_tree(root)
+
+        if self.deduplicate:
+            domain = root.find("Domain")
+            assert domain is not None
+
+            _deduplicate_data_items(domain)
 
-        with open(filename, "wb") as fd:
-            fd.write(dom.toprettyxml(indent="  ", encoding="utf-8"))
+        writer = _make_heavy_data_writer(
+                filename, self.heavy_data, **self.heavy_data_options)
+        writer.write(root)
+
+        return root
+
+    def write_pretty(self, filename: str) -> None:
+        """Produces a nicer-looking XML file with clean indentation."""
+        root = self._write_heavy_data(filename)
+        _write_document(filename, root, indent="  ")
 
     @override
     def write(self, filename: str) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
         """Write the the XDMF file."""
-        super().write(
-                filename,
-                encoding="utf-8",
-                xml_declaration=True,
-                short_empty_elements=False,
-                )
+        root = self._write_heavy_data(filename)
+        _write_document(filename, root)
+
+# }}}
+
+
+# {{{ temporal writer
+
+class XdmfTemporalWriter:
+    """Writes a temporal collection of grids, one time step at a time.
+
+    The XDMF file is valid after each call to :meth:`append`, since only the
+    closing tags at the end of the file are rewritten to add a new step. If a
+    :class:`Topology` or :class:`Geometry` of a grid contains the exact same
+    data (i.e. the same :attr:`DataItem.ary` objects) as in a previous step,
+    it is not written again, but replaced by an :class:`XInclude` of the
+    previous one.
+
+    .. automethod:: __init__
+    .. automethod:: append
+    """
+
+    def __init__(self,
+            filename: str, *,
+            name: str | None = None,
+            heavy_data: str | None = None,
+            compression: str | None = None,
+            shuffle: bool = False) -> None:
+        """
+        :param filename: path to the XDMF file, which is created (or
+            overwritten) right away.
+        :param name: name of the temporal collection :class:`Grid`.
+        :param heavy_data: see :class:`XdmfWriter`. The arrays of each step
+            are appended to the same file (in a separate group for HDF5).
+        """
+        self.filename = filename
+        self.heavy_data = heavy_data
+        self.heavy_data_options = _make_heavy_data_options(
+                heavy_data, compression, shuffle)
+
+        self.nsteps = 0
+        self._references: dict[tuple[Any, ...], tuple[str, list[Any]]] = {}
+
+        root = Element("Xdmf", _XDMF_ROOT_ATTRIB)
+        domain = Domain(parent=None)
+        collection = Grid(name=name,
+                gtype=GridType.Collection,
+                ctype=CollectionType.Temporal,
+                parent=None)
+
+        # NOTE: the steps are always written before the closing tags in
+        # `self._tail`, which get rewritten on each `append`
+        self._tail = "    </Grid>\n  </Domain>\n</Xdmf>\n"
+
+        with open(filename, "w", encoding="utf-8") as fd:
+            fd.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            fd.write(f"{_format_start_tag(root)}>\n")
+            fd.write(f"  {_format_start_tag(domain)}>\n")
+            fd.write(f"    {_format_start_tag(collection)}>\n")
+
+            self._tail_offset = fd.tell()
+            fd.write(self._tail)
+
+    def _get_reference_key(self, elem: Element) -> tuple[Any, ...] | None:
+        key: list[Any] = [elem.tag, tuple(elem.attrib.items())]
+        for item in elem.iter("DataItem"):
+            if not isinstance(item, DataItem):
+                return None
+
+            # NOTE: the attributes of items with an array get modified when
+            # writing the heavy data, so only the array itself is compared
+            if item.ary is None:
+                key.append((tuple(item.attrib.items()), item.text))
+            else:
+                key.append(id(item.ary))
+
+        return tuple(key)
+
+    def append(self, grid: XdmfGrid, time: float) -> None:
+        """Add *grid* as a new step at the given *time* to the file."""
+        # NOTE: the same grid can be appended at several steps, so the heavy
+        # data references are only added to a copy
+        step = _copy_element_tree(grid.getroot())
+        step.insert(0, Time(value=str(time)))
+
+        for i, elem in enumerate(step):
+            if elem.tag not in ("Topology", "Geometry"):
+                continue
+
+            key = self._get_reference_key(elem)
+            if key is None:
+                continue
+
+            if key in self._references:
+                xpointer, _ = self._references[key]
+                step[i] = XInclude(href=None, xpointer=xpointer)
+            else:
+                # NOTE: the arrays are kept alive so that their ids are unique
+                xpointer = f"/Xdmf/Domain/Grid/Grid[{self.nsteps + 1}]/{elem.tag}"
+                arys = [item.ary for item in elem.iter("DataItem")]
+                self._references[key] = (xpointer, arys)
+
+        heavy_data_writer = _make_heavy_data_writer(
+                self.filename, self.heavy_data,
+                append=self.nsteps > 0,
+                group=f"/Step{self.nsteps}",
+                **self.heavy_data_options)
+        heavy_data_writer.write(step)
+
+        with open(self.filename, "r+", encoding="utf-8") as fd:
+            fd.seek(self._tail_offset)
+            fd.truncate()
+
+            _write_element(fd, step, level=3, indent="  ")
+            self._tail_offset = fd.tell()
+            fd.write(self._tail)
+
+        self.nsteps += 1
 
 # }}}
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2026 Andreas Kloeckner"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from xml.etree.ElementTree import Element, parse
+
+import numpy as np
+from typing_extensions import Self
+
+from pyvisfile.xdmf import (
+    AttributeCenter,
+    AttributeType,
+    DataItemEndian,
+    DataItemFormat,
+    DataItemNumberType,
+    DataItemType,
+    GridType,
+)
+
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+__doc__ = """
+Reading
+-------
+
+This reader supports the subset of XDMF that is written by
+:mod:`pyvisfile.xdmf`. The arrays are returned lazily, where possible: data
+stored in :attr:`~pyvisfile.xdmf.DataItemFormat.Binary` files is returned as
+a read-only :class:`numpy.memmap` and data stored in
+:attr:`~pyvisfile.xdmf.DataItemFormat.HDF` files is returned as an
+``h5py.Dataset``, so that nothing is read until the arrays are indexed.
+Components joined with an XDMF ``JOIN`` function are returned as an
+:class:`object` array of the components.
+
+.. autoclass:: XdmfReader
+.. autoclass:: XdmfGridData
+.. autoclass:: XdmfAttributeData
+"""
+
+
+_XINCLUDE_TAG = "{http://www.w3.org/2001/XInclude}include"
+
+
+# {{{ data items
+
+def _dtype_from_item(item: Element) -> np.dtype[Any]:
+    ntype = DataItemNumberType[item.get("NumberType", "Float")]
+    precision = int(item.get("Precision", "4"))
+
+    if ntype == DataItemNumberType.Float:
+        dtype = np.dtype(f"f{precision}")
+    elif ntype == DataItemNumberType.Int:
+        dtype = np.dtype(f"i{precision}")
+    elif ntype == DataItemNumberType.UInt:
+        dtype = np.dtype(f"u{precision}")
+    elif ntype == DataItemNumberType.Char:
+        dtype = np.dtype(np.int8)
+    elif ntype == DataItemNumberType.UChar:
+        dtype = np.dtype(np.uint8)
+    else:
+        raise ValueError(f"unsupported number type: '{ntype}'")
+
+    endian = DataItemEndian[item.get("Endian", "Native")]
+    if endian == DataItemEndian.Big:
+        dtype = dtype.newbyteorder(">")
+    elif endian == DataItemEndian.Little:
+        dtype = dtype.newbyteorder("<")
+
+    return dtype
+
+
+def _dimensions_from_item(item: Element) -> tuple[int, ...]:
+    dimensions = item.get("Dimensions")
+    if dimensions is None:
+        raise ValueError("DataItem has no 'Dimensions'")
+
+    return tuple(int(n) for n in dimensions.split())
+
+# }}}
+
+
+# {{{ grids
+
+@dataclass(frozen=True)
+class XdmfAttributeData:
+    """
+    .. attribute:: name
+    .. attribute:: center
+
+        An :class:`~pyvisfile.xdmf.AttributeCenter`.
+
+    .. attribute:: atype
+
+        An :class:`~pyvisfile.xdmf.AttributeType`.
+
+    .. attribute:: data
+
+        The (lazy) array containing the attribute values.
+    """
+
+    name: str
+    center: AttributeCenter
+    atype: AttributeType
+    data: Any
+
+
+@dataclass(frozen=True)
+class XdmfGridData:
+    """A uniform grid read from an XDMF file.
+
+    .. attribute:: name
+    .. attribute:: time
+
+        Value of the ``Time`` of the grid (or of its enclosing temporal
+        collection), or *None* if not given.
+
+    .. attribute:: topology_type
+
+        Name of the topology type, as written in the file, e.g.
+        ``"Triangle"`` or ``"3DCoRectMesh"``.
+
+    .. attribute:: topology_dimensions
+
+        The ``Dimensions`` of the topology (only for structured grids) or
+        *None*.
+
+    .. attribute:: number_of_elements
+
+        The ``NumberOfElements`` of the topology or *None*.
+
+    .. attribute:: connectivity
+
+        The (lazy) connectivity array or *None* for structured grids.
+
+    .. attribute:: geometry_type
+
+        Name of the geometry type, e.g. ``"XYZ"``.
+
+    .. attribute:: geometry
+
+        A :class:`tuple` of (lazy) arrays describing the geometry, e.g. the
+        points for ``XYZ`` or the origin and spacing for ``ORIGIN_DXDYDZ``.
+
+    .. attribute:: attributes
+
+        A :class:`dict` of :class:`XdmfAttributeData` by name.
+    """
+
+    name: str | None
+    time: float | None
+    topology_type: str
+    topology_dimensions: tuple[int, ...] | None
+    number_of_elements: int | None
+    connectivity: Any
+    geometry_type: str
+    geometry: tuple[Any, ...]
+    attributes: dict[str, XdmfAttributeData]
+
+# }}}
+
+
+# {{{ reader
+
+class XdmfReader:
+    r"""
+    .. attribute:: filename
+    .. attribute:: grids
+
+        A :class:`list` of :class:`XdmfGridData`\ s for all the uniform grids
+        in the file. Grids inside collections are flattened into this list.
+
+    .. automethod:: __init__
+    .. automethod:: close
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.dirname = os.path.dirname(filename)
+
+        self._documents: dict[str, Element] = {}
+        self._h5files: dict[str, Any] = {}
+
+        root = self._get_document(filename)
+        domain = root.find("Domain")
+        if domain is None:
+            raise ValueError(f"no 'Domain' found in '{filename}'")
+
+        self.grids: list[XdmfGridData] = []
+        for grid in domain.findall("Grid"):
+            self._read_grid(root, grid, time=None)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self,
+            exc_type: type[BaseException] | None,
+            exc: BaseException | None,
+            traceback: TracebackType | None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all the HDF5 files opened by the reader. The datasets
+        returned by the reader cannot be accessed afterwards.
+        """
+        for h5file in self._h5files.values():
+            h5file.close()
+
+        self._h5files.clear()
+
+    # {{{ references
+
+    def _get_document(self, filename: str) -> Element:
+        if filename not in self._documents:
+            self._documents[filename] = parse(filename).getroot()
+
+        return self._documents[filename]
+
+    def _find(self, root: Element, path: str) -> Element:
+        # NOTE: absolute paths start at the root, which ElementTree does not
+        # support, so they are made relative to it
+        if path.startswith("/"):
+            _, tag, path = path.split("/", 2)
+            if tag != root.tag:
+                raise ValueError(f"invalid path: '{path}'")
+
+        result = root.find(path)
+        if result is None:
+            raise ValueError(f"could not find element: '{path}'")
+
+        return result
+
+    def _resolve(self, root: Element, elem: Element) -> tuple[Element, Element]:
+        """
+        :returns: a tuple ``(root, elem)`` where *elem* is the element
+            referenced by an ``xi:include``, if any, and *root* is the root of
+            the document containing it.
+        """
+        if elem.tag != _XINCLUDE_TAG:
+            return root, elem
+
+        href = elem.get("href")
+        if href is not None:
+            root = self._get_document(os.path.join(self.dirname, href))
+
+        xpointer = elem.get("xpointer")
+        if xpointer is None:
+            return root, root
+
+        if xpointer.startswith("xpointer(") and xpointer.endswith(")"):
+            xpointer = xpointer[9:-1]
+        else:
+            raise ValueError(f"unsupported xpointer: '{xpointer}'")
+
+        return self._resolve(root, self._find(root, xpointer))
+
+    def _children(self, root: Element, elem: Element) -> list[Element]:
+        return [self._resolve(root, child)[1] for child in elem]
+
+    # }}}
+
+    # {{{ data items
+
+    def _get_h5file(self, filename: str) -> Any:
+        if filename not in self._h5files:
+            import h5py
+            self._h5files[filename] = h5py.File(filename, "r")
+
+        return self._h5files[filename]
+
+    def _read_data_item(self, root: Element, item: Element) -> Any:
+        if item.get("Reference") is not None:
+            if item.text is None:
+                raise ValueError("DataItem reference has no path")
+
+            return self._read_data_item(root, self._find(root, item.text.strip()))
+
+        itype = DataItemType[item.get("ItemType", "Uniform")]
+        if itype == DataItemType.Function:
+            function = item.get("Function", "")
+            if not function.startswith("JOIN"):
+                raise ValueError(f"unsupported function: '{function}'")
+
+            from pytools import obj_array
+            return obj_array.new_1d([
+                self._read_data_item(root, child)
+                for child in self._children(root, item)
+                ])
+        elif itype == DataItemType.HyperSlab:
+            selection, data = (
+                self._read_data_item(root, child)
+                for child in self._children(root, item))
+
+            start, stride, count = np.asarray(selection, dtype=np.int64)
+            index = tuple(
+                slice(s, s + h * (c - 1) + 1, h)
+                for s, h, c in zip(start, stride, count, strict=True))
+
+            return data[index]
+        elif itype != DataItemType.Uniform:
+            raise ValueError(f"unsupported item type: '{itype}'")
+
+        dtype = _dtype_from_item(item)
+        dimensions = _dimensions_from_item(item)
+        text = (item.text or "").strip()
+
+        dformat = DataItemFormat[item.get("Format", "XML")]
+        if dformat == DataItemFormat.XML:
+            return np.fromstring(text, dtype=dtype, sep=" ").reshape(dimensions)
+        elif dformat == DataItemFormat.Binary:
+            filename = os.path.join(self.dirname, text)
+            if np.prod(dimensions) == 0:
+                return np.empty(dimensions, dtype=dtype)
+
+            return np.memmap(filename,
+                    dtype=dtype,
+                    mode="r",
+                    offset=int(item.get("Seek", "0")),
+                    shape=dimensions)
+        elif dformat == DataItemFormat.HDF:
+            filename, dset_name = text.rsplit(":", 1)
+            dset = self._get_h5file(os.path.join(self.dirname, filename))[dset_name]
+            if dset.shape != dimensions:
+                raise ValueError(
+                    f"dataset '{text}' has shape {dset.shape}, "
+                    f"but expected {dimensions}")
+
+            return dset
+        else:
+            raise ValueError(f"unsupported format: '{dformat}'")
+
+    def _read_data_items(self, root: Element, elem: Element) -> tuple[Any, ...]:
+        return tuple(
+            self._read_data_item(root, child)
+            for child in self._children(root, elem)
+            if child.tag == "DataItem")
+
+    # }}}
+
+    # {{{ grids
+
+    def _read_grid(self,
+            root: Element,
+            grid: Element,
+            time: float | None) -> None:
+        time_element = grid.find("Time")
+        if time_element is not None:
+            time = float(time_element.get("Value", "nan"))
+
+        gtype = GridType[grid.get("GridType", "Uniform")]
+        if gtype in (GridType.Collection, GridType.Tree):
+            for child in self._children(root, grid):
+                if child.tag == "Grid":
+                    self._read_grid(root, child, time)
+            return
+        elif gtype != GridType.Uniform:
+            raise ValueError(f"unsupported grid type: '{gtype}'")
+
+        topology = geometry = None
+        attributes: dict[str, XdmfAttributeData] = {}
+        for child in self._children(root, grid):
+            if child.tag == "Topology":
+                topology = child
+            elif child.tag == "Geometry":
+                geometry = child
+            elif child.tag == "Attribute":
+                name = child.get("Name", f"attribute_{len(attributes)}")
+                (data,) = self._read_data_items(root, child)
+
+                attributes[name] = XdmfAttributeData(
+                        name=name,
+                        center=AttributeCenter[child.get("Center", "Node")],
+                        atype=AttributeType[child.get("AttributeType", "Scalar")],
+                        data=data)
+
+        if topology is None or geometry is None:
+            raise ValueError(
+                f"grid '{grid.get('Name')}' has no 'Topology' or 'Geometry'")
+
+        connectivity = self._read_data_items(root, topology)
+        dimensions = topology.get("Dimensions")
+        number_of_elements = topology.get("NumberOfElements")
+
+        self.grids.append(XdmfGridData(
+            name=grid.get("Name"),
+            time=time,
+            topology_type=topology.get("TopologyType", ""),
+            topology_dimensions=(
+                None if dimensions is None
+                else tuple(int(n) for n in dimensions.split())),
+            number_of_elements=(
+                None if number_of_elements is None
+                else int(number_of_elements)),
+            connectivity=connectivity[0] if connectivity else None,
+            geometry_type=geometry.get("GeometryType", "XYZ"),
+            geometry=self._read_data_items(root, geometry),
+            attributes=attributes,
+            ))
+
+    # }}}
+
+# }}}
@@ -94,6 +94,840 @@ def test_vtk_parallel() -> None:
     assert filecmp.cmp(file_name, cwd / "ref-vtk-parallel.pvtu")
 
 
+@pytest.mark.parametrize(("max_index", "dtype", "version"), [
+    (200, np.uint8, "0.1"),
+    (2**16 - 1, np.uint16, "0.1"),
+    (2**31 - 1, np.uint32, "0.1"),
+    (2**31, np.int64, "1.0"),
+    ])
+def test_vtk_narrow_index_types(max_index: int, dtype: type, version: str) -> None:
+    n = 16
+    points = np.zeros((n, 3))
+    cells = np.linspace(0, max_index, n).astype(np.int64)
+
+    grid = UnstructuredGrid(
+            (n, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=cells,
+            cell_types=np.full(n, VTK_VERTEX, dtype=np.int64),
+            narrow_index_types=True)
+
+    assert grid.cell_connectivity.to_numpy().dtype == dtype
+    assert grid.cell_offsets.to_numpy().dtype == np.uint8
+    assert grid.cell_types.to_numpy().dtype == np.uint8
+    assert np.array_equal(grid.cell_connectivity.to_numpy(), cells)
+    assert grid.min_vtk_file_version == version
+
+    import io
+    outf = io.StringIO()
+    AppendedDataXMLGenerator()(grid).write(outf)
+    assert f'version="{version}"' in outf.getvalue()
+
+
+def test_vtk_weld_points() -> None:
+    # two triangles sharing an edge, with each element storing its own nodes
+    points = np.array([
+        [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0],
+        [1.0, 1.0, 0.0], [0.0, 1.0 + 1.0e-14, 0.0], [1.0, 0.0, 0.0],
+        ])
+    field = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+
+    from pyvisfile.vtk import VTK_TRIANGLE
+    grid = UnstructuredGrid(
+            (6, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=np.arange(6, dtype=np.uint32),
+            cell_types=np.full(2, VTK_TRIANGLE, dtype=np.uint8))
+    grid.add_pointdata(DataArray("field", field))
+
+    from pyvisfile.vtk.tools import weld_points
+    welded = weld_points(grid, tol=1.0e-10)
+
+    assert welded.point_count == 4
+    assert welded.cell_count == 2
+
+    new_points = welded.points.to_numpy()
+    connectivity = welded.cell_connectivity.to_numpy()
+    assert connectivity.dtype == np.uint32
+    assert np.allclose(new_points[connectivity], points, atol=1.0e-10)
+
+    new_field = welded.pointdata[0].to_numpy()
+    assert np.allclose(new_field[connectivity], [0.0, 3.0, 3.0, 3.0, 3.0, 3.0])
+
+
+@pytest.mark.parametrize("curve", ["morton", "hilbert"])
+def test_vtk_reorder_spatially(curve: str) -> None:
+    from pyvisfile.vtk import VTK_LINE, VTK_TRIANGLE
+
+    rng = np.random.default_rng(seed=42)
+    npoints = 512
+    points = rng.random(size=(npoints, 3))
+
+    # a mix of lines and triangles with random vertices
+    nlines, ntriangles = 64, 128
+    connectivity = rng.integers(npoints, size=2 * nlines + 3 * ntriangles)
+    cell_types = np.array([VTK_LINE] * nlines + [VTK_TRIANGLE] * ntriangles)
+    rng.shuffle(cell_types)
+
+    grid = UnstructuredGrid(
+            (npoints, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=connectivity.astype(np.uint32),
+            cell_types=cell_types.astype(np.uint8))
+    grid.add_pointdata(DataArray("x", points[:, 0].copy()))
+    grid.add_celldata(DataArray("cell_id", np.arange(nlines + ntriangles)))
+
+    from pyvisfile.vtk.tools import reorder_spatially
+    result = reorder_spatially(grid, curve=curve)
+
+    new_points = result.points.to_numpy()
+    assert np.array_equal(result.pointdata[0].to_numpy(), new_points[:, 0])
+
+    # check that each cell has the same vertices as the original one
+    cell_id = result.celldata[0].to_numpy()
+    old_offsets = grid.cell_offsets.to_numpy()
+    new_offsets = result.cell_offsets.to_numpy()
+    new_connectivity = result.cell_connectivity.to_numpy()
+    assert np.array_equal(result.cell_types.to_numpy(), cell_types[cell_id])
+
+    for i in range(result.cell_count):
+        old_cell = connectivity[
+            old_offsets[cell_id[i]] - (2 if cell_types[cell_id[i]] == VTK_LINE else 3):
+            old_offsets[cell_id[i]]]
+        new_cell = new_connectivity[
+            new_offsets[i] - len(old_cell):new_offsets[i]]
+        assert np.array_equal(new_points[new_cell], points[old_cell])
+
+
+def test_vtk_reorder_spatially_empty_cells() -> None:
+    import warnings
+
+    from pyvisfile.vtk import VTK_POLY_VERTEX
+    from pyvisfile.vtk.tools import reorder_spatially
+
+    points = np.array([[1.0, 1.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    connectivity = np.array([0, 1, 2], dtype=np.uint32)
+    offsets = np.array([1, 1, 3, 3], dtype=np.uint32)
+
+    grid = UnstructuredGrid(
+            (3, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=(4, DataArray("connectivity", connectivity),
+                   DataArray("offsets", offsets)),
+            cell_types=np.full(4, VTK_POLY_VERTEX, dtype=np.uint8))
+    grid.add_celldata(DataArray("cell_id", np.arange(4)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = reorder_spatially(grid, reorder_points=False)
+
+    # NOTE: the empty cells are keyed at the lower corner of the bounding box
+    cell_id = result.celldata[0].to_numpy()
+    assert np.array_equal(cell_id, [1, 3, 2, 0])
+    assert np.array_equal(result.cell_offsets.to_numpy(), [0, 0, 2, 3])
+    assert np.array_equal(result.cell_connectivity.to_numpy(), [1, 2, 0])
+
+
+@pytest.mark.parametrize("family", ["simplex", "quad"])
+@pytest.mark.parametrize("dims", [1, 2, 3])
+@pytest.mark.parametrize("order", [1, 2, 5])
+def test_vtk_lagrange_permutation_arrays(family: str, dims: int, order: int) -> None:
+    from pyvisfile.vtk import vtk_ordering as vo
+
+    if family == "simplex":
+        node_tuples = vo.vtk_lagrange_simplex_node_tuples(dims, order)
+        perm = vo.vtk_lagrange_simplex_node_tuples_to_permutation(node_tuples)
+        node_ary = vo.vtk_lagrange_simplex_node_array(dims, order)
+        perm_ary = vo.vtk_lagrange_simplex_permutation(dims, order)
+
+        from pytools import (
+            generate_nonnegative_integer_tuples_summing_to_at_most as gnitstam,
+        )
+        modepy_tuples = np.array(list(gnitstam(order, dims)))
+    else:
+        node_tuples = vo.vtk_lagrange_quad_node_tuples(dims, order)
+        perm = vo.vtk_lagrange_quad_node_tuples_to_permutation(node_tuples)
+        node_ary = vo.vtk_lagrange_quad_node_array(dims, order)
+        perm_ary = vo.vtk_lagrange_quad_permutation(dims, order)
+
+        from itertools import product
+        modepy_tuples = np.array(list(product(range(order + 1), repeat=dims)))
+
+    assert node_ary.dtype == np.intp
+    assert perm_ary.dtype == np.intp
+    assert not node_ary.flags.writeable
+    assert not perm_ary.flags.writeable
+
+    assert np.array_equal(node_ary, np.array(node_tuples))
+    assert np.array_equal(perm_ary, np.array(perm))
+    assert np.array_equal(modepy_tuples[perm_ary], node_ary)
+
+    # vtk_version is also accepted as a list and the results are fresh lists
+    assert isinstance(node_tuples, list)
+    assert isinstance(perm, list)
+    node_tuples.reverse()
+    perm.reverse()
+
+    if family == "simplex":
+        assert vo.vtk_lagrange_simplex_node_tuples(
+            dims, order, vtk_version=[2, 1]) == node_tuples[::-1]
+        assert vo.vtk_lagrange_simplex_node_array(
+            dims, order, vtk_version=[2, 1]) is node_ary
+    else:
+        assert vo.vtk_lagrange_quad_node_tuples(
+            dims, order, [2, 1]) == node_tuples[::-1]
+        assert vo.vtk_lagrange_quad_node_array(dims, order, [2, 1]) is node_ary
+
+
+@pytest.mark.parametrize("order", [1, 2, 3, 6])
+def test_vtk_lagrange_wedge_ordering(order: int) -> None:
+    from pytools import (
+        generate_nonnegative_integer_tuples_summing_to_at_most as gnitstam,
+    )
+
+    from pyvisfile.vtk import vtk_ordering as vo
+
+    node_tuples = vo.vtk_lagrange_wedge_node_tuples(order)
+    wedge_tuples = {
+        (i, j, k)
+        for i, j in gnitstam(order, 2)
+        for k in range(order + 1)}
+    assert len(node_tuples) == len(wedge_tuples)
+    assert set(node_tuples) == wedge_tuples
+
+    from itertools import product
+    modepy_tuples = np.array([
+        (*ij, k) for ij, k in product(gnitstam(order, 2), range(order + 1))])
+    perm = vo.vtk_lagrange_wedge_permutation(order)
+    assert np.array_equal(modepy_tuples[perm], vo.vtk_lagrange_wedge_node_array(order))
+
+    if order == 3:
+        # NOTE: parametric coordinates of vtkLagrangeWedge (VTK 9.7.1) times 3
+        assert node_tuples == [
+            (0, 0, 0), (3, 0, 0), (0, 3, 0), (0, 0, 3), (3, 0, 3), (0, 3, 3),
+            (1, 0, 0), (2, 0, 0), (2, 1, 0), (1, 2, 0), (0, 2, 0), (0, 1, 0),
+            (1, 0, 3), (2, 0, 3), (2, 1, 3), (1, 2, 3), (0, 2, 3), (0, 1, 3),
+            (0, 0, 1), (0, 0, 2), (3, 0, 1), (3, 0, 2), (0, 3, 1), (0, 3, 2),
+            (1, 1, 0), (1, 1, 3),
+            (1, 0, 1), (2, 0, 1), (1, 0, 2), (2, 0, 2),
+            (2, 1, 1), (1, 2, 1), (2, 1, 2), (1, 2, 2),
+            (0, 2, 1), (0, 1, 1), (0, 2, 2), (0, 1, 2),
+            (1, 1, 1), (1, 1, 2)]
+
+
+def test_vtk_lagrange_pyramid_unsupported() -> None:
+    from pyvisfile.vtk import VTK_LAGRANGE_PYRAMID
+    from pyvisfile.vtk.tools import make_lagrange_grid
+
+    with pytest.raises(ValueError, match="not supported"):
+        make_lagrange_grid(np.zeros((3, 1, 14)), VTK_LAGRANGE_PYRAMID, 2)
+
+
+@pytest.mark.parametrize("vtk_version", [(2, 1), (2, 2)])
+def test_vtk_make_lagrange_grid(vtk_version: tuple[int, int]) -> None:
+    from pyvisfile.vtk import VTK_LAGRANGE_HEXAHEDRON
+    from pyvisfile.vtk.tools import make_lagrange_grid
+    from pyvisfile.vtk.vtk_ordering import vtk_lagrange_quad_permutation
+
+    rng = np.random.default_rng(seed=42)
+    order, nelements = 3, 16
+    nnodes = (order + 1)**3
+
+    nodes = rng.random(size=(3, nelements, nnodes))
+    pressure = rng.random(size=(nelements, nnodes))
+    velocity = obj_array.new_1d([rng.random(size=(nelements, nnodes))] * 3)
+
+    grid = make_lagrange_grid(nodes, VTK_LAGRANGE_HEXAHEDRON, order,
+            point_data=[("pressure", pressure), ("velocity", velocity)],
+            cell_data=[("cell_id", np.arange(nelements))],
+            vtk_version=vtk_version)
+
+    perm = vtk_lagrange_quad_permutation(3, order, vtk_version)
+    assert grid.point_count == nelements * nnodes
+    assert grid.cell_count == nelements
+    assert np.array_equal(
+        grid.points.to_numpy(),
+        nodes[..., perm].reshape(3, -1).T)
+    assert np.array_equal(
+        grid.pointdata[0].to_numpy(),
+        pressure[:, perm].reshape(-1))
+    assert grid.pointdata[1].to_numpy().shape == (nelements * nnodes, 3)
+    assert np.array_equal(
+        grid.cell_offsets.to_numpy(),
+        nnodes * np.arange(1, nelements + 1))
+    assert grid.cell_offsets.to_numpy().dtype == np.uint32
+    assert grid.min_vtk_file_version == "{}.{}".format(*vtk_version)
+
+    file_name = pathlib.Path(f"vtk-lagrange-hex-{vtk_version[1]}.vtu")
+    with open(file_name, "w") as outf:
+        AppendedDataXMLGenerator("zlib")(grid).write(outf)
+
+
+def _signed_subcell_volumes(family: str, vertices: np.ndarray) -> np.ndarray:
+    from math import factorial
+
+    if family == "simplex":
+        dims = vertices.shape[-1]
+        return np.linalg.det(vertices[:, 1:] - vertices[:, :1]) / factorial(dims)
+    elif family == "quad":
+        d02 = vertices[:, 2] - vertices[:, 0]
+        d13 = vertices[:, 3] - vertices[:, 1]
+        return (d02[:, 0] * d13[:, 1] - d02[:, 1] * d13[:, 0]) / 2
+    elif family == "hex":
+        # NOTE: the subcells are boxes aligned with the axes
+        edges = vertices[:, [1, 3, 4]] - vertices[:, :1]
+        return np.linalg.det(edges)
+    elif family == "wedge":
+        # NOTE: the subcells are straight prisms along the z axis
+        edges = vertices[:, [1, 2, 3]] - vertices[:, :1]
+        return np.linalg.det(edges) / 2
+    else:
+        raise ValueError(family)
+
+
+@pytest.mark.parametrize(("family", "dims"), [
+    ("simplex", 2), ("simplex", 3), ("quad", 2), ("hex", 3), ("wedge", 3),
+    ])
+def test_vtk_make_linear_subcell_grid(family: str, dims: int) -> None:
+    from math import factorial
+
+    from pyvisfile.vtk import (
+        VTK_HEXAHEDRON,
+        VTK_LAGRANGE_HEXAHEDRON,
+        VTK_LAGRANGE_QUADRILATERAL,
+        VTK_LAGRANGE_TETRAHEDRON,
+        VTK_LAGRANGE_TRIANGLE,
+        VTK_LAGRANGE_WEDGE,
+        VTK_QUAD,
+        VTK_TETRA,
+        VTK_TRIANGLE,
+        VTK_WEDGE,
+        vtk_ordering as vo,
+    )
+    from pyvisfile.vtk.tools import make_linear_subcell_grid
+
+    order = 4
+    if family == "simplex":
+        cell_type, subcell_type, nvertices = {
+            2: (VTK_LAGRANGE_TRIANGLE, VTK_TRIANGLE, 3),
+            3: (VTK_LAGRANGE_TETRAHEDRON, VTK_TETRA, 4),
+            }[dims]
+        nodes = vo.vtk_lagrange_simplex_node_array(dims, order)
+        volume = order**dims / factorial(dims)
+    elif family == "quad":
+        cell_type, subcell_type, nvertices = VTK_LAGRANGE_QUADRILATERAL, VTK_QUAD, 4
+        nodes = vo.vtk_lagrange_quad_node_array(dims, order)
+        volume = order**dims
+    elif family == "hex":
+        cell_type, subcell_type, nvertices = VTK_LAGRANGE_HEXAHEDRON, VTK_HEXAHEDRON, 8
+        nodes = vo.vtk_lagrange_quad_node_array(dims, order)
+        volume = order**dims
+    else:
+        cell_type, subcell_type, nvertices = VTK_LAGRANGE_WEDGE, VTK_WEDGE, 6
+        nodes = vo.vtk_lagrange_wedge_node_array(order)
+        volume = order**dims / 2
+
+    nodes = nodes.astype(np.float64)
+    nnodes = len(nodes)
+
+    grid = UnstructuredGrid(
+        (nnodes, DataArray("points", nodes, vector_format=VF_LIST_OF_VECTORS)),
+        cells=(1,
+               DataArray("connectivity", np.arange(nnodes, dtype=np.uint32)),
+               DataArray("offsets", np.array([nnodes], dtype=np.uint32))),
+        cell_types=np.array([cell_type], dtype=np.uint8))
+    grid.add_pointdata(DataArray("f", nodes[:, 0]))
+    grid.add_celldata(DataArray("cell_id", np.array([7])))
+
+    lin_grid = make_linear_subcell_grid(grid, order)
+    assert lin_grid.points is grid.points
+    assert lin_grid.pointdata[0] is grid.pointdata[0]
+
+    assert lin_grid.cell_count == order**dims
+    assert np.all(lin_grid.cell_types.to_numpy() == subcell_type)
+    assert np.all(lin_grid.celldata[0].to_numpy() == 7)
+
+    # check that the subcells are positively oriented and cover the reference
+    # cell without overlaps
+    connectivity = lin_grid.cell_connectivity.to_numpy().reshape(-1, nvertices)
+    volumes = _signed_subcell_volumes(family, nodes[connectivity, :dims])
+    assert np.all(volumes > 0)
+    assert abs(np.sum(volumes) - volume) < 1.0e-12
+
+    # narrowed input offsets must not overflow for the (many more) subcells
+    narrow_grid = UnstructuredGrid(
+        (nnodes, grid.points),
+        cells=(1, grid.cell_connectivity, grid.cell_offsets),
+        cell_types=np.array([cell_type], dtype=np.uint8),
+        narrow_index_types=True)
+    assert narrow_grid.cell_offsets.to_numpy().dtype == np.uint8
+
+    lin_grid = make_linear_subcell_grid(narrow_grid, order)
+    assert np.array_equal(
+        lin_grid.cell_offsets.to_numpy(),
+        nvertices * np.arange(1, order**dims + 1))
+
+
+# {{{ test_vtk_reader
+
+@pytest.mark.parametrize(("generator", "compressor"), [
+    ("inline", None),
+    ("inline", "zlib"),
+    ("appended", None),
+    ("appended", "zlib"),
+    ])
+def test_vtk_reader(generator: str, compressor: str | None) -> None:
+    from pyvisfile.vtk import InlineXMLGenerator
+    from pyvisfile.vtk.reader import XMLReader
+
+    grid = make_unstructured_grid(1024)
+    file_name = pathlib.Path(f"vtk-reader-{generator}-{compressor}.vtu")
+
+    if file_name.exists():
+        raise FileExistsError(f"Output file '{file_name}' already exists")
+
+    gen_cls = {
+        "inline": InlineXMLGenerator,
+        "appended": AppendedDataXMLGenerator,
+        }[generator]
+    with open(file_name, "w") as outf:
+        gen_cls(compressor)(grid).write(outf)
+
+    with XMLReader(str(file_name)) as reader:
+        assert reader.file_type == "UnstructuredGrid"
+        assert set(reader.get_arrays("PointData")) == {"pressure", "velocity"}
+
+        velocity = reader.read_array("velocity")
+        assert velocity.shape == (1024, 3)
+        assert np.array_equal(velocity, grid.pointdata[1].to_numpy())
+
+        result = reader.read_unstructured_grid(point_data=["pressure"])
+        assert [ary.name for ary in result.pointdata] == ["pressure"]
+
+    for expected, ary in [
+            (grid.points, result.points),
+            (grid.cell_connectivity, result.cell_connectivity),
+            (grid.cell_offsets, result.cell_offsets),
+            (grid.cell_types, result.cell_types),
+            (grid.pointdata[0], result.pointdata[0]),
+            ]:
+        assert ary.type == expected.type
+        assert np.array_equal(ary.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_vtk_reader_raw(compressed: bool) -> None:
+    import zlib
+
+    from pyvisfile.vtk.reader import XMLReader
+
+    ary = np.arange(1000, dtype=np.float64)
+
+    # write raw appended data with 64-bit headers and multiple zlib blocks
+    buf = ary.tobytes()
+    if compressed:
+        block_size = 3000
+        blocks = [zlib.compress(buf[i:i + block_size])
+                  for i in range(0, len(buf), block_size)]
+        header = np.array([
+            len(blocks), block_size, len(buf) % block_size,
+            *[len(block) for block in blocks]], dtype="<u8")
+        data = header.tobytes() + b"".join(blocks)
+    else:
+        data = np.array([len(buf)], dtype="<u8").tobytes() + buf
+
+    file_name = pathlib.Path(f"vtk-reader-raw-{compressed}.vts")
+    with open(file_name, "wb") as outf:
+        outf.write(
+            b'<?xml version="1.0"?>\n'
+            b'<VTKFile type="StructuredGrid" version="1.0" '
+            b'byte_order="LittleEndian" header_type="UInt64"'
+            + (b' compressor="vtkZLibDataCompressor">\n' if compressed else b">\n")
+            + b'<StructuredGrid WholeExtent="0 9 0 99 0 0">\n'
+            b'<Piece Extent="0 9 0 99 0 0">\n<PointData>\n'
+            b'<DataArray type="Float64" Name="f" format="appended" offset="0"/>\n'
+            b"</PointData>\n</Piece>\n</StructuredGrid>\n"
+            b'<AppendedData encoding="raw">\n_' + data
+            + b"\n</AppendedData>\n</VTKFile>\n")
+
+    with XMLReader(str(file_name)) as reader:
+        result = reader.read_array("f")
+
+    assert isinstance(result, np.memmap) != compressed
+    assert np.array_equal(result, ary)
+
+# }}}
+
+
+# {{{ test_vtk_read_parallel
+
+def test_vtk_read_parallel() -> None:
+    from pyvisfile.vtk.reader import (
+        merge_parallel_unstructured_grid,
+        read_parallel_unstructured_grid,
+    )
+
+    dirname = pathlib.Path("vtk-read-parallel")
+    dirname.mkdir(exist_ok=True)
+
+    sizes = [10, 0, 25, 7, 13]
+    grids = [make_unstructured_grid(n) for n in sizes]
+    pathnames = [f"piece-{i}.vtu" for i in range(len(grids))]
+    for grid, pathname in zip(grids, pathnames, strict=True):
+        with open(dirname / pathname, "w") as outf:
+            AppendedDataXMLGenerator("zlib")(grid).write(outf)
+
+    file_name = dirname / "parallel.pvtu"
+    with open(file_name, "w") as outf:
+        ParallelXMLGenerator(pathnames)(grids[0]).write(outf)
+
+    def check(result: UnstructuredGrid) -> None:
+        assert result.cell_count == sum(sizes)
+        assert np.array_equal(
+            result.cell_connectivity.to_numpy(), np.arange(sum(sizes)))
+        assert np.array_equal(
+            result.cell_offsets.to_numpy(), np.arange(1, sum(sizes) + 1))
+        assert np.array_equal(
+            result.points.to_numpy(),
+            np.concatenate([grid.points.to_numpy() for grid in grids]))
+        assert np.array_equal(
+            result.pointdata[1].to_numpy(),
+            np.concatenate([grid.pointdata[1].to_numpy() for grid in grids]))
+
+    result = read_parallel_unstructured_grid(str(file_name), max_workers=2)
+    check(result)
+
+    merged_name = dirname / "merged.pvtu"
+    merged = merge_parallel_unstructured_grid(
+        str(file_name), str(merged_name), 2)
+    assert len(merged) == 2
+
+    result = read_parallel_unstructured_grid(str(merged_name))
+    check(result)
+
+# }}}
+
+
+# {{{ test_vtk_multiblock
+
+def test_vtk_multiblock() -> None:
+    from xml.etree.ElementTree import parse
+
+    from pyvisfile.vtk import StructuredGrid, write_multiblock
+    from pyvisfile.vtk.reader import XMLReader
+
+    blocks = {
+        "fluid": StructuredGrid(np.mgrid[0:1:5j, 0:1:7j]),
+        "boundaries": {
+            "inlet": make_unstructured_grid(16),
+            "outlet": make_unstructured_grid(32),
+            },
+        "particles": [make_unstructured_grid(64)],
+        }
+
+    file_name = pathlib.Path("vtk-multiblock.vtm")
+    leaf_names = write_multiblock(file_name, blocks, compressor="zlib")
+    assert len(leaf_names) == 4
+    assert leaf_names[0].suffix == ".vts"
+
+    root = parse(file_name).getroot()
+    assert root.get("type") == "vtkMultiBlockDataSet"
+
+    datasets = root.findall(".//DataSet")
+    assert [el.get("name") for el in datasets] == [
+        "fluid", "inlet", "outlet", None]
+    assert root.find("vtkMultiBlockDataSet/Block[@name='boundaries']") is not None
+
+    for el, n in zip(datasets[1:], [16, 32, 64], strict=True):
+        source = file_name.parent / el.get("file", "")
+        with XMLReader(str(source)) as reader:
+            assert reader.read_points().shape == (n, 3)
+
+    with pytest.raises(FileExistsError):
+        write_multiblock(file_name, blocks)
+
+
+def test_vtk_multiblock_shared_arrays(nblocks: int = 16, n: int = 50000) -> None:
+    from pyvisfile.vtk import write_multiblock
+    from pyvisfile.vtk.reader import XMLReader
+
+    # NOTE: all the blocks share the same points and pressure arrays (or views
+    # of them), which are re-encoded concurrently by the writer threads
+    shared = make_unstructured_grid(n)
+    blocks = []
+    for i in range(nblocks):
+        points = shared.points if i % 2 else DataArray("points", shared.points)
+        grid = UnstructuredGrid(
+                (n, points),
+                cells=np.arange(n, dtype=np.uint32),
+                cell_types=np.full(n, VTK_VERTEX, dtype=np.uint8))
+        grid.add_pointdata(shared.pointdata[0])
+        blocks.append(grid)
+
+    view = DataArray("view", shared.points)
+    assert view._encode_lock is shared.points._encode_lock
+
+    expected = shared.points.to_numpy()
+    leaf_names = write_multiblock(
+        "vtk-multiblock-shared.vtm", blocks,
+        compressor="zlib", max_workers=nblocks)
+
+    for leaf_name in leaf_names:
+        with XMLReader(str(leaf_name)) as reader:
+            assert np.array_equal(reader.read_points(), expected)
+
+# }}}
+
+
+# {{{ test_vtk_ghosted_pieces
+
+def test_vtk_ghosted_pieces() -> None:
+    from xml.etree.ElementTree import fromstring
+
+    from pyvisfile.vtk import VTK_LINE, InlineXMLGenerator
+    from pyvisfile.vtk.tools import make_ghosted_pieces
+
+    # a chain of 6 line segments
+    points = np.zeros((7, 3))
+    points[:, 0] = np.arange(7)
+    connectivity = np.stack([np.arange(6), np.arange(1, 7)], axis=1)
+
+    grid = UnstructuredGrid(
+            (7, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=connectivity.reshape(-1).astype(np.uint32),
+            cell_types=np.full(6, VTK_LINE, dtype=np.uint8))
+    grid.add_pointdata(DataArray("x", points[:, 0].copy()))
+
+    pieces = make_ghosted_pieces(grid, np.array([0, 0, 0, 1, 1, 1]))
+    assert len(pieces) == 2
+
+    def get(data_arrays: list[DataArray], name: str) -> np.ndarray:
+        (data_array,) = [ary for ary in data_arrays if ary.name == name]
+        return data_array.to_numpy()
+
+    for piece, cell_ids, point_ids, ghost_points in [
+            (pieces[0], [0, 1, 2, 3], [0, 1, 2, 3, 4], [4]),
+            (pieces[1], [3, 4, 5, 2], [2, 3, 4, 5, 6], [2, 3]),
+            ]:
+        assert piece.min_vtk_file_version == "2.0"
+        assert np.array_equal(get(piece.celldata, "GlobalCellIds"), cell_ids)
+        assert np.array_equal(get(piece.celldata, "vtkGhostType"), [0, 0, 0, 1])
+
+        assert np.array_equal(get(piece.pointdata, "GlobalNodeIds"), point_ids)
+        assert np.array_equal(get(piece.pointdata, "x"), point_ids)
+        assert np.array_equal(
+            np.flatnonzero(get(piece.pointdata, "vtkGhostType")),
+            np.searchsorted(point_ids, ghost_points))
+
+        # connectivity is renumbered to the piece points
+        piece_points = piece.points.to_numpy()[:, 0]
+        assert np.array_equal(
+            piece_points[piece.cell_connectivity.to_numpy()].reshape(-1, 2),
+            connectivity[cell_ids])
+
+    import io
+    outf = io.StringIO()
+    InlineXMLGenerator()(pieces[0]).write(outf)
+    assert fromstring(outf.getvalue()).get("version") == "2.0"
+
+    outf = io.StringIO()
+    ParallelXMLGenerator(["a.vtu", "b.vtu"], ghost_level=1)(pieces[0]).write(outf)
+    root = fromstring(outf.getvalue())
+    assert root.find("PUnstructuredGrid").get("GhostLevel") == "1"
+    assert [el.get("Name") for el in root.findall(".//PCellData/PDataArray")] == [
+        "vtkGhostType", "GlobalCellIds"]
+
+# }}}
+
+
+# {{{ test_vtk_overlapping_amr
+
+def test_vtk_overlapping_amr() -> None:
+    from xml.etree.ElementTree import parse
+
+    from pyvisfile.vtk import ImageData, write_overlapping_amr
+
+    def make_block(
+            origin: tuple[float, ...], spacing: float, n: int) -> ImageData:
+        block = ImageData((0, n, 0, n, 0, n), origin, (spacing,) * 3)
+        block.add_celldata(DataArray("level", np.full(n**3, spacing)))
+        return block
+
+    levels = [
+        [make_block((0.0, 0.0, 0.0), 1.0, 4)],
+        [make_block((1.0, 1.0, 1.0), 0.5, 4), make_block((0.0, 0.0, 0.0), 0.5, 2)],
+        ]
+
+    file_name = pathlib.Path("vtk-overlapping-amr.vthb")
+    leaf_names = write_overlapping_amr(file_name, levels)
+    assert [leaf.suffix for leaf in leaf_names] == [".vti"] * 3
+
+    root = parse(file_name).getroot()
+    assert root.get("type") == "vtkOverlappingAMR"
+
+    amr = root.find("vtkOverlappingAMR")
+    assert amr is not None
+    assert amr.get("grid_description") == "XYZ"
+    assert [el.get("spacing") for el in amr.findall("Block")] == [
+        "1.0 1.0 1.0", "0.5 0.5 0.5"]
+    assert [el.get("amr_box") for el in amr.findall("Block/DataSet")] == [
+        "0 3 0 3 0 3", "2 5 2 5 2 5", "0 1 0 1 0 1"]
+
+    image = parse(leaf_names[1]).getroot().find("ImageData")
+    assert image is not None
+    assert image.get("Origin") == "1.0 1.0 1.0"
+    assert image.get("WholeExtent") == "0 4 0 4 0 4"
+
+    with pytest.raises(ValueError, match="integer ratio"):
+        write_overlapping_amr(
+            "vtk-overlapping-amr-invalid.vthb",
+            [levels[0], [make_block((0.0, 0.0, 0.0), 0.4, 2)]])
+
+
+def test_vtk_ghosted_pieces_random() -> None:
+    from pyvisfile.vtk import VTK_TRIANGLE
+    from pyvisfile.vtk.tools import make_ghosted_pieces
+
+    rng = np.random.default_rng(seed=42)
+
+    # a triangulated 8x8 square
+    n = 9
+    index = np.arange(n * n).reshape(n, n)
+    a, b = index[:-1, :-1].ravel(), index[1:, :-1].ravel()
+    c, d = index[:-1, 1:].ravel(), index[1:, 1:].ravel()
+    connectivity = np.concatenate([
+        np.stack([a, b, d], axis=1), np.stack([a, d, c], axis=1)])
+    ncells = len(connectivity)
+
+    points = np.zeros((n * n, 3))
+    points[:, 0], points[:, 1] = np.divmod(np.arange(n * n), n)
+
+    grid = UnstructuredGrid(
+            (n * n, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=connectivity.reshape(-1).astype(np.uint32),
+            cell_types=np.full(ncells, VTK_TRIANGLE, dtype=np.uint8))
+
+    npieces = 5
+    partition = rng.integers(npieces - 1, size=ncells)
+    pieces = make_ghosted_pieces(grid, partition, npieces=npieces)
+    assert len(pieces) == npieces
+
+    def get(data_arrays: list[DataArray], name: str) -> np.ndarray:
+        (data_array,) = [ary for ary in data_arrays if ary.name == name]
+        return data_array.to_numpy()
+
+    point_owner = np.full(n * n, npieces)
+    for icell, ipiece in enumerate(partition):
+        point_owner[connectivity[icell]] = np.minimum(
+            point_owner[connectivity[icell]], ipiece)
+
+    for ipiece, piece in enumerate(pieces):
+        owned = np.flatnonzero(partition == ipiece)
+        owned_points = np.zeros(n * n, dtype=bool)
+        owned_points[connectivity[owned]] = True
+        ghosts = np.array([
+            icell for icell in range(ncells)
+            if partition[icell] != ipiece and owned_points[connectivity[icell]].any()
+            ], dtype=np.int64)
+
+        cell_ids = np.concatenate([owned, ghosts])
+        point_ids = np.unique(connectivity[cell_ids])
+
+        assert np.array_equal(get(piece.celldata, "GlobalCellIds"), cell_ids)
+        assert np.array_equal(
+            get(piece.celldata, "vtkGhostType"),
+            np.arange(len(cell_ids)) >= len(owned))
+        assert np.array_equal(get(piece.pointdata, "GlobalNodeIds"), point_ids)
+        assert np.array_equal(
+            get(piece.pointdata, "vtkGhostType"),
+            point_owner[point_ids] != ipiece)
+        assert np.array_equal(
+            point_ids[piece.cell_connectivity.to_numpy()].reshape(-1, 3),
+            connectivity[cell_ids])
+
+
+def test_vtk_overlapping_amr_shared_arrays(nblocks: int = 16, n: int = 32) -> None:
+    from pyvisfile.vtk import ImageData, write_overlapping_amr
+    from pyvisfile.vtk.reader import XMLReader
+
+    # NOTE: all the fine blocks share the same cell data array, which is
+    # re-encoded concurrently by the writer threads
+    rng = np.random.default_rng(seed=42)
+    shared = DataArray("density", rng.random(n**3))
+    expected = shared.to_numpy()
+
+    fine = []
+    for i in range(nblocks):
+        block = ImageData((0, n, 0, n, 0, n), (float(i), 0.0, 0.0), (1 / n,) * 3)
+        block.add_celldata(shared)
+        fine.append(block)
+
+    coarse = ImageData((0, nblocks, 0, 1, 0, 1), (0.0, 0.0, 0.0), (1.0,) * 3)
+    leaf_names = write_overlapping_amr(
+        "vtk-overlapping-amr-shared.vthb", [[coarse], fine],
+        compressor="zlib", max_workers=nblocks)
+
+    for leaf_name in leaf_names[1:]:
+        with XMLReader(str(leaf_name)) as reader:
+            assert np.array_equal(
+                reader.read_array("density", "CellData"), expected)
+
+# }}}
+
+
+# {{{ test_vtk_extract_cells
+
+@pytest.mark.parametrize("use_mask", [True, False])
+def test_vtk_extract_cells(use_mask: bool) -> None:
+    from pyvisfile.vtk import VTK_QUAD
+    from pyvisfile.vtk.tools import extract_cells
+
+    # a 2x2 grid of quadrilaterals
+    x, y = np.meshgrid(np.arange(3.0), np.arange(3.0), indexing="ij")
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(9)], axis=1)
+    connectivity = np.array([
+        [0, 3, 4, 1], [1, 4, 5, 2], [3, 6, 7, 4], [4, 7, 8, 5],
+        ], dtype=np.uint32)
+
+    grid = UnstructuredGrid(
+            (9, DataArray("points", points, vector_format=VF_LIST_OF_VECTORS)),
+            cells=connectivity.reshape(-1),
+            cell_types=np.full(4, VTK_QUAD, dtype=np.uint8))
+    grid.add_pointdata(DataArray("index", np.arange(9)))
+    grid.add_celldata(DataArray("area", np.array([1.0, 2.0, 3.0, 4.0])))
+
+    if use_mask:
+        cells = np.array([False, False, True, True])
+        cell_indices = np.array([2, 3])
+    else:
+        cells = cell_indices = np.array([3, 0])
+
+    result = extract_cells(grid, cells)
+    assert result.cell_count == len(cell_indices)
+    assert np.array_equal(
+        result.cell_offsets.to_numpy(), 4 * np.arange(1, len(cell_indices) + 1))
+    assert np.array_equal(result.celldata[0].to_numpy(), cell_indices + 1.0)
+
+    point_indices = result.pointdata[0].to_numpy()
+    assert np.array_equal(point_indices, np.unique(connectivity[cell_indices]))
+    assert np.array_equal(result.points.to_numpy(), points[point_indices])
+    assert np.array_equal(
+        point_indices[result.cell_connectivity.to_numpy()].reshape(-1, 4),
+        connectivity[cell_indices])
+
+    with pytest.raises(ValueError, match="cell mask"):
+        extract_cells(grid, np.array([True, False]))
+
+    # repeated cells must not overflow narrowed offsets
+    narrow_grid = UnstructuredGrid(
+            (9, grid.points),
+            cells=connectivity.reshape(-1),
+            cell_types=np.full(4, VTK_QUAD, dtype=np.uint8),
+            narrow_index_types=True)
+    assert narrow_grid.cell_offsets.to_numpy().dtype == np.uint8
+
+    result = extract_cells(narrow_grid, np.zeros(100, dtype=np.int64))
+    assert np.array_equal(result.cell_offsets.to_numpy(), 4 * np.arange(1, 101))
+
+# }}}
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
@@ -198,6 +198,716 @@ def test_unstructured_simplex_grid(ambient_dim: int, nelements: int = 16) -> Non
     # }}}
 
 
+# {{{ test_heavy_data_hdf5
+
+@pytest.mark.parametrize("compression", [None, "gzip", "lzf"])
+def test_heavy_data_hdf5(compression: str | None, npoints: int = 64) -> None:
+    h5py = pytest.importorskip("h5py")
+
+    rng = np.random.default_rng(seed=42)
+    points_ary = rng.random(size=(npoints, 3))
+    connectivity_ary = np.arange(npoints, dtype=np.uint32)
+    velocity_ary = rng.random(size=(npoints, 3))
+
+    from pyvisfile.xdmf import TopologyType, XdmfUnstructuredGrid
+    grids = tuple(
+        XdmfUnstructuredGrid(
+            NumpyDataArray(points_ary + i, name="points"),
+            NumpyDataArray(connectivity_ary, name="connectivity"),
+            topology_type=TopologyType.Polyvertex,
+            name=f"polyvertex_{i}")
+        for i in range(2))
+    grids[0].add_attribute(NumpyDataArray(velocity_ary, name="velocity"))
+
+    from pyvisfile.xdmf import XdmfWriter
+    writer = XdmfWriter(grids,
+            heavy_data=f"test_heavy_data_{compression}.h5",
+            compression=compression,
+            shuffle=compression is not None)
+
+    filename = f"test_heavy_data_{compression}.xmf"
+    writer.write_pretty(filename)
+
+    from xml.etree.ElementTree import parse
+    root = parse(filename).getroot()
+    assert all(item.get("Format") == "HDF" for item in root.iter("DataItem"))
+
+    with h5py.File(f"test_heavy_data_{compression}.h5", "r") as h5:
+        assert np.array_equal(h5["points"][:], points_ary)
+        assert np.array_equal(h5["points_1"][:], points_ary + 1)
+        assert np.array_equal(h5["connectivity"][:], connectivity_ary)
+        assert np.array_equal(h5["velocity"][:], velocity_ary)
+
+        assert h5["points"].compression == compression
+
+# }}}
+
+
+# {{{ test_heavy_data_binary
+
+def test_heavy_data_binary(npoints: int = 64) -> None:
+    rng = np.random.default_rng(seed=42)
+    points_ary = rng.random(size=(npoints, 3))
+    connectivity_ary = np.arange(npoints, dtype=np.uint32)
+    temperature_ary = rng.random(size=npoints).astype(">f4")
+
+    from pyvisfile.xdmf import TopologyType, XdmfUnstructuredGrid
+    grid = XdmfUnstructuredGrid(
+            NumpyDataArray(points_ary, name="points"),
+            NumpyDataArray(connectivity_ary, name="connectivity"),
+            topology_type=TopologyType.Polyvertex,
+            name="polyvertex")
+    grid.add_attribute(NumpyDataArray(temperature_ary, name="temperature"))
+
+    from pyvisfile.xdmf import XdmfWriter
+    writer = XdmfWriter((grid,), heavy_data="test_heavy_data.bin")
+    writer.write_pretty("test_heavy_data_binary.xmf")
+
+    from xml.etree.ElementTree import parse
+    root = parse("test_heavy_data_binary.xmf").getroot()
+
+    arrays = {
+        "connectivity": connectivity_ary,
+        "points": points_ary,
+        "temperature": temperature_ary,
+        }
+    items = {item.get("Name"): item for item in root.iter("DataItem")}
+    assert items["temperature"].get("Endian") == "Big"
+
+    with open("test_heavy_data.bin", "rb") as fd:
+        buf = fd.read()
+
+    for name, ary in arrays.items():
+        item = items[name]
+        assert item.get("Format") == "Binary"
+        assert item.text == "test_heavy_data.bin"
+
+        offset = int(item.get("Seek"))
+        result = np.frombuffer(buf, dtype=ary.dtype, count=ary.size, offset=offset)
+        assert np.array_equal(result.reshape(ary.shape), ary)
+
+    # the grid is not modified, so it can be written again in another format
+    for item in grid.getroot().iter("DataItem"):
+        assert item.get("Format") == "XML"
+        assert item.get("Seek") is None
+
+    XdmfWriter((grid,)).write_pretty("test_heavy_data_binary_xml.xmf")
+    root = parse("test_heavy_data_binary_xml.xmf").getroot()
+    for item in root.iter("DataItem"):
+        assert item.get("Format") == "XML"
+        assert item.get("Seek") is None
+        assert item.text.split()
+
+# }}}
+
+
+# {{{ test_ndarray_to_string
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32, np.int32, np.uint64])
+@pytest.mark.parametrize("shape", [(0,), (1000,), (1000, 3), (3, 1000)])
+def test_ndarray_to_string(dtype: type[np.generic], shape: tuple[int, ...]) -> None:
+    from pyvisfile.xdmf import _ndarray_format, _ndarray_to_string_chunks
+
+    rng = np.random.default_rng(seed=42)
+    ary = np.abs(1.0e3 * rng.normal(size=shape)).astype(dtype)
+
+    import io
+    bio = io.BytesIO()
+    np.savetxt(bio, ary, fmt=_ndarray_format(ary))
+
+    result = "".join(_ndarray_to_string_chunks(ary, chunk_size=128))
+    assert result == bio.getvalue().decode()
+
+
+def test_as_data_item_inline() -> None:
+    from xml.etree.ElementTree import fromstring, tostring
+
+    from pyvisfile.xdmf import (
+        _ELEMENT_TEXT,
+        TopologyType,
+        XdmfUnstructuredGrid,
+        XdmfWriter,
+    )
+
+    ary = np.arange(6, dtype=np.int32).reshape(2, 3)
+    data = NumpyDataArray(ary, name="values")
+
+    (item,) = data.as_data_item(inline=False)
+    assert item.ary is ary
+    assert item.text is None
+
+    (item,) = data.as_data_item()
+    assert item.ary is ary
+    text = fromstring(tostring(item)).text
+    assert text is not None
+    assert np.array_equal(np.array(text.split(), dtype=np.int32), ary.ravel())
+
+    # grids serialized directly contain their values
+    points = np.arange(6, dtype=np.float64).reshape(3, 2)
+    grid = XdmfUnstructuredGrid(
+            NumpyDataArray(points, name="points"),
+            NumpyDataArray(np.arange(3, dtype=np.uint32), name="connectivity"),
+            topology_type=TopologyType.Polyvertex,
+            name="polyvertex")
+
+    # NOTE: the writer streams the values and does not format the text
+    XdmfWriter((grid,)).write("test_as_data_item_inline.xmf")
+    for item in grid.getroot().iter("DataItem"):
+        assert _ELEMENT_TEXT.__get__(item) is None
+
+    geometry = fromstring(tostring(grid.getroot())).find("Geometry/DataItem")
+    assert geometry is not None
+    assert np.array_equal(np.fromstring(geometry.text, sep=" "), points.ravel())
+
+# }}}
+
+
+# {{{ test_write_streaming
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_write_streaming(pretty: bool, npoints: int = 64) -> None:
+    rng = np.random.default_rng(seed=42)
+    points_ary = rng.random(size=(npoints, 3))
+    connectivity_ary = np.arange(npoints, dtype=np.uint32)
+
+    from pyvisfile.xdmf import TopologyType, XdmfUnstructuredGrid
+    grid = XdmfUnstructuredGrid(
+            NumpyDataArray(points_ary, name="points"),
+            NumpyDataArray(connectivity_ary, name="connectivity"),
+            topology_type=TopologyType.Polyvertex,
+            name="polyvertex<&>")
+
+    from pyvisfile.xdmf import XdmfWriter
+    writer = XdmfWriter((grid,))
+
+    filename = f"test_write_streaming_{pretty}.xmf"
+    if pretty:
+        writer.write_pretty(filename)
+    else:
+        writer.write(filename)
+
+    from xml.etree.ElementTree import parse
+    root = parse(filename).getroot()
+    assert root.find("Domain/Grid").get("Name") == "polyvertex<&>"
+
+    items = {item.get("Name"): item for item in root.iter("DataItem")}
+    assert np.array_equal(
+        np.fromstring(items["points"].text, sep=" ").reshape(points_ary.shape),
+        points_ary)
+    assert np.array_equal(
+        np.fromstring(items["connectivity"].text, sep=" "),
+        connectivity_ary)
+
+# }}}
+
+
+# {{{ test_temporal_writer
+
+@pytest.mark.parametrize("heavy_data", [None, "h5", "bin"])
+def test_temporal_writer(heavy_data: str | None,
+                         nsteps: int = 3, npoints: int = 64) -> None:
+    if heavy_data == "h5":
+        pytest.importorskip("h5py")
+
+    rng = np.random.default_rng(seed=42)
+    points = NumpyDataArray(rng.random(size=(npoints, 3)), name="points")
+    connectivity = NumpyDataArray(
+            np.arange(npoints, dtype=np.uint32), name="connectivity")
+
+    from pyvisfile.xdmf import TopologyType, XdmfTemporalWriter, XdmfUnstructuredGrid
+    filename = f"test_temporal_writer_{heavy_data}.xmf"
+    writer = XdmfTemporalWriter(filename,
+            name="series",
+            heavy_data=(
+                None if heavy_data is None
+                else f"test_temporal_writer.{heavy_data}"))
+
+    from xml.etree.ElementTree import parse, tostring
+    for n in range(nsteps):
+        grid = XdmfUnstructuredGrid(points, connectivity,
+                topology_type=TopologyType.Polyvertex,
+                name=f"step_{n}")
+        grid.add_attribute(NumpyDataArray(
+            np.full(npoints, n, dtype=np.float64), name="temperature"))
+
+        writer.append(grid, time=0.1 * n)
+
+        # NOTE: check that the file is valid after each step
+        root = parse(filename).getroot()
+        steps = root.findall("Domain/Grid/Grid")
+        assert len(steps) == n + 1
+
+    assert root.find("Domain/Grid").get("CollectionType") == "Temporal"
+    assert [step.find("Time").get("Value") for step in steps] == [
+        str(0.1 * n) for n in range(nsteps)]
+
+    xi = "{http://www.w3.org/2001/XInclude}include"
+    assert steps[0].find(xi) is None
+    for step in steps[1:]:
+        assert step.find("Geometry") is None
+        assert step.find("Topology") is None
+        assert [e.get("xpointer") for e in step.findall(xi)] == [
+            "xpointer(/Xdmf/Domain/Grid/Grid[1]/Topology)",
+            "xpointer(/Xdmf/Domain/Grid/Grid[1]/Geometry)",
+            ]
+
+    # appending the same grid several times does not modify it
+    filename = f"test_temporal_writer_{heavy_data}_same.xmf"
+    writer = XdmfTemporalWriter(filename,
+            heavy_data=(
+                None if heavy_data is None
+                else f"test_temporal_writer_same.{heavy_data}"))
+
+    original = tostring(grid.getroot())
+    writer.append(grid, time=0.0)
+    writer.append(grid, time=1.0)
+    assert tostring(grid.getroot()) == original
+    assert grid.getroot().find("Time") is None
+
+    from pyvisfile.xdmf.reader import XdmfReader
+    with XdmfReader(filename) as reader:
+        assert [step.time for step in reader.grids] == [0.0, 1.0]
+        for step in reader.grids:
+            assert np.array_equal(step.geometry[0][:], points.ary)
+            assert np.all(step.attributes["temperature"].data[:] == nsteps - 1)
+
+# }}}
+
+
+# {{{ test_deduplicate
+
+def test_deduplicate(ngrids: int = 3, npoints: int = 64) -> None:
+    rng = np.random.default_rng(seed=42)
+    points = NumpyDataArray(rng.random(size=(npoints, 3)), name="points")
+
+    from pyvisfile.xdmf import TopologyType, XdmfUnstructuredGrid
+    grids = []
+    for n in range(ngrids):
+        # NOTE: `points` are the same object, `connectivity` has the same content
+        grid = XdmfUnstructuredGrid(
+                points,
+                NumpyDataArray(np.arange(npoints, dtype=np.uint32),
+                               name="connectivity"),
+                topology_type=TopologyType.Polyvertex,
+                name=f"grid_{n}")
+        grid.add_attribute(NumpyDataArray(
+            np.full(npoints, n, dtype=np.float64), name="temperature"))
+        grids.append(grid)
+
+    from pyvisfile.xdmf import XdmfWriter
+    writer = XdmfWriter(tuple(grids), deduplicate=True)
+    writer.write("test_deduplicate.xmf")
+
+    from xml.etree.ElementTree import parse
+    root = parse("test_deduplicate.xmf").getroot()
+
+    items = root.findall("Domain/DataItem")
+    assert sorted(item.get("Name") for item in items) == ["connectivity", "points"]
+
+    for grid in root.findall("Domain/Grid"):
+        for tag in ("Topology", "Geometry"):
+            item = grid.find(f"{tag}/DataItem")
+            assert item.get("Reference") == "XML"
+            assert item.text.startswith("/Xdmf/Domain/DataItem")
+
+        item = grid.find("Attribute/DataItem")
+        assert item.get("Reference") is None
+        assert item.get("Format") == "XML"
+
+    # the grids are not modified, so they can be written again
+    from pyvisfile.xdmf.reader import XdmfReader
+    for filename in ["test_deduplicate.xmf", "test_deduplicate_again.xmf"]:
+        if filename != "test_deduplicate.xmf":
+            XdmfWriter(tuple(grids), deduplicate=True).write(filename)
+
+        with XdmfReader(filename) as reader:
+            assert len(reader.grids) == ngrids
+            for n, grid_data in enumerate(reader.grids):
+                assert np.array_equal(
+                    np.asarray(grid_data.geometry).reshape(npoints, 3),
+                    points.ary)
+                assert np.array_equal(
+                    np.asarray(grid_data.attributes["temperature"].data),
+                    np.full(npoints, n))
+
+# }}}
+
+
+# {{{ test_structured_grid
+
+@pytest.mark.parametrize("ambient_dim", [2, 3])
+@pytest.mark.parametrize("mesh", ["CoRectMesh", "RectMesh", "SMesh"])
+def test_structured_grid(ambient_dim: int, mesh: str) -> None:
+    from pyvisfile.xdmf import (
+        XdmfCurvilinearGrid,
+        XdmfRectilinearGrid,
+        XdmfRegularGrid,
+        XdmfStructuredGrid,
+    )
+
+    shape = (5, 6, 7)[:ambient_dim]
+    spacing = (0.1, 0.2, 0.3)[:ambient_dim]
+    axes = [h * np.arange(n) for h, n in zip(spacing, shape, strict=True)]
+
+    grid: XdmfStructuredGrid
+    if mesh == "CoRectMesh":
+        grid = XdmfRegularGrid(shape, spacing=spacing, name="regular")
+        nitems = 2
+    elif mesh == "RectMesh":
+        grid = XdmfRectilinearGrid(
+                tuple(NumpyDataArray(x, name=f"x{i}") for i, x in enumerate(axes)),
+                name="rectilinear")
+        nitems = ambient_dim
+    elif mesh == "SMesh":
+        points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1)
+        points = points.transpose(*range(ambient_dim)[::-1], ambient_dim)
+        grid = XdmfCurvilinearGrid(shape,
+                NumpyDataArray(points.reshape(-1, ambient_dim), name="points"),
+                name="curvilinear")
+        nitems = 1
+    else:
+        raise ValueError(f"unknown mesh: '{mesh}'")
+
+    grid.add_attribute(NumpyDataArray(
+        np.arange(np.prod(shape), dtype=np.float64), name="index"))
+
+    from pyvisfile.xdmf import XdmfWriter
+    writer = XdmfWriter((grid,))
+
+    filename = f"test_structured_{mesh}_{ambient_dim}d.xmf"
+    writer.write_pretty(filename)
+
+    from xml.etree.ElementTree import parse
+    root = parse(filename).getroot()
+
+    topology = root.find("Domain/Grid/Topology")
+    assert topology.get("TopologyType") == f"{ambient_dim}D{mesh}"
+    assert topology.get("Dimensions") == " ".join(str(n) for n in shape[::-1])
+    assert len(root.findall("Domain/Grid/Geometry/DataItem")) == nitems
+
+# }}}
+
+
+# {{{ test_mixed_topology
+
+def test_mixed_topology() -> None:
+    from pyvisfile.xdmf import (
+        TopologyType,
+        XdmfUnstructuredGrid,
+        XdmfWriter,
+        make_mixed_connectivity,
+        make_mixed_connectivity_from_blocks,
+    )
+
+    # NOTE: 2x2 square with a triangle, two quads and a polyline on top
+    points = np.array([
+        [0, 0], [1, 0], [2, 0],
+        [0, 1], [1, 1], [2, 1],
+        [0, 2], [1, 2], [2, 2]], dtype=np.float64)
+    triangles = np.array([[0, 1, 4], [0, 4, 3]], dtype=np.uint32)
+    quads = np.array([[1, 2, 5, 4], [3, 4, 7, 6], [4, 5, 8, 7]], dtype=np.uint32)
+    lines = np.array([[6, 7, 8]], dtype=np.uint32)
+
+    blocks = [
+        (TopologyType.Triangle, triangles),
+        (TopologyType.Quadrilateral, quads),
+        (TopologyType.Polyline, lines),
+        ]
+    cell_types = np.array([4, 4, 5, 5, 5, 2])
+    offsets = np.array([3, 6, 10, 14, 18, 21])
+    connectivity = np.concatenate([b.ravel() for _, b in blocks])
+
+    expected = [
+        4, 0, 1, 4, 4, 0, 4, 3,
+        5, 1, 2, 5, 4, 5, 3, 4, 7, 6, 5, 4, 5, 8, 7,
+        2, 3, 6, 7, 8]
+    mixed = make_mixed_connectivity(cell_types, offsets, connectivity)
+    assert mixed.dtype == np.uint32
+    assert np.array_equal(mixed, expected)
+    assert np.array_equal(make_mixed_connectivity_from_blocks(blocks), expected)
+
+    with pytest.raises(ValueError):
+        make_mixed_connectivity(cell_types, offsets + 1, connectivity)
+
+    # NOTE: VTK_TETRA = 10 and VTK_HEXAHEDRON = 12 are not XDMF codes
+    for code in [10, 12, TopologyType.Mixed, TopologyType.NoTopology, -1]:
+        with pytest.raises(ValueError, match="cell_types"):
+            make_mixed_connectivity(
+                np.array([code]), np.array([3]), np.array([0, 1, 2]))
+
+    with pytest.raises(ValueError):
+        make_mixed_connectivity_from_blocks([(TopologyType.Mixed, triangles)])
+
+    grid = XdmfUnstructuredGrid(
+            NumpyDataArray(points, name="points"),
+            NumpyDataArray(mixed, name="connectivity"),
+            topology_type=TopologyType.Mixed,
+            number_of_elements=cell_types.size,
+            name="mixed")
+
+    writer = XdmfWriter((grid,))
+    writer.write_pretty("test_mixed_topology.xmf")
+
+    topology = grid.getroot().find("Topology")
+    assert topology.get("TopologyType") == "Mixed"
+    assert topology.get("NumberOfElements") == "6"
+
+# }}}
+
+
+# {{{ test_interleave
+
+@pytest.mark.parametrize("heavy_data", [None, "h5", "bin"])
+def test_interleave(heavy_data: str | None, npoints: int = 1000) -> None:
+    if heavy_data == "h5":
+        h5py = pytest.importorskip("h5py")
+
+    rng = np.random.default_rng(seed=42)
+    velocity_ary = rng.random(size=(npoints, 3))
+    velocity = NumpyDataArray(
+            obj_array.new_1d(list(velocity_ary.T)),
+            name="velocity",
+            interleave=True)
+    assert velocity.shape == (npoints, 3)
+
+    from pyvisfile.xdmf import TopologyType, XdmfUnstructuredGrid, XdmfWriter
+    grid = XdmfUnstructuredGrid(
+            NumpyDataArray(rng.random(size=(npoints, 3)), name="points"),
+            NumpyDataArray(np.arange(npoints, dtype=np.uint32), name="connectivity"),
+            topology_type=TopologyType.Polyvertex,
+            name="polyvertex")
+    attr = grid.add_attribute(velocity)
+    assert attr.get("AttributeType") == "Vector"
+
+    (item,) = attr.iter("DataItem")
+    assert item.get("Dimensions") == f"{npoints} 3"
+
+    filename = f"test_interleave_{heavy_data}.xmf"
+    writer = XdmfWriter((grid,),
+            heavy_data=None if heavy_data is None else f"test_interleave.{heavy_data}")
+    writer.write(filename)
+
+    from pyvisfile.xdmf import _iter_array_chunks
+    assert len(list(_iter_array_chunks(item.ary, chunk_size=300))) == 10
+
+    from xml.etree.ElementTree import parse
+    written_item = parse(filename).getroot().find("Domain/Grid/Attribute/DataItem")
+    assert written_item is not None
+
+    if heavy_data is None:
+        result = np.fromstring(written_item.text, sep=" ")
+    elif heavy_data == "h5":
+        with h5py.File("test_interleave.h5", "r") as h5:
+            result = h5["velocity"][:]
+    else:
+        result = np.fromfile("test_interleave.bin",
+            dtype=np.float64, count=3 * npoints,
+            offset=int(written_item.get("Seek")))
+
+    assert np.array_equal(result.reshape(npoints, 3), velocity_ary)
+
+# }}}
+
+
+# {{{ test_hyperslab
+
+def test_hyperslab(nsteps: int = 4, npoints: int = 64) -> None:
+    h5py = pytest.importorskip("h5py")
+
+    rng = np.random.default_rng(seed=42)
+    points_ary = rng.random(size=(npoints, 3))
+    temperature_ary = rng.random(size=(nsteps, npoints))
+
+    with h5py.File("test_hyperslab.h5", "w") as h5:
+        points = DataArray.from_dataset(h5.create_dataset("points", data=points_ary))
+        temperature = h5.create_dataset("temperature", data=temperature_ary)
+
+        from pyvisfile.xdmf import TopologyType, XdmfUnstructuredGrid, XdmfWriter
+        grids = []
+        for n in range(nsteps):
+            grid = XdmfUnstructuredGrid(points,
+                    NumpyDataArray(np.arange(npoints, dtype=np.uint32),
+                                   name="connectivity"),
+                    topology_type=TopologyType.Polyvertex,
+                    name=f"step_{n}")
+
+            slab = DataArray.from_hyperslab(temperature, (slice(n, n + 1),))
+            assert slab.shape == (1, npoints)
+            grid.add_attribute(slab)
+            grids.append(grid)
+
+        slab = DataArray.from_hyperslab(temperature,
+                start=(1, 1), stride=(2, 3))
+        assert slab.shape == (2, 21)
+
+        for kwargs in [
+                {"start": (1, 0), "count": (4, 1)},
+                {"start": (0, npoints), "count": (1, 1)},
+                {"start": (-1, 0)},
+                {"start": (0, 0), "stride": (0, 1)},
+                {"start": (0, 0), "stride": (-1, 1), "count": (1, 1)},
+                {"count": (-1, 1)},
+                {"start": (0, npoints + 1), "count": (1, 0)},
+                ]:
+            with pytest.raises(ValueError):
+                DataArray.from_hyperslab(temperature, **kwargs)
+
+        with pytest.raises(ValueError):
+            DataArray.from_hyperslab(temperature, (slice(None, None, -1),))
+
+    writer = XdmfWriter(tuple(grids))
+    writer.write_pretty("test_hyperslab.xmf")
+
+    from xml.etree.ElementTree import parse
+    root = parse("test_hyperslab.xmf").getroot()
+
+    slab_item = root.findall("Domain/Grid/Attribute/DataItem")[2]
+    assert slab_item.get("ItemType") == "HyperSlab"
+
+    selection, data = slab_item.findall("DataItem")
+    assert np.array_equal(
+        np.fromstring(selection.text, sep=" ", dtype=np.int64),
+        [2, 0, 1, 1, 1, npoints])
+    assert data.text == "test_hyperslab.h5:/temperature"
+
+# }}}
+
+
+# {{{ test_virtual_unstructured_grid
+
+def test_virtual_unstructured_grid(nranks: int = 3) -> None:
+    h5py = pytest.importorskip("h5py")
+    rng = np.random.default_rng(seed=42)
+
+    import pathlib
+    dirname = pathlib.Path("test_virtual_unstructured_grid")
+    dirname.mkdir(exist_ok=True)
+
+    filenames = []
+    points, connectivity, temperature, rank = [], [], [], []
+    for r in range(nranks):
+        npoints = 10 + 5 * r
+        nelements = npoints - 2
+
+        points.append(rng.random(size=(npoints, 3)))
+        connectivity.append(np.stack([
+            np.arange(nelements), np.arange(nelements) + 1, np.arange(nelements) + 2
+            ], axis=1).astype(np.uint32))
+        temperature.append(rng.random(size=npoints))
+        rank.append(np.full(nelements, r, dtype=np.int32))
+
+        filenames.append(f"rank_{r}.h5")
+        with h5py.File(dirname / filenames[-1], "w") as h5:
+            h5.create_dataset("points", data=points[-1])
+            h5.create_dataset("connectivity", data=connectivity[-1])
+            h5.create_dataset("temperature", data=temperature[-1])
+            h5.create_dataset("rank", data=rank[-1])
+
+    from pyvisfile.xdmf import TopologyType, XdmfWriter, make_virtual_unstructured_grid
+    with h5py.File(dirname / "mesh.h5", "w") as h5:
+        grid = make_virtual_unstructured_grid(h5, filenames,
+                topology_type=TopologyType.Triangle,
+                node_fields=["temperature"],
+                cell_fields=["rank"],
+                name="mesh")
+
+        assert h5["points"].is_virtual
+        assert not h5["connectivity"].is_virtual
+
+    writer = XdmfWriter((grid,))
+    writer.write_pretty(str(dirname / "mesh.xmf"))
+
+    offsets = np.cumsum([0] + [len(p) for p in points[:-1]])
+    with h5py.File(dirname / "mesh.h5", "r") as h5:
+        assert np.array_equal(h5["points"][:], np.concatenate(points))
+        assert np.array_equal(h5["temperature"][:], np.concatenate(temperature))
+        assert np.array_equal(h5["rank"][:], np.concatenate(rank))
+        assert np.array_equal(
+            h5["connectivity"][:],
+            np.concatenate([c + o for c, o in zip(connectivity, offsets, strict=True)]))
+
+    attrs = grid.getroot().findall("Attribute")
+    assert [attr.get("Center") for attr in attrs] == ["Node", "Cell"]
+
+    # NOTE: the heavy data is referenced relative to the XDMF file
+    from pyvisfile.xdmf.reader import XdmfReader
+    with XdmfReader(str(dirname / "mesh.xmf")) as reader:
+        (result,) = reader.grids
+        assert np.array_equal(result.geometry[0][:], np.concatenate(points))
+        assert np.array_equal(
+            result.connectivity[:],
+            np.concatenate([c + o for c, o in zip(connectivity, offsets, strict=True)]))
+        assert np.array_equal(
+            result.attributes["temperature"].data[:], np.concatenate(temperature))
+        assert np.array_equal(
+            result.attributes["rank"].data[:], np.concatenate(rank))
+
+# }}}
+
+
+# {{{ test_reader
+
+@pytest.mark.parametrize("heavy_data", [None, "h5", "bin"])
+def test_reader(heavy_data: str | None, nsteps: int = 3, npoints: int = 64) -> None:
+    if heavy_data == "h5":
+        pytest.importorskip("h5py")
+
+    rng = np.random.default_rng(seed=42)
+    points_ary = rng.random(size=(npoints, 3))
+    connectivity_ary = np.arange(npoints, dtype=np.uint32)
+    velocity_ary = rng.random(size=(npoints, 3)).astype(">f4")
+
+    points = NumpyDataArray(points_ary, name="points")
+    connectivity = NumpyDataArray(connectivity_ary, name="connectivity")
+
+    from pyvisfile.xdmf import (
+        AttributeType,
+        TopologyType,
+        XdmfTemporalWriter,
+        XdmfUnstructuredGrid,
+    )
+    filename = f"test_reader_{heavy_data}.xmf"
+    writer = XdmfTemporalWriter(filename,
+            heavy_data=None if heavy_data is None else f"test_reader.{heavy_data}")
+
+    for n in range(nsteps):
+        grid = XdmfUnstructuredGrid(points, connectivity,
+                topology_type=TopologyType.Polyvertex,
+                name=f"step_{n}")
+        grid.add_attribute(NumpyDataArray(
+            np.full(npoints, n, dtype=np.int32), name="step"))
+
+        velocity = NumpyDataArray(
+            obj_array.new_1d(list(velocity_ary.T)), name="velocity")
+        velocity.atype = AttributeType.Vector
+        grid.add_attribute(velocity)
+
+        writer.append(grid, time=0.5 * n)
+
+    from pyvisfile.xdmf.reader import XdmfReader
+    with XdmfReader(filename) as reader:
+        assert len(reader.grids) == nsteps
+
+        for n, grid in enumerate(reader.grids):
+            assert grid.name == f"step_{n}"
+            assert grid.time == pytest.approx(0.5 * n)
+            assert grid.topology_type == "Polyvertex"
+
+            assert np.array_equal(grid.connectivity[:], connectivity_ary)
+            assert np.array_equal(grid.geometry[0][:], points_ary)
+            assert np.all(grid.attributes["step"].data[:] == n)
+
+            velocity = grid.attributes["velocity"].data
+            assert velocity.dtype.char == "O"
+            for i in range(3):
+                assert np.array_equal(velocity[i][:], velocity_ary[:, i])
+
+            if heavy_data == "bin":
+                assert isinstance(grid.geometry[0], np.memmap)
+
+# }}}
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1: